@@ -0,0 +1,187 @@
+"""Loader data mahasiswa dengan skema dtype ringkas dan snapshot kolumnar.
+
+Hampir semua kolom ``data.csv`` adalah kode atau hitungan kecil, sehingga
+disimpan sebagai int8/int16 (rentang diambil dari ``FEATURE_SCHEMA`` di
+``streamlit/validation.py``), kolom pecahan sebagai float32 dan ``Status``
+sebagai categorical. Hasil parsing disimpan sebagai snapshot Parquet di
+``cache/data/``; selama file CSV tidak berubah (path, ukuran dan mtime sama),
+load berikutnya langsung membaca snapshot tanpa parsing CSV.
+
+Contoh benchmark (footprint memori dan waktu load)::
+
+    python data_loader.py --rows 4424 10000000
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streamlit'))
+
+from validation import FEATURE_SCHEMA, INT  # noqa: E402
+
+# Naikkan jika skema dtype berubah agar snapshot lama tidak terpakai
+SCHEMA_VERSION = 1
+SNAPSHOT_DIR = os.path.join('cache', 'data')
+STATUS_CATEGORIES = ['Dropout', 'Enrolled', 'Graduate']
+PARSE_CHUNK_ROWS = 1_000_000
+
+
+def storage_dtype(kind, lower, upper):
+    """Dtype terkecil untuk satu kolom skema"""
+    if kind != INT:
+        return np.dtype(np.float32)
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= lower and upper <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+DTYPES = {name: storage_dtype(kind, lower, upper) for name, kind, lower, upper in FEATURE_SCHEMA}
+DTYPES['Status'] = pd.CategoricalDtype(STATUS_CATEGORIES)
+
+
+def read_csv_compact(path, sep=';', chunksize=PARSE_CHUNK_ROWS):
+    """Parse CSV langsung ke dtype ringkas.
+
+    Kolom integer di-parse sebagai int32 lalu di-downcast setelah rentangnya
+    dicek, karena ``read_csv`` dengan dtype int8 diam-diam overflow. Parsing
+    dilakukan per chunk sehingga buffer int32 sementara hanya sebesar satu
+    chunk, bukan seluruh file.
+    """
+    parse_dtypes = {
+        name: (np.int32 if dtype.kind == 'i' else dtype) if name != 'Status' else dtype
+        for name, dtype in DTYPES.items()
+    }
+    reader = pd.read_csv(path, sep=sep, encoding='utf-8-sig', dtype=parse_dtypes, chunksize=chunksize)
+    chunks = [downcast(chunk) for chunk in reader]
+    return chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+
+
+def downcast(df, dtypes=None):
+    """Downcast kolom integer ke dtype skema setelah rentangnya dicek (astype biasa overflow diam-diam)"""
+    out_of_range = []
+    for name, dtype in (DTYPES if dtypes is None else dtypes).items():
+        if name not in df.columns or dtype == 'category' or dtype.kind != 'i':
+            continue
+        info = np.iinfo(dtype)
+        column = df[name]
+        if len(column) and (column.min() < info.min or column.max() > info.max):
+            out_of_range.append(name)
+            continue
+        df[name] = column.astype(dtype)
+    if out_of_range:
+        raise ValueError(f"Nilai di luar rentang dtype skema pada kolom: {out_of_range}")
+    return df
+
+
+def snapshot_path(path, snapshot_dir=SNAPSHOT_DIR):
+    """Path snapshot Parquet untuk satu file CSV (berubah jika CSV/skema berubah)"""
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|{SCHEMA_VERSION}"
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(snapshot_dir, f"{stem}-{hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]}.parquet")
+
+
+def load_students(path='data.csv', sep=';', snapshot_dir=SNAPSHOT_DIR, use_snapshot=True):
+    """Muat data mahasiswa dengan dtype ringkas, memakai snapshot jika masih valid"""
+    if not use_snapshot:
+        return read_csv_compact(path, sep=sep)
+
+    snapshot = snapshot_path(path, snapshot_dir)
+    if os.path.exists(snapshot):
+        return pd.read_parquet(snapshot)
+
+    df = read_csv_compact(path, sep=sep)
+    os.makedirs(snapshot_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    for stale in glob.glob(os.path.join(snapshot_dir, f"{stem}-*.parquet")):
+        os.remove(stale)
+    # Tulis ke file sementara lalu rename agar snapshot tidak pernah setengah jadi
+    df.to_parquet(snapshot + '.tmp', index=False)
+    os.replace(snapshot + '.tmp', snapshot)
+    return df
+
+
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+LOADERS = {
+    'read_csv default': lambda path, sep, snapshot_dir: pd.read_csv(path, sep=sep, encoding='utf-8-sig'),
+    'compact csv': lambda path, sep, snapshot_dir: read_csv_compact(path, sep=sep),
+    # Load pertama: parse CSV + tulis snapshot
+    'snapshot (cold)': lambda path, sep, snapshot_dir: load_students(path, sep=sep, snapshot_dir=snapshot_dir),
+    'snapshot (warm)': lambda path, sep, snapshot_dir: load_students(path, sep=sep, snapshot_dir=snapshot_dir)
+}
+
+
+def _measure(name, path, sep, snapshot_dir):
+    import json
+    import resource
+
+    start = time.perf_counter()
+    df = LOADERS[name](path, sep, snapshot_dir)
+    print(json.dumps({'rows': len(df), 'load_s': time.perf_counter() - start, 'memory_mb': memory_mb(df),
+                      'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+
+
+def compare_loaders(path, sep=';', snapshot_dir=SNAPSHOT_DIR):
+    """Bandingkan waktu load, memori DataFrame dan peak RSS: read_csv default vs loader ringkas.
+
+    Setiap loader dijalankan di proses terpisah agar peak RSS terukur sendiri
+    dan loader yang kehabisan memori tidak menghentikan benchmark.
+    """
+    import json
+    import subprocess
+
+    for stale in glob.glob(os.path.join(snapshot_dir, '*.parquet')):
+        os.remove(stale)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    rows = []
+    for name in LOADERS:
+        code = (f"import sys; sys.path.insert(0, {here!r})\n"
+                f"import data_loader; data_loader._measure({name!r}, {path!r}, {sep!r}, {snapshot_dir!r})")
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        if result.returncode == 0:
+            rows.append(dict(json.loads(result.stdout.strip().splitlines()[-1]), loader=name))
+        else:
+            # Mis. dibunuh OOM killer (returncode -9)
+            rows.append({'loader': name, 'error': f"gagal (returncode {result.returncode})"})
+    return pd.DataFrame(rows).set_index('loader')
+
+
+def make_synthetic_csv(source, rows, target, sep=';'):
+    """Perbesar data.csv menjadi ``rows`` baris (diulang) untuk benchmark"""
+    base = pd.read_csv(source, sep=sep, encoding='utf-8-sig')
+    with open(target, 'w', encoding='utf-8') as f:
+        base.iloc[:0].to_csv(f, sep=sep, index=False)
+        written = 0
+        while written < rows:
+            part = base.iloc[:rows - written]
+            part.to_csv(f, sep=sep, index=False, header=False)
+            written += len(part)
+    return target
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Benchmark loader data.csv")
+    parser.add_argument('--source', default=os.path.join('data', 'data.csv'))
+    parser.add_argument('--rows', type=int, nargs='+', default=[4424, 10_000_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = make_synthetic_csv(args.source, rows, os.path.join(tmp, f'data_{rows}.csv'))
+            print(f"\n📦 {rows:,} baris ({os.path.getsize(path) / 1e6:,.1f} MB CSV)")
+            print(compare_loaders(path, snapshot_dir=os.path.join(tmp, 'snapshots')).round(3).to_string())
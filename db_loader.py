@@ -0,0 +1,255 @@
+"""Loader bulk dan inkremental tabel ``education`` ke database.
+
+Menggantikan ``df.to_sql(..., if_exists='replace')`` yang men-drop tabel
+lalu mengirim ulang semua baris dengan INSERT biasa (dashboard Metabase
+kosong selama proses berjalan). Alurnya:
+
+1. Setiap baris diberi key stabil ``student_id`` (kolom ID sumber, atau
+   diturunkan dari isi baris, bukan posisinya) dan hash isi ``row_hash``.
+2. Baris dialirkan per chunk ke tabel staging sementara: ``COPY ... FROM
+   STDIN`` di PostgreSQL, ``executemany`` di SQLite (stand-in lokal).
+3. Dalam satu transaksi, baris baru/berubah di-upsert berdasarkan
+   ``student_id`` (baris dengan hash sama tidak ditulis ulang) dan baris yang
+   tidak ada lagi di sumber dihapus. Pembaca melihat tabel lama sampai commit.
+
+Jika tabel tujuan belum ada atau skemanya berbeda (mis. dibuat oleh
+``to_sql`` tanpa key), tabel baru dibangun penuh lalu ditukar dengan rename
+di satu transaksi.
+
+Contoh benchmark (SQLite lokal)::
+
+    python db_loader.py --rows 4424 200000
+"""
+
+import argparse
+import io
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, inspect
+
+KEY_COLUMN = 'student_id'
+HASH_COLUMN = 'row_hash'
+CHUNK_ROWS = 50_000
+
+
+def quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def row_hashes(df, columns=None):
+    """Hash isi setiap baris (int64, muat di kolom BIGINT)"""
+    columns = [col for col in df.columns if col not in (KEY_COLUMN, HASH_COLUMN)] if columns is None else columns
+    return pd.util.hash_pandas_object(df[columns], index=False).to_numpy().view(np.int64)
+
+
+def content_keys(hashes):
+    """Key dari hash isi baris + urutan kemunculan (untuk baris kembar).
+
+    Berbeda dengan posisi baris, menghapus atau menyisipkan baris tidak
+    menggeser key baris lain. Baris yang isinya berubah mendapat key baru
+    (upsert menghapus versi lama dan menyisipkan versi baru).
+    """
+    hashes = np.asarray(hashes, dtype=np.int64)
+    occurrence = pd.Series(hashes).groupby(hashes).cumcount().to_numpy()
+    parts = pd.DataFrame({'hash': hashes, 'occurrence': occurrence})
+    return pd.util.hash_pandas_object(parts, index=False).to_numpy().view(np.int64)
+
+
+def with_student_key(df, key_col=None):
+    """Tambahkan ``student_id`` dan ``row_hash`` di depan kolom data.
+
+    ``key_col`` adalah kolom ID di sumber (mis. NIM). Tanpa itu (``data.csv``
+    tidak punya ID), key diturunkan dari isi baris dengan ``content_keys``.
+    """
+    data = df.drop(columns=[key_col]) if key_col is not None else df
+    hashes = row_hashes(data, list(data.columns))
+    keys = df[key_col].to_numpy(dtype=np.int64) if key_col is not None else content_keys(hashes)
+    if len(np.unique(keys)) != len(keys):
+        raise ValueError(f"Key '{key_col or KEY_COLUMN}' tidak unik")
+    keyed = pd.concat([pd.DataFrame({KEY_COLUMN: keys, HASH_COLUMN: hashes}, index=data.index), data], axis=1)
+    return keyed
+
+
+def sql_type(dtype):
+    """Tipe kolom SQL yang berlaku di PostgreSQL maupun SQLite"""
+    if dtype == bool:
+        return 'SMALLINT'
+    if dtype.kind in 'iu':
+        return {1: 'SMALLINT', 2: 'SMALLINT', 4: 'INTEGER'}.get(dtype.itemsize, 'BIGINT')
+    if dtype.kind == 'f':
+        return 'REAL' if dtype.itemsize == 4 else 'DOUBLE PRECISION'
+    return 'TEXT'
+
+
+def table_ddl(name, df, temporary=False):
+    columns = ', '.join(f"{quote(col)} {sql_type(df[col].dtype)}" for col in df.columns)
+    kind = 'TEMPORARY TABLE' if temporary else 'TABLE'
+    return f"CREATE {kind} {quote(name)} ({columns}, PRIMARY KEY ({quote(KEY_COLUMN)}))"
+
+
+def _chunks(df, chunksize):
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def _copy_postgres(cursor, table, df, chunksize):
+    """Alirkan baris dengan COPY FROM STDIN (format CSV), satu buffer per chunk"""
+    sql = f"COPY {quote(table)} ({', '.join(quote(c) for c in df.columns)}) FROM STDIN WITH (FORMAT csv)"
+    for chunk in _chunks(df, chunksize):
+        buffer = io.StringIO()
+        chunk.to_csv(buffer, header=False, index=False)
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+
+
+def _insert_sqlite(cursor, table, df, chunksize):
+    sql = (f"INSERT INTO {quote(table)} ({', '.join(quote(c) for c in df.columns)}) "
+           f"VALUES ({', '.join('?' * len(df.columns))})")
+    for chunk in _chunks(df, chunksize):
+        # .tolist() per kolom menghasilkan tipe Python (sqlite3 tidak menerima int8/float32 NumPy)
+        cursor.executemany(sql, zip(*(chunk[col].tolist() for col in chunk.columns)))
+
+
+BULK_WRITERS = {
+    'postgresql': _copy_postgres,
+    'sqlite': _insert_sqlite
+}
+
+
+def _target_state(engine, table, df):
+    """``'missing'``, ``'compatible'`` (bisa di-upsert) atau ``'incompatible'``"""
+    inspector = inspect(engine)
+    if not inspector.has_table(table):
+        return 'missing'
+    columns = [col['name'] for col in inspector.get_columns(table)]
+    if (columns == [str(c) for c in df.columns]
+            and inspector.get_pk_constraint(table).get('constrained_columns') == [KEY_COLUMN]):
+        return 'compatible'
+    return 'incompatible'
+
+
+def load_table(df, engine, table='education', key_col=None, chunksize=CHUNK_ROWS):
+    """Muat ``df`` ke ``table`` secara bulk + inkremental, kembalikan ringkasan"""
+    dialect = engine.dialect.name
+    if dialect not in BULK_WRITERS:
+        raise ValueError(f"Dialect {dialect!r} belum didukung (pilihan: {sorted(BULK_WRITERS)})")
+    write = BULK_WRITERS[dialect]
+
+    wall_start = time.perf_counter()
+    keyed = with_student_key(df, key_col)
+    state = _target_state(engine, table, keyed)
+    mode = 'upsert' if state == 'compatible' else 'swap'
+    staging = f"{table}_staging"
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if dialect == 'sqlite':
+            cursor.execute("BEGIN")
+
+        start = time.perf_counter()
+        cursor.execute(f"DROP TABLE IF EXISTS {quote(staging)}")
+        # Mode swap: staging menjadi tabel baru, jadi tidak boleh temporary
+        cursor.execute(table_ddl(staging, keyed, temporary=mode == 'upsert'))
+        write(cursor, staging, keyed, chunksize)
+        copy_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if mode == 'swap':
+            # Tabel baru sudah lengkap; rename di transaksi yang sama sehingga pertukarannya atomik
+            cursor.execute(f"DROP TABLE IF EXISTS {quote(table + '_old')}")
+            if state != 'missing':
+                cursor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(table + '_old')}")
+            cursor.execute(f"ALTER TABLE {quote(staging)} RENAME TO {quote(table)}")
+            cursor.execute(f"DROP TABLE IF EXISTS {quote(table + '_old')}")
+            if dialect == 'postgresql':
+                # Index PK masih bernama <staging>_pkey; dinamai ulang agar CREATE TABLE staging
+                # pada swap berikutnya tidak bentrok dengan index tersebut
+                cursor.execute(f"ALTER TABLE {quote(table)} RENAME CONSTRAINT "
+                               f"{quote(staging + '_pkey')} TO {quote(table + '_pkey')}")
+            changed, deleted = len(keyed), 0
+        else:
+            columns = ', '.join(quote(c) for c in keyed.columns)
+            updates = ', '.join(f"{quote(c)} = excluded.{quote(c)}" for c in keyed.columns if c != KEY_COLUMN)
+            cursor.execute(
+                f"INSERT INTO {quote(table)} ({columns}) SELECT {columns} FROM {quote(staging)} s "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {quote(table)} t WHERE t.{quote(KEY_COLUMN)} = s.{quote(KEY_COLUMN)} "
+                f"AND t.{quote(HASH_COLUMN)} = s.{quote(HASH_COLUMN)}) "
+                f"ON CONFLICT ({quote(KEY_COLUMN)}) DO UPDATE SET {updates}"
+            )
+            changed = cursor.rowcount
+            cursor.execute(f"DELETE FROM {quote(table)} WHERE {quote(KEY_COLUMN)} NOT IN "
+                           f"(SELECT {quote(KEY_COLUMN)} FROM {quote(staging)})")
+            deleted = cursor.rowcount
+            cursor.execute(f"DROP TABLE {quote(staging)}")
+        raw.commit()
+        merge_s = time.perf_counter() - start
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+    wall_s = time.perf_counter() - wall_start
+    return {
+        'mode': mode,
+        'rows': len(keyed),
+        'changed': changed,
+        'deleted': deleted,
+        'copy_s': copy_s,
+        'merge_s': merge_s,
+        'wall_s': wall_s,
+        'rows_per_s': len(keyed) / wall_s if wall_s > 0 else float('inf')
+    }
+
+
+def benchmark(df, url, table='education', changed_fraction=0.01, random_state=42):
+    """Bandingkan ``to_sql(if_exists='replace')`` dengan ``load_table`` (awal, tanpa perubahan, 1% berubah)"""
+    engine = create_engine(url)
+    rows = []
+
+    start = time.perf_counter()
+    df.to_sql(table, engine, if_exists='replace', index=False)
+    wall_s = time.perf_counter() - start
+    rows.append({'path': "to_sql replace", 'rows': len(df), 'changed': len(df), 'wall_s': wall_s})
+
+    for label, frame in (('load_table (swap)', df), ('load_table (tanpa perubahan)', df)):
+        result = load_table(frame, engine, table)
+        rows.append({'path': label, 'rows': result['rows'], 'changed': result['changed'], 'wall_s': result['wall_s']})
+
+    changed = df.copy()
+    rng = np.random.default_rng(random_state)
+    idx = rng.choice(len(df), size=max(1, int(len(df) * changed_fraction)), replace=False)
+    column = changed.columns.get_loc('Admission_grade')
+    changed.iloc[idx, column] = changed.iloc[idx, column] + 1
+    result = load_table(changed, engine, table)
+    rows.append({'path': f"load_table ({changed_fraction:.0%} berubah)", 'rows': result['rows'],
+                 'changed': result['changed'], 'wall_s': result['wall_s']})
+
+    engine.dispose()
+    report = pd.DataFrame(rows).set_index('path')
+    report['rows_per_s'] = report['rows'] / report['wall_s']
+    return report
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    from data_loader import load_students
+
+    parser = argparse.ArgumentParser(description="Benchmark loader tabel education")
+    parser.add_argument('--source', default=os.path.join('data', 'data.csv'))
+    parser.add_argument('--rows', type=int, nargs='+', default=[4424, 200_000])
+    parser.add_argument('--url', default=None, help="URL database (default: SQLite sementara)")
+    args = parser.parse_args()
+
+    base = load_students(args.source, use_snapshot=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            df = base.iloc[np.arange(rows) % len(base)].reset_index(drop=True)
+            url = args.url or f"sqlite:///{os.path.join(tmp, f'bench_{rows}.db')}"
+            print(f"\n📦 {rows:,} baris ({url.split(':')[0]})")
+            print(benchmark(df, url).round(3).to_string())
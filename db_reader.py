@@ -0,0 +1,87 @@
+"""Akses baca tabel ``education`` secara streaming dan terproyeksi.
+
+Menggantikan ``pd.read_sql('education', engine)`` yang menarik semua kolom
+dan baris ke satu DataFrame lewat cursor sisi klien. Di sini:
+
+- hanya kolom yang diminta yang di-SELECT (proyeksi),
+- filter (mis. ``{'Course': [9500, 9238]}`` atau rentang ``student_id``
+  untuk satu angkatan) dikirim sebagai klausa WHERE dengan parameter terikat,
+- hasil dibaca lewat server-side cursor (``stream_results``) per chunk,
+- setiap chunk langsung dikonversi ke dtype ringkas ``data_loader.DTYPES``.
+
+Chunk bisa dikonsumsi langsung oleh ``eda.eda_report_stream`` dan
+``batch.stream_batch_predictions``; ``read_frame`` menggabungkan chunk
+menjadi satu DataFrame ringkas untuk training.
+"""
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, text
+
+from data_loader import DTYPES, downcast
+from db_loader import KEY_COLUMN, quote
+
+CHUNK_ROWS = 50_000
+TARGET_DTYPES = {'Status_Binary': np.dtype(np.int8), 'Status_Encoded': np.dtype(np.int8)}
+
+
+def build_query(table='education', columns=None, where=None, key_range=None):
+    """SELECT terproyeksi + WHERE berparameter.
+
+    Nilai ``where`` berupa skalar (``=``) atau list (``IN``); ``key_range``
+    adalah rentang setengah terbuka ``[lo, hi)`` pada ``student_id``.
+    """
+    projection = '*' if columns is None else ', '.join(quote(col) for col in columns)
+    clauses = []
+    params = {}
+    expanding = []
+    for i, (column, value) in enumerate((where or {}).items()):
+        name = f'p{i}'
+        if isinstance(value, (list, tuple, set, np.ndarray, pd.Index)):
+            clauses.append(f"{quote(column)} IN :{name}")
+            params[name] = [v.item() if isinstance(v, np.generic) else v for v in value]
+            expanding.append(name)
+        else:
+            clauses.append(f"{quote(column)} = :{name}")
+            params[name] = value.item() if isinstance(value, np.generic) else value
+    if key_range is not None:
+        clauses.append(f"{quote(KEY_COLUMN)} >= :key_lo AND {quote(KEY_COLUMN)} < :key_hi")
+        params.update(key_lo=int(key_range[0]), key_hi=int(key_range[1]))
+
+    sql = f"SELECT {projection} FROM {quote(table)}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    # Urutan stabil agar chunk (dan hasil turunannya) deterministik
+    sql += f" ORDER BY {quote(KEY_COLUMN)}"
+    query = text(sql)
+    if expanding:
+        query = query.bindparams(*(bindparam(name, expanding=True) for name in expanding))
+    return query, params
+
+
+def compact(chunk):
+    """Konversi chunk hasil query ke dtype ringkas skema (kolom integer dicek rentangnya)"""
+    schema = {**DTYPES, **TARGET_DTYPES}
+    dtypes = {col: schema[col] for col in chunk.columns if col in schema}
+    chunk = downcast(chunk, dtypes)
+    others = {col: dtype for col, dtype in dtypes.items() if dtype == 'category' or dtype.kind != 'i'}
+    return chunk.astype(others, copy=False)
+
+
+def iter_education(engine, table='education', columns=None, where=None, key_range=None,
+                   chunksize=CHUNK_ROWS):
+    """Iterator DataFrame per chunk lewat server-side cursor"""
+    query, params = build_query(table, columns, where, key_range)
+    with engine.connect() as conn:
+        conn = conn.execution_options(stream_results=True, max_row_buffer=chunksize)
+        for chunk in pd.read_sql(query, conn, params=params, chunksize=chunksize):
+            yield compact(chunk)
+
+
+def read_frame(engine, table='education', columns=None, where=None, key_range=None, chunksize=CHUNK_ROWS):
+    """Satu DataFrame ringkas dari chunk (puncak memori ~ hasil ringkas + satu chunk mentah)"""
+    chunks = list(iter_education(engine, table, columns, where, key_range, chunksize))
+    if not chunks:
+        query_columns = columns if columns is not None else []
+        return pd.DataFrame(columns=query_columns)
+    return chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
@@ -0,0 +1,263 @@
+"""Engine EDA tervektor untuk semua fitur sekaligus.
+
+Data dikonversi sekali ke matriks float64, lalu statistik deskriptif, jumlah
+missing, korelasi Pearson dengan target, mutual information dan ringkasan
+per status dihitung dengan operasi matriks NumPy (tanpa loop per fitur).
+Hasilnya berupa tabel peringkat fitur yang menggantikan daftar fitur pilihan
+manual di notebook.
+
+Untuk input sangat besar tersedia mode streaming (``eda_report_stream``):
+momen (count, mean, std, min/max, korelasi, rata-rata per status) dihitung
+persis dari semua chunk, sedangkan kuantil dan mutual information dihitung
+dari reservoir sample berukuran ``sample_rows``.
+
+Hasil di-cache di ``cache/eda/`` dengan key hash isi data + parameter.
+"""
+
+import hashlib
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = os.path.join('cache', 'eda')
+DEFAULT_SAMPLE_ROWS = 200_000
+# Fitur dengan nilai unik <= batas ini dianggap diskrit (kode/kategori)
+DISCRETE_MAX_UNIQUE = 32
+MI_BINS = 10
+PERCENTILES = [25, 50, 75]
+
+
+class _Accumulator:
+    """Akumulasi momen per chunk + reservoir sample untuk kuantil dan MI"""
+
+    def __init__(self, feature_cols, target_col, status_col, sample_rows, random_state):
+        self.feature_cols = list(feature_cols)
+        self.target_col = target_col
+        self.status_col = status_col
+        self.sample_rows = sample_rows
+        self.rng = np.random.default_rng(random_state)
+        n_features = len(self.feature_cols)
+
+        self.rows = 0
+        self.count = np.zeros(n_features)
+        self.sum = np.zeros(n_features)
+        self.sumsq = np.zeros(n_features)
+        self.min = np.full(n_features, np.inf)
+        self.max = np.full(n_features, -np.inf)
+        # Untuk korelasi dengan target (hanya baris yang nilainya tidak missing)
+        self.sum_y = np.zeros(n_features)
+        self.sum_yy = np.zeros(n_features)
+        self.sum_xy = np.zeros(n_features)
+        self.target_counts = {}
+        self.group_count = {}
+        self.group_sum = {}
+
+        self.sample_X = np.empty((0, n_features))
+        self.sample_y = np.empty(0)
+        self.sample_keys = np.empty(0)
+
+    def update(self, chunk):
+        X = chunk[self.feature_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        y = chunk[self.target_col].to_numpy(dtype=np.float64)
+        present = ~np.isnan(X)
+        X0 = np.where(present, X, 0.0)
+        Y = present * y[:, None]
+
+        self.rows += len(X)
+        self.count += present.sum(axis=0)
+        self.sum += X0.sum(axis=0)
+        self.sumsq += (X0 * X0).sum(axis=0)
+        self.min = np.fmin(self.min, np.nanmin(X, axis=0, initial=np.inf, where=present))
+        self.max = np.fmax(self.max, np.nanmax(X, axis=0, initial=-np.inf, where=present))
+        self.sum_y += Y.sum(axis=0)
+        self.sum_yy += (Y * y[:, None]).sum(axis=0)
+        self.sum_xy += (X0 * y[:, None]).sum(axis=0)
+
+        for value, count in zip(*np.unique(y, return_counts=True)):
+            self.target_counts[value] = self.target_counts.get(value, 0) + int(count)
+
+        # Rata-rata per status: satu perkalian matriks one-hot (n, k) x (n, fitur)
+        status = chunk[self.status_col].astype(str).to_numpy()
+        groups, codes = np.unique(status, return_inverse=True)
+        onehot = np.zeros((len(X), len(groups)))
+        onehot[np.arange(len(X)), codes] = 1.0
+        group_sum = onehot.T @ X0
+        group_count = onehot.T @ present
+        for i, group in enumerate(groups):
+            self.group_sum[group] = self.group_sum.get(group, 0.0) + group_sum[i]
+            self.group_count[group] = self.group_count.get(group, 0.0) + group_count[i]
+
+        # Reservoir: simpan sample_rows baris dengan kunci acak terkecil
+        keys = self.rng.random(len(X))
+        self.sample_X = np.concatenate([self.sample_X, X])
+        self.sample_y = np.concatenate([self.sample_y, y])
+        self.sample_keys = np.concatenate([self.sample_keys, keys])
+        if self.sample_rows is not None and len(self.sample_keys) > self.sample_rows:
+            keep = np.argpartition(self.sample_keys, self.sample_rows)[:self.sample_rows]
+            self.sample_X = self.sample_X[keep]
+            self.sample_y = self.sample_y[keep]
+            self.sample_keys = self.sample_keys[keep]
+
+    def finalize(self):
+        count = np.where(self.count > 0, self.count, np.nan)
+        mean = self.sum / count
+        variance = np.maximum(self.sumsq / count - mean ** 2, 0.0)
+        std = np.sqrt(variance * count / np.maximum(count - 1, 1))  # ddof=1 seperti describe()
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_y = self.sum_y / count
+            cov = self.sum_xy / count - mean * mean_y
+            var_y = self.sum_yy / count - mean_y ** 2
+            correlation = cov / np.sqrt(variance * var_y)
+
+        quantiles = np.nanpercentile(self.sample_X, PERCENTILES, axis=0) if len(self.sample_X) else \
+            np.full((len(PERCENTILES), len(self.feature_cols)), np.nan)
+        n_unique = np.array([len(np.unique(column[~np.isnan(column)])) for column in self.sample_X.T])
+        discrete = n_unique <= DISCRETE_MAX_UNIQUE
+
+        describe = pd.DataFrame({
+            'count': self.count,
+            'mean': mean,
+            'std': std,
+            'min': np.where(np.isinf(self.min), np.nan, self.min),
+            **{f'{p}%': quantiles[i] for i, p in enumerate(PERCENTILES)},
+            'max': np.where(np.isinf(self.max), np.nan, self.max),
+            'missing': self.rows - self.count,
+            'missing_pct': (self.rows - self.count) / max(self.rows, 1) * 100,
+            'n_unique': n_unique,
+            'discrete': discrete
+        }, index=self.feature_cols)
+
+        ranking = pd.DataFrame({
+            'mutual_info': mutual_information(self.sample_X, self.sample_y, discrete),
+            'correlation': correlation,
+            'abs_correlation': np.abs(correlation),
+            'discrete': discrete
+        }, index=self.feature_cols).sort_values(['mutual_info', 'abs_correlation'], ascending=False)
+        ranking.insert(0, 'rank', np.arange(1, len(ranking) + 1))
+
+        group_means = pd.DataFrame(
+            {group: self.group_sum[group] / np.where(self.group_count[group] > 0, self.group_count[group], np.nan)
+             for group in sorted(self.group_sum)},
+            index=self.feature_cols
+        ).T
+        group_means.insert(0, 'n', [int(self.group_count[group].max()) for group in group_means.index])
+
+        return {
+            'rows': self.rows,
+            'sampled_rows': len(self.sample_y),
+            'describe': describe,
+            'target_counts': pd.Series({int(k) if float(k).is_integer() else k: v
+                                        for k, v in self.target_counts.items()}).sort_index(),
+            'ranking': ranking,
+            'group_means': group_means
+        }
+
+
+def mutual_information(X, y, discrete, bins=MI_BINS):
+    """Mutual information (nats) setiap kolom X dengan target diskrit y.
+
+    Fitur diskrit memakai nilainya langsung, fitur kontinu didiskretkan ke
+    ``bins`` bin kuantil. Tabel kontingensi semua fitur dihitung dengan satu
+    ``np.bincount`` (kode setiap kolom diberi offset berbeda).
+    """
+    n_rows, n_features = X.shape
+    if n_rows == 0:
+        return np.full(n_features, np.nan)
+    classes, y_codes = np.unique(y, return_inverse=True)
+    n_classes = len(classes)
+
+    codes = np.empty(X.shape, dtype=np.int64)
+    n_levels = np.empty(n_features, dtype=np.int64)
+    for j in range(n_features):
+        column = X[:, j]
+        if not discrete[j]:
+            edges = np.unique(np.nanpercentile(column, np.linspace(0, 100, bins + 1)[1:-1]))
+            column = np.digitize(column, edges)
+        # NaN menjadi level tersendiri
+        _, codes[:, j] = np.unique(column, return_inverse=True)
+        n_levels[j] = codes[:, j].max() + 1
+
+    offsets = np.concatenate([[0], np.cumsum(n_levels)[:-1]])
+    joint = np.bincount(((codes + offsets) * n_classes + y_codes[:, None]).ravel(),
+                        minlength=int(n_levels.sum()) * n_classes).reshape(-1, n_classes) / n_rows
+    p_x = joint.sum(axis=1, keepdims=True)
+    p_y = np.bincount(y_codes, minlength=n_classes) / n_rows
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(joint > 0, joint * np.log(joint / (p_x * p_y)), 0.0).sum(axis=1)
+    return np.add.reduceat(terms, offsets)
+
+
+def _cache_path(cache_dir, data_key, params):
+    key = hashlib.sha256((data_key + json.dumps(params, sort_keys=True, default=str)).encode('utf-8'))
+    return os.path.join(cache_dir, key.hexdigest()[:32] + '.joblib')
+
+
+def _cached(cache_dir, path, compute):
+    if cache_dir is not None and os.path.exists(path):
+        report = joblib.load(path)
+        report['cached'] = True
+        return report
+    report = compute()
+    report['cached'] = False
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        joblib.dump(report, path + '.tmp')
+        os.replace(path + '.tmp', path)
+    return report
+
+
+def eda_report(df, target_col, status_col='Status', feature_cols=None, sample_rows=DEFAULT_SAMPLE_ROWS,
+               cache_dir=CACHE_DIR, random_state=42):
+    """Laporan EDA lengkap untuk DataFrame di memori.
+
+    ``feature_cols`` default: semua kolom numerik selain target. Jika jumlah
+    baris melebihi ``sample_rows``, kuantil dan MI dihitung dari sample.
+    """
+    if feature_cols is None:
+        feature_cols = [col for col in df.select_dtypes(include=[np.number]).columns
+                        if col not in (target_col, 'Status_Binary', 'Status_Encoded')]
+    params = {'target_col': target_col, 'status_col': status_col, 'feature_cols': list(feature_cols),
+              'sample_rows': sample_rows, 'random_state': random_state}
+    data_key = hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()
+
+    def compute():
+        accumulator = _Accumulator(feature_cols, target_col, status_col, sample_rows, random_state)
+        accumulator.update(df)
+        return accumulator.finalize()
+
+    return _cached(cache_dir, _cache_path(cache_dir or '', data_key, params), compute)
+
+
+def eda_report_stream(chunks, target_col, feature_cols, status_col='Status', sample_rows=DEFAULT_SAMPLE_ROWS,
+                      cache_key=None, cache_dir=CACHE_DIR, random_state=42):
+    """Laporan EDA dari iterator chunk (mis. ``pd.read_csv(..., chunksize=...)``).
+
+    Karena data tidak dibaca dua kali, cache hanya dipakai jika ``cache_key``
+    (mis. path + ukuran + mtime file) diberikan oleh pemanggil.
+    """
+    params = {'target_col': target_col, 'status_col': status_col, 'feature_cols': list(feature_cols),
+              'sample_rows': sample_rows, 'random_state': random_state, 'stream': True}
+
+    def compute():
+        accumulator = _Accumulator(feature_cols, target_col, status_col, sample_rows, random_state)
+        for chunk in chunks:
+            accumulator.update(chunk)
+        return accumulator.finalize()
+
+    if cache_key is None:
+        cache_dir = None
+    return _cached(cache_dir, _cache_path(cache_dir or '', str(cache_key), params), compute)
+
+
+def top_features(report, n=4, discrete=None, max_unique=None):
+    """Nama ``n`` fitur dengan peringkat tertinggi (opsional hanya diskrit/kontinu)"""
+    ranking = report['ranking']
+    if discrete is not None:
+        ranking = ranking[ranking['discrete'] == discrete]
+    if max_unique is not None:
+        ranking = ranking[report['describe'].loc[ranking.index, 'n_unique'] <= max_unique]
+    return ranking.index[:n].tolist()
@@ -0,0 +1,172 @@
+"""Evaluasi terpadu semua kandidat model dengan bootstrap confidence interval.
+
+Semua model dievaluasi pada resample bootstrap yang sama (berpasangan),
+sehingga selisih antar model juga punya interval dan peluang menang.
+Resample tidak dikerjakan satu per satu dengan sklearn: indeks bootstrap
+dibangkitkan per batch sebagai array ``(batch, n)``, diubah menjadi matriks
+bobot (berapa kali tiap baris terambil), lalu semua metrik dihitung sebagai
+perkalian matriks dengan vektor indikator. AUC memakai rumus berbasis
+peringkat (Mann-Whitney) atas skor yang diurutkan sekali di awal.
+"""
+
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BOOTSTRAP = 10_000
+DEFAULT_BATCH = 500
+METRICS = ['accuracy', 'precision', 'recall', 'f1', 'auc']
+
+
+def _safe_divide(numerator, denominator):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), np.nan)
+
+
+class _RankAUC:
+    """AUC tertimbang untuk banyak resample sekaligus dari satu pengurutan skor"""
+
+    def __init__(self, y_true, scores):
+        order = np.argsort(scores, kind='mergesort')
+        self.order = order
+        sorted_scores = scores[order]
+        # Skor yang sama (ties) dikelompokkan: negatif di grup yang sama dihitung 0.5
+        self.group_starts = np.flatnonzero(np.r_[True, sorted_scores[1:] != sorted_scores[:-1]])
+        self.positive = y_true[order] == 1
+
+    def __call__(self, weights):
+        weights = weights[:, self.order]
+        pos = np.add.reduceat(np.where(self.positive, weights, 0), self.group_starts, axis=1)
+        neg = np.add.reduceat(np.where(self.positive, 0, weights), self.group_starts, axis=1)
+        neg_below = np.cumsum(neg, axis=1) - neg
+        pairs = (pos * (neg_below + 0.5 * neg)).sum(axis=1)
+        return _safe_divide(pairs, pos.sum(axis=1) * neg.sum(axis=1))
+
+
+def _binary_metrics(weights, y_true, y_pred, auc):
+    """Metrik untuk setiap baris ``weights`` (satu baris = satu resample)"""
+    total = weights.sum(axis=1)
+    tp = weights @ ((y_pred == 1) & (y_true == 1))
+    fp = weights @ ((y_pred == 1) & (y_true == 0))
+    fn = weights @ ((y_pred == 0) & (y_true == 1))
+    correct = weights @ (y_pred == y_true)
+
+    precision = _safe_divide(tp, tp + fp)
+    recall = _safe_divide(tp, tp + fn)
+    return {
+        'accuracy': correct / total,
+        'precision': precision,
+        'recall': recall,
+        'f1': _safe_divide(2 * precision * recall, precision + recall),
+        'auc': auc(weights) if auc is not None else np.full(len(weights), np.nan)
+    }
+
+
+def _multiclass_metrics(weights, y_true, y_pred):
+    correct = weights @ (y_pred == y_true)
+    nan = np.full(len(weights), np.nan)
+    return {'accuracy': correct / weights.sum(axis=1), 'precision': nan, 'recall': nan, 'f1': nan, 'auc': nan}
+
+
+def confusion(y_true, y_pred, n_classes):
+    """Confusion matrix dengan satu ``np.bincount``"""
+    return np.bincount(y_true * n_classes + y_pred, minlength=n_classes ** 2).reshape(n_classes, n_classes)
+
+
+def evaluate_models(y_true, probabilities, predictions=None, n_bootstrap=DEFAULT_BOOTSTRAP, alpha=0.05,
+                    batch_size=DEFAULT_BATCH, random_state=42):
+    """Metrik + bootstrap CI untuk semua model.
+
+    ``probabilities`` adalah dict nama -> probabilitas kelas positif (binary,
+    shape ``(n,)``) atau matriks probabilitas ``(n, k)``. ``predictions``
+    opsional (default: threshold 0.5 / argmax). Mengembalikan dict berisi
+    ``metrics`` (estimasi + CI per model dan metrik), ``pairwise`` (selisih
+    berpasangan antar model), ``confusion`` per model dan ``samples`` (nilai
+    metrik per resample).
+    """
+    wall_start = time.perf_counter()
+    y_true = np.asarray(y_true).astype(np.int64)
+    n = len(y_true)
+    names = list(probabilities)
+    binary = all(np.asarray(p).ndim == 1 for p in probabilities.values())
+    n_classes = 2 if binary else max(np.asarray(p).shape[1] for p in probabilities.values())
+
+    preds = {}
+    aucs = {}
+    for name in names:
+        proba = np.asarray(probabilities[name], dtype=np.float64)
+        if predictions is not None and name in predictions:
+            preds[name] = np.asarray(predictions[name]).astype(np.int64)
+        else:
+            preds[name] = (proba > 0.5).astype(np.int64) if binary else proba.argmax(axis=1)
+        aucs[name] = _RankAUC(y_true, proba) if binary else None
+
+    def metrics_for(weights):
+        if binary:
+            return {name: _binary_metrics(weights, y_true, preds[name], aucs[name]) for name in names}
+        return {name: _multiclass_metrics(weights, y_true, preds[name]) for name in names}
+
+    point = metrics_for(np.ones((1, n)))
+
+    # Resample berpasangan: indeks yang sama dipakai untuk semua model
+    rng = np.random.default_rng(random_state)
+    samples = {name: {metric: [] for metric in METRICS} for name in names}
+    for start in range(0, n_bootstrap, batch_size):
+        size = min(batch_size, n_bootstrap - start)
+        idx = rng.integers(0, n, size=(size, n))
+        weights = np.bincount((idx + n * np.arange(size)[:, None]).ravel(), minlength=size * n)
+        weights = weights.reshape(size, n).astype(np.float64)
+        for name, values in metrics_for(weights).items():
+            for metric, value in values.items():
+                samples[name][metric].append(value)
+    samples = {name: {metric: np.concatenate(values) for metric, values in by_metric.items()}
+               for name, by_metric in samples.items()}
+
+    lower, upper = 100 * alpha / 2, 100 * (1 - alpha / 2)
+    rows = []
+    for name in names:
+        for metric in METRICS:
+            values = samples[name][metric]
+            if np.all(np.isnan(values)):
+                continue
+            rows.append({
+                'model': name,
+                'metric': metric,
+                'estimate': float(point[name][metric][0]),
+                'ci_low': float(np.nanpercentile(values, lower)),
+                'ci_high': float(np.nanpercentile(values, upper)),
+                'std': float(np.nanstd(values))
+            })
+
+    pairwise = []
+    for a, b in itertools.combinations(names, 2):
+        for metric in METRICS:
+            diff = samples[a][metric] - samples[b][metric]
+            if np.all(np.isnan(diff)):
+                continue
+            pairwise.append({
+                'model_a': a,
+                'model_b': b,
+                'metric': metric,
+                'difference': float(point[a][metric][0] - point[b][metric][0]),
+                'ci_low': float(np.nanpercentile(diff, lower)),
+                'ci_high': float(np.nanpercentile(diff, upper)),
+                'p_a_better': float(np.nanmean(diff > 0))
+            })
+
+    return {
+        'metrics': pd.DataFrame(rows),
+        'pairwise': pd.DataFrame(pairwise),
+        'confusion': {name: confusion(y_true, preds[name], n_classes) for name in names},
+        'samples': samples,
+        'n_bootstrap': n_bootstrap,
+        'wall_s': time.perf_counter() - wall_start
+    }
+
+
+def metric_table(evaluation, metric):
+    """Tabel satu metrik per model: estimasi dan CI"""
+    table = evaluation['metrics']
+    return table[table['metric'] == metric].set_index('model')[['estimate', 'ci_low', 'ci_high', 'std']]
@@ -0,0 +1,185 @@
+"""Tahap render figure headless untuk pipeline notebook.
+
+Notebook tidak lagi menggambar langsung dengan ``plt.show()`` (yang di
+backend Agg hanya membuang hasilnya). Setiap figure didaftarkan ke
+``FigureRenderer`` beserta data kecil yang sudah dihitung (jumlah, histogram,
+confusion matrix, kurva ROC), lalu ``render_all()`` menulis semua figure ke
+file PNG di ``figures/``. Figure yang independen dirender paralel di worker
+process joblib, dan figure yang hash datanya sama dengan render sebelumnya
+(tercatat di ``figures/manifest.json``) tidak dirender ulang.
+"""
+
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+
+FIGURE_DIR = 'figures'
+MANIFEST = 'manifest.json'
+DPI = 100
+# Naikkan jika tampilan renderer berubah agar semua figure dirender ulang
+RENDER_VERSION = 1
+
+
+def target_distribution(fig, labels, counts):
+    counts = np.asarray(counts)
+    axes = fig.subplots(1, 3)
+    axes[0].pie(counts, labels=labels, autopct='%1.1f%%', startangle=90)
+    axes[0].set_title('Distribusi Target Variable')
+    axes[1].bar(labels, counts)
+    axes[1].set_title('Jumlah Siswa per Kategori')
+    axes[2].bar(labels, counts / counts.sum() * 100)
+    axes[2].set_title('Persentase per Kategori')
+    axes[2].set_ylabel('Persentase (%)')
+    for ax in axes[1:]:
+        ax.tick_params(axis='x', rotation=45)
+
+
+def missing_heatmap(fig, missing, columns):
+    import seaborn as sns
+
+    ax = fig.subplots()
+    sns.heatmap(missing, cbar=True, yticklabels=False, xticklabels=columns, cmap='viridis', ax=ax)
+    ax.set_title('Missing Values Heatmap')
+
+
+def histograms(fig, hists):
+    axes = np.atleast_1d(fig.subplots(2, 2)).ravel()
+    for ax, (col, (counts, edges)) in zip(axes, hists.items()):
+        ax.stairs(counts, edges, fill=True, alpha=0.7, edgecolor='black')
+        ax.set_title(f'Distribusi {col}')
+        ax.set_xlabel(col)
+        ax.set_ylabel('Frekuensi')
+
+
+def countplots(fig, counts):
+    n = len(counts)
+    axes = np.atleast_1d(fig.subplots(min(2, (n + 1) // 2), min(2, n))).ravel()
+    for ax, (col, (values, value_counts)) in zip(axes, counts.items()):
+        ax.bar([str(v) for v in values], value_counts)
+        ax.set_title(f'Distribusi {col}')
+        ax.set_xlabel(col)
+        ax.set_ylabel('count')
+        ax.tick_params(axis='x', rotation=45)
+
+
+def confusion_matrix(fig, cm, class_names, title):
+    import seaborn as sns
+
+    ax = fig.subplots()
+    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', xticklabels=class_names, yticklabels=class_names, ax=ax)
+    ax.set_title(title)
+    ax.set_ylabel('Actual')
+    ax.set_xlabel('Predicted')
+
+
+def roc_curves(fig, curves):
+    ax = fig.subplots()
+    for label, (fpr, tpr, auc) in curves.items():
+        ax.plot(fpr, tpr, label=f'{label} (AUC = {auc:.3f})')
+    ax.plot([0, 1], [0, 1], 'k--', label='Random')
+    ax.set_xlabel('False Positive Rate')
+    ax.set_ylabel('True Positive Rate')
+    ax.set_title('ROC Curves Comparison')
+    ax.legend()
+    ax.grid(True)
+
+
+def threshold_curves(fig, flagged_rate, precision, recall, operating_rate=None):
+    ax = fig.subplots()
+    ax.plot(flagged_rate, precision, label='Precision')
+    ax.plot(flagged_rate, recall, label='Recall')
+    if operating_rate is not None:
+        ax.axvline(operating_rate, color='k', linestyle='--', label='Operating point')
+    ax.set_xlabel('Proporsi Mahasiswa Ditandai')
+    ax.set_ylabel('Nilai')
+    ax.set_title('Precision / Recall per Kapasitas Intervensi')
+    ax.legend()
+    ax.grid(True)
+
+
+RENDERERS = {
+    'target_distribution': target_distribution,
+    'missing_heatmap': missing_heatmap,
+    'histograms': histograms,
+    'countplots': countplots,
+    'confusion_matrix': confusion_matrix,
+    'roc_curves': roc_curves,
+    'threshold_curves': threshold_curves
+}
+
+
+def _render(kind, path, figsize, payload):
+    start = time.perf_counter()
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=figsize)
+    RENDERERS[kind](fig, **payload)
+    fig.tight_layout()
+    fig.savefig(path + '.tmp.png', dpi=DPI)
+    plt.close(fig)
+    os.replace(path + '.tmp.png', path)
+    return time.perf_counter() - start
+
+
+class FigureRenderer:
+    """Kumpulkan figure selama pipeline berjalan, lalu render sekaligus"""
+
+    def __init__(self, output_dir=FIGURE_DIR, n_jobs=-1):
+        self.output_dir = output_dir
+        self.n_jobs = n_jobs
+        self.figures = {}
+
+    def add(self, name, kind, figsize=(8, 6), **payload):
+        """Daftarkan figure; ``payload`` adalah data kecil yang sudah dihitung"""
+        self.figures[name] = (kind, tuple(figsize), payload)
+
+    def _manifest_path(self):
+        return os.path.join(self.output_dir, MANIFEST)
+
+    def _load_manifest(self):
+        if os.path.exists(self._manifest_path()):
+            with open(self._manifest_path()) as f:
+                return json.load(f)
+        return {}
+
+    def render_all(self):
+        """Render figure yang berubah secara paralel; kembalikan ringkasan per figure"""
+        wall_start = time.perf_counter()
+        os.makedirs(self.output_dir, exist_ok=True)
+        manifest = self._load_manifest()
+
+        pending = []
+        results = {}
+        for name, (kind, figsize, payload) in self.figures.items():
+            path = os.path.join(self.output_dir, f'{name}.png')
+            digest = joblib.hash([RENDER_VERSION, kind, figsize, payload])
+            entry = manifest.get(name)
+            if entry is not None and entry['hash'] == digest and os.path.exists(path):
+                results[name] = {'path': path, 'cached': True, 'render_s': 0.0}
+            else:
+                pending.append((name, kind, path, figsize, payload, digest))
+
+        timings = Parallel(n_jobs=self.n_jobs)(
+            delayed(_render)(kind, path, figsize, payload) for _, kind, path, figsize, payload, _ in pending
+        ) if pending else []
+
+        for (name, _, path, _, _, digest), render_s in zip(pending, timings):
+            manifest[name] = {'hash': digest, 'file': os.path.basename(path)}
+            results[name] = {'path': path, 'cached': False, 'render_s': render_s}
+
+        with open(self._manifest_path() + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(self._manifest_path() + '.tmp', self._manifest_path())
+
+        return {
+            'figures': results,
+            'rendered': len(pending),
+            'cached': len(results) - len(pending),
+            'wall_s': time.perf_counter() - wall_start
+        }
@@ -19,24 +19,33 @@ Original file is located at
 
 import pandas as pd
 import numpy as np
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
+from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.svm import SVC
-from sklearn.metrics import classification_report, confusion_matrix, accuracy_score, roc_auc_score, roc_curve
+from sklearn.metrics import classification_report, roc_curve
 from sklearn.impute import SimpleImputer
 import warnings
 warnings.filterwarnings('ignore')
 
 """### Menyiapkan data yang akan diguankan"""
 
-# Yang benar:
-df = pd.read_csv("data.csv", sep=';')
+# Dtype ringkas (int8/int16, float32, Status categorical) + snapshot Parquet di cache/data/
+# Jika EDUCATION_DB_URL di-set, training dan EDA membaca tabel education di database secara streaming
+# (hanya kolom yang dipakai, per chunk lewat server-side cursor); tanpa itu (mis. run pertama) dari data.csv
+import os
+from data_loader import DTYPES, load_students
+
+EDUCATION_DB_URL = os.environ.get("EDUCATION_DB_URL")
+if EDUCATION_DB_URL:
+    from sqlalchemy import create_engine
+    from db_reader import read_frame
+
+    df = read_frame(create_engine(EDUCATION_DB_URL), columns=list(DTYPES))
+    print(f"✅ Data dibaca dari tabel education: {len(df):,} baris")
+else:
+    df = load_students("data.csv", sep=';')
 df.head(10)
 
 """Dataset ini merupakan kumpulan data komprehensif yang mencerminkan informasi akademik dan demografis mahasiswa dari Jaya Jaya Institut. Dataset ini dirancang untuk mendukung proses analisis dan pemodelan prediktif dalam upaya menentukan status akhir mahasiswa, apakah mereka akan dropout (mengundurkan diri), lulus, atau masih aktif dalam masa studinya.
@@ -51,22 +60,20 @@ print("=" * 40)
 # Gabungkan 'Graduate' dan 'Enrolled' sebagai 'Non-Dropout' (0)
 # 'Dropout' tetap sebagai 'Dropout' (1)
 
-df_binary = df.copy()
-df_binary['Status_Binary'] = df_binary['Status'].map({
+status_binary = df['Status'].map({
     'Graduate': 0,    # Non-Dropout
     'Enrolled': 0,    # Non-Dropout (masih berkuliah)
     'Dropout': 1      # Dropout
-})
+}).astype(np.int8)
 
 print("📊 BINARY CLASSIFICATION (Dropout vs Non-Dropout):")
-binary_counts = df_binary['Status_Binary'].value_counts()
+binary_counts = status_binary.value_counts()
 print(f"- Non-Dropout (Graduate + Enrolled): {binary_counts[0]:,} siswa ({binary_counts[0]/len(df)*100:.1f}%)")
 print(f"- Dropout: {binary_counts[1]:,} siswa ({binary_counts[1]/len(df)*100:.1f}%)")
 
 # OPSI 2: Multi-class Classification (3 kelas)
-df_multi = df.copy()
 label_encoder = LabelEncoder()
-df_multi['Status_Encoded'] = label_encoder.fit_transform(df_multi['Status'])
+status_encoded = label_encoder.fit_transform(df['Status']).astype(np.int8)
 
 print(f"\n📊 MULTI-CLASS CLASSIFICATION:")
 status_mapping = dict(zip(label_encoder.classes_, label_encoder.transform(label_encoder.classes_)))
@@ -75,14 +82,16 @@ print(f"Status mapping: {status_mapping}")
 # Pilih pendekatan (default: binary classification untuk prediksi dropout)
 use_binary = True  # Set False untuk multi-class
 
+# Kolom target ditambahkan langsung ke df, tanpa membuat salinan DataFrame
+df_processed = df
 if use_binary:
-    df_processed = df_binary.copy()
     target_col = 'Status_Binary'
+    df_processed[target_col] = status_binary
     print(f"\n✅ Menggunakan BINARY CLASSIFICATION")
     class_names = ['Non-Dropout', 'Dropout']
 else:
-    df_processed = df_multi.copy()
     target_col = 'Status_Encoded'
+    df_processed[target_col] = status_encoded
     print(f"\n✅ Menggunakan MULTI-CLASS CLASSIFICATION")
     class_names = list(label_encoder.classes_)
 
@@ -101,53 +110,34 @@ Akhirnya, pengguna diberikan opsi untuk memilih pendekatan mana yang akan diguna
 print(f"\n🔍 EXPLORATORY DATA ANALYSIS (EDA)")
 print("=" * 50)
 
-# Set style untuk plot
-plt.style.use('default')
-sns.set_palette("husl")
+# Semua figure didaftarkan ke renderer dan ditulis ke figures/ di tahap render (lihat akhir Evaluation)
+from figures import FigureRenderer
+
+figures = FigureRenderer(output_dir="figures")
 
 # 2.1 BASIC STATISTICS
 print(f"\n📈 STATISTIK DESKRIPTIF")
 print("-" * 30)
 
-# Tampilkan statistik deskriptif untuk numerical columns
-numerical_cols = df_processed.select_dtypes(include=[np.number]).columns.tolist()
-# Remove target columns from numerical analysis
-target_cols_to_remove = ['Status_Binary', 'Status_Encoded']
-numerical_cols = [col for col in numerical_cols if col not in target_cols_to_remove]
+# Semua statistik EDA (deskriptif, missing, korelasi, mutual information, rata-rata per status)
+# dihitung sekali untuk semua fitur dan di-cache berdasarkan hash data
+from eda import eda_report, top_features
+
+eda = eda_report(df_processed, target_col, status_col='Status')
+numerical_cols = eda['describe'].index.tolist()
 
-print(f"Kolom numerik: {len(numerical_cols)} kolom")
+print(f"Kolom numerik: {len(numerical_cols)} kolom" + (" (dari cache)" if eda['cached'] else ""))
 if len(numerical_cols) > 0:
-    print(df_processed[numerical_cols].describe().round(2))
+    print(eda['describe'].drop(columns=['missing', 'missing_pct', 'discrete']).round(2))
 
 # 2.2 TARGET VARIABLE ANALYSIS
 print(f"\n🎯 ANALISIS TARGET VARIABLE")
 print("-" * 30)
 
 # Visualisasi distribusi target
-plt.figure(figsize=(15, 5))
-
-plt.subplot(1, 3, 1)
-target_counts = df_processed[target_col].value_counts()
-plt.pie(target_counts.values, labels=[class_names[i] for i in target_counts.index],
-        autopct='%1.1f%%', startangle=90)
-plt.title('Distribusi Target Variable')
-
-plt.subplot(1, 3, 2)
-target_counts_named = pd.Series(target_counts.values, index=[class_names[i] for i in target_counts.index])
-target_counts_named.plot(kind='bar')
-plt.title('Jumlah Siswa per Kategori')
-plt.xticks(rotation=45)
-
-plt.subplot(1, 3, 3)
-target_pct = df_processed[target_col].value_counts(normalize=True) * 100
-target_pct_named = pd.Series(target_pct.values, index=[class_names[i] for i in target_pct.index])
-target_pct_named.plot(kind='bar')
-plt.title('Persentase per Kategori')
-plt.ylabel('Persentase (%)')
-plt.xticks(rotation=45)
-
-plt.tight_layout()
-plt.show()
+target_counts = eda['target_counts'].sort_values(ascending=False)
+figures.add('target_distribution', 'target_distribution', figsize=(15, 5),
+            labels=[class_names[i] for i in target_counts.index], counts=target_counts.to_numpy())
 
 # Print statistik target
 print(f"Distribusi Target:")
@@ -159,8 +149,8 @@ for idx, count in target_counts.items():
 print(f"\n❓ ANALISIS MISSING VALUES")
 print("-" * 30)
 
-missing_data = df_processed.isnull().sum()
-missing_pct = (missing_data / len(df_processed)) * 100
+missing_data = eda['describe']['missing']
+missing_pct = eda['describe']['missing_pct']
 
 if missing_data.sum() > 0:
     missing_df = pd.DataFrame({
@@ -173,10 +163,8 @@ if missing_data.sum() > 0:
 
     # Visualisasi missing values
     if len(missing_df[missing_df['Missing_Count'] > 0]) > 0:
-        plt.figure(figsize=(12, 6))
-        sns.heatmap(df_processed.isnull(), cbar=True, yticklabels=False, cmap='viridis')
-        plt.title('Missing Values Heatmap')
-        plt.show()
+        figures.add('missing_values', 'missing_heatmap', figsize=(12, 6),
+                    missing=df_processed.isnull().to_numpy(), columns=list(df_processed.columns))
 else:
     print("✅ Tidak ada missing values dalam dataset")
 
@@ -184,46 +172,23 @@ else:
 print(f"\n📊 ANALISIS FITUR NUMERIK")
 print("-" * 30)
 
-# Top fitur numerik penting untuk dianalisis
-important_numerical = ['Age_at_enrollment', 'Admission_grade',
-                      'Curricular_units_1st_sem_grade', 'Curricular_units_2nd_sem_grade',
-                      'Previous_qualification_grade', 'GDP', 'Unemployment_rate', 'Inflation_rate']
-
-# Filter kolom yang ada di dataset
-available_numerical = [col for col in important_numerical if col in df_processed.columns]
-if len(available_numerical) == 0:
-    available_numerical = numerical_cols[:4]  # Ambil 4 kolom numerik pertama
+# Fitur kontinu dengan peringkat mutual information tertinggi terhadap target
+available_numerical = top_features(eda, n=4, discrete=False)
 
 if len(available_numerical) >= 4:
-    fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-
-    for i, col in enumerate(available_numerical[:4]):
-        row = i // 2
-        col_idx = i % 2
-
-        # Histogram
-        axes[row, col_idx].hist(df_processed[col].dropna(), bins=30, alpha=0.7, edgecolor='black')
-        axes[row, col_idx].set_title(f'Distribusi {col}')
-        axes[row, col_idx].set_xlabel(col)
-        axes[row, col_idx].set_ylabel('Frekuensi')
-
-    plt.tight_layout()
-    plt.show()
+    # Histogram dihitung di sini, worker render hanya menerima jumlah per bin
+    figures.add('numerical_distributions', 'histograms', figsize=(15, 10), hists={
+        col: np.histogram(df_processed[col].dropna(), bins=30) for col in available_numerical[:4]
+    })
 
-# Correlation dengan target untuk numerical features
+# Peringkat semua fitur: mutual information dan korelasi dengan target
 if len(numerical_cols) > 0:
-    print(f"\nKorelasi fitur numerik dengan Target:")
-    correlations = {}
-    for col in numerical_cols[:10]:  # Ambil 10 kolom pertama
-        if col in df_processed.columns:
-            corr = df_processed[col].corr(df_processed[target_col])
-            if not np.isnan(corr):
-                correlations[col] = corr
-
-    if correlations:
-        correlation_df = pd.DataFrame.from_dict(correlations, orient='index', columns=['Correlation'])
-        correlation_df = correlation_df.sort_values('Correlation', key=abs, ascending=False)
-        print(correlation_df.head(10).round(4))
+    print(f"\nPeringkat fitur terhadap Target (mutual information, korelasi):")
+    correlation_df = eda['ranking']
+    print(correlation_df.round(4).to_string())
+
+    print(f"\nRata-rata 10 fitur teratas per status:")
+    print(eda['group_means'][['n'] + top_features(eda, n=10)].round(2).T.to_string())
 
 # 2.5 CATEGORICAL FEATURES ANALYSIS
 print(f"\n📝 ANALISIS FITUR KATEGORIKAL")
@@ -236,33 +201,17 @@ if 'Status' in categorical_cols:
 
 print(f"Kolom kategorikal: {len(categorical_cols)} kolom")
 
-# Analisis beberapa fitur kategorikal penting
-important_categorical = ['Gender', 'Scholarship_holder', 'Debtor', 'Tuition_fees_up_to_date']
-available_categorical = [col for col in important_categorical if col in df_processed.columns]
+# Fitur diskrit (sedikit nilai unik) dengan peringkat tertinggi terhadap target
+available_categorical = top_features(eda, n=4, discrete=True, max_unique=10)
 if len(available_categorical) == 0 and len(categorical_cols) > 0:
     available_categorical = categorical_cols[:4]  # Ambil 4 kolom kategorikal pertama
 
 if len(available_categorical) > 0:
     fig_rows = min(2, (len(available_categorical) + 1) // 2)
-    fig_cols = min(2, len(available_categorical))
-    fig, axes = plt.subplots(fig_rows, fig_cols, figsize=(15, 5 * fig_rows))
-
-    if fig_rows == 1 and fig_cols == 1:
-        axes = [axes]
-    elif fig_rows == 1 or fig_cols == 1:
-        axes = axes.flatten()
-    else:
-        axes = axes.flatten()
-
-    for i, col in enumerate(available_categorical[:4]):
-        if col in df_processed.columns:
-            # Countplot
-            sns.countplot(data=df_processed, x=col, ax=axes[i])
-            axes[i].set_title(f'Distribusi {col}')
-            axes[i].tick_params(axis='x', rotation=45)
-
-    plt.tight_layout()
-    plt.show()
+    value_counts = {col: df_processed[col].value_counts().sort_index() for col in available_categorical[:4]}
+    figures.add('categorical_distributions', 'countplots', figsize=(15, 5 * fig_rows), counts={
+        col: (counts.index.to_numpy(), counts.to_numpy()) for col, counts in value_counts.items()
+    })
 
 """Secara keseluruhan, dataset ini mencakup 4424 entri (baris data) yang mewakili individu mahasiswa, serta 37 atribut (kolom) yang merekam berbagai aspek penting, mulai dari latar belakang pribadi hingga performa akademik. Setiap kolom memberikan wawasan spesifik yang berpotensi menjadi indikator terhadap keberhasilan studi mahasiswa.
 
@@ -301,13 +250,14 @@ if len(categorical_cols_to_encode) > 0:
     print(f"Encoding {len(categorical_cols_to_encode)} categorical columns...")
     df_encoded = pd.get_dummies(df_processed, columns=categorical_cols_to_encode, drop_first=True)
 else:
-    df_encoded = df_processed.copy()
+    df_encoded = df_processed
 
 """Setelah nilai kosong ditangani, proses berikutnya adalah encoding atau pengkodean variabel kategorikal ke bentuk numerik agar bisa diproses oleh model. Semua kolom bertipe objek yang bukan kolom target (Status) dikodekan menggunakan metode one-hot encoding melalui fungsi pd.get_dummies(). Proses ini menghasilkan kolom baru yang merepresentasikan kategori dalam format biner (0 dan 1), menghindari ambiguitas dalam interpretasi nilai kategorikal oleh model."""
 
 # Pisahkan features dan target
 feature_cols = [col for col in df_encoded.columns if col not in ['Status', 'Status_Binary', 'Status_Encoded']]
-X = df_encoded[feature_cols]
+# Model dilatih dengan float64 (satu-satunya salinan matriks fitur)
+X = df_encoded[feature_cols].astype(np.float64)
 y = df_encoded[target_col]
 
 print(f"✅ Features: {X.shape[1]} kolom")
@@ -349,27 +299,9 @@ Gradient Boosting adalah teknik pembelajaran ansambel yang membangun model predi
 print(f"\n🤖 TRAINING GRADIENT BOOSTING")
 print("=" * 40)
 
-# Training Gradient Boosting
+# Definisi Gradient Boosting (CV dan fit dijalankan oleh orkestrator paralel di bawah)
 gb_model = GradientBoostingClassifier(random_state=42)
 
-print(f"\n🔄 Training Gradient Boosting...")
-
-# Cross validation
-gb_cv_scores = cross_val_score(gb_model, X_train, y_train, cv=5, scoring='accuracy')
-
-# Fit model
-gb_model.fit(X_train, y_train)
-
-# Prediksi
-gb_y_pred = gb_model.predict(X_test)
-gb_y_pred_proba = gb_model.predict_proba(X_test)
-
-if use_binary:
-    gb_y_pred_proba = gb_y_pred_proba[:, 1]  # Probability of positive class
-
-print(f"   ✅ CV Accuracy: {gb_cv_scores.mean():.4f} (±{gb_cv_scores.std():.4f})")
-print(f"   ✅ Model trained successfully!")
-
 """## Logistic Regression
 Logistic Regression merupakan algoritma klasifikasi statistik yang digunakan untuk memodelkan hubungan antara satu atau lebih variabel independen dengan variabel dependen biner. Berbeda dengan regresi linear, algoritma ini menggunakan fungsi sigmoid untuk mengubah output menjadi probabilitas dalam rentang 0 hingga 1, yang kemudian diklasifikasikan ke dalam dua kelas. Logistic Regression sangat cocok untuk kasus klasifikasi sederhana dan dapat diinterpretasikan dengan mudah karena koefisiennya menunjukkan pengaruh masing-masing fitur terhadap peluang kelas. Meskipun performanya tidak sekuat algoritma ansambel pada data kompleks, Logistic Regression sering digunakan sebagai baseline model karena kecepatan pelatihan dan kemudahan implementasinya.
 """
@@ -381,27 +313,9 @@ Logistic Regression merupakan algoritma klasifikasi statistik yang digunakan unt
 print(f"\n🤖 TRAINING LOGISTIC REGRESSION")
 print("=" * 40)
 
-# Training Logistic Regression
+# Definisi Logistic Regression (CV dan fit dijalankan oleh orkestrator paralel di bawah)
 lr_model = LogisticRegression(random_state=42, max_iter=1000)
 
-print(f"\n🔄 Training Logistic Regression...")
-
-# Cross validation
-lr_cv_scores = cross_val_score(lr_model, X_train, y_train, cv=5, scoring='accuracy')
-
-# Fit model
-lr_model.fit(X_train, y_train)
-
-# Prediksi
-lr_y_pred = lr_model.predict(X_test)
-lr_y_pred_proba = lr_model.predict_proba(X_test)
-
-if use_binary:
-    lr_y_pred_proba = lr_y_pred_proba[:, 1]  # Probability of positive class
-
-print(f"   ✅ CV Accuracy: {lr_cv_scores.mean():.4f} (±{lr_cv_scores.std():.4f})")
-print(f"   ✅ Model trained successfully!")
-
 """## Random forest
 Random Forest adalah algoritma pembelajaran ansambel yang menggunakan pendekatan bagging (bootstrap aggregating) untuk membangun sejumlah pohon keputusan (decision trees) dari subset acak data pelatihan. Setiap pohon dibangun dari sampel data yang berbeda dan menggunakan subset fitur yang juga dipilih secara acak. Hasil prediksi akhir ditentukan melalui pemungutan suara mayoritas (majority voting) dari seluruh pohon. Kelebihan utama Random Forest adalah kemampuannya dalam menangani data yang kompleks dan besar tanpa overfitting secara signifikan. Selain itu, algoritma ini juga dapat memberikan estimasi pentingnya setiap fitur dalam prediksi. Namun, interpretasi model bisa menjadi sulit karena kompleksitas gabungan banyak pohon.
 """
@@ -413,130 +327,173 @@ Random Forest adalah algoritma pembelajaran ansambel yang menggunakan pendekatan
 print(f"\n🤖 TRAINING RANDOM FOREST")
 print("=" * 40)
 
-# Training Random Forest
+# Definisi Random Forest (CV dan fit dijalankan oleh orkestrator paralel di bawah)
 rf_model = RandomForestClassifier(n_estimators=100, random_state=42)
 
-print(f"\n🔄 Training Random Forest...")
+"""## Hyperparameter Search
 
-# Cross validation
-rf_cv_scores = cross_val_score(rf_model, X_train, y_train, cv=5, scoring='accuracy')
+Sebelum training final, setiap model dicari hyperparameter-nya dengan successive halving: semua kombinasi dievaluasi dengan cross-validation di subset kecil data latih, lalu hanya sepertiga terbaik yang lanjut ke subset tiga kali lebih besar sampai seluruh data latih. Parameter default selalu ikut sampai rung terakhir sehingga hasil pencarian tidak pernah lebih buruk dari baseline. Pencarian dibatasi waktu dan riwayat trial disimpan, sehingga rerun melanjutkan dari trial yang sudah ada.
+"""
 
-# Fit model
-rf_model.fit(X_train, y_train)
+# ====================================
+#  HYPERPARAMETER SEARCH
+# ====================================
 
-# Prediksi
-rf_y_pred = rf_model.predict(X_test)
-rf_y_pred_proba = rf_model.predict_proba(X_test)
+from tuning import successive_halving, search_report
+from sklearn.model_selection import ParameterGrid
 
-if use_binary:
-    rf_y_pred_proba = rf_y_pred_proba[:, 1]  # Probability of positive class
+print(f"\n🔎 HYPERPARAMETER SEARCH (SUCCESSIVE HALVING)")
+print("=" * 40)
 
-print(f"   ✅ CV Accuracy: {rf_cv_scores.mean():.4f} (±{rf_cv_scores.std():.4f})")
-print(f"   ✅ Model trained successfully!")
+search_spaces = {
+    'Gradient Boosting': (gb_model, {
+        'n_estimators': [100, 200, 300],
+        'learning_rate': [0.03, 0.1, 0.2],
+        'max_depth': [2, 3, 4]
+    }),
+    'Logistic Regression': (lr_model, {
+        'C': [0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0],
+        'class_weight': [None, 'balanced']
+    }),
+    'Random Forest': (rf_model, {
+        'n_estimators': [100, 300],
+        'max_depth': [None, 10, 20],
+        'min_samples_leaf': [1, 2, 4],
+        'max_features': ['sqrt', 0.3]
+    })
+}
+search_budget_s = 300  # batas waktu per model (detik)
+
+search_results = {}
+search_summary = []
+for name, (estimator, param_grid) in search_spaces.items():
+    result = successive_halving(name, estimator, param_grid, X_train, y_train,
+                                budget_s=search_budget_s, history_path="cache/tuning/trials.jsonl")
+    search_results[name] = result
+    search_summary.append(search_report(result, len(ParameterGrid(param_grid)), len(y_train)))
+    print(f"{name}: {result['best_params']} (CV {result['best_score']:.4f})")
+
+search_summary = pd.DataFrame(search_summary).set_index('model')
+print(search_summary.round(3).to_string())
+
+# Parameter hasil pencarian hanya dipakai jika rung terakhir (seluruh data latih) tercapai
+for name, (estimator, _) in search_spaces.items():
+    if search_results[name]['completed']:
+        estimator.set_params(**search_results[name]['best_params'])
+    else:
+        print(f"⚠️ {name}: budget habis sebelum rung terakhir, tetap memakai parameter default")
 
-"""## Evaluation"""
+"""## Training Paralel
+
+Ketiga model beserta seluruh fold cross-validation-nya dilatih bersamaan di worker pool menggunakan satu set indeks fold stratified yang sama. Fit final di seluruh data latih juga dijadwalkan di pool yang sama, lalu dicatat waktu wall dan CPU untuk setiap model dan fold.
+"""
 
 # ====================================
-#  EVALUASI GRADIENT BOOSTING
+#  TRAINING ORCHESTRATOR
 # ====================================
 
-print(f"\n📊 EVALUASI GRADIENT BOOSTING")
-print("=" * 40)
-
-# Evaluasi Gradient Boosting
-gb_accuracy = accuracy_score(y_test, gb_y_pred)
-gb_auc = None
+from training import make_folds, train_models, timing_report
 
-if use_binary:
-    gb_auc = roc_auc_score(y_test, gb_y_pred_proba)
-
-print(f"Test Accuracy: {gb_accuracy:.4f}")
-if gb_auc:
-    print(f"AUC Score: {gb_auc:.4f}")
+print(f"\n🤖 TRAINING SEMUA MODEL (PARALEL)")
+print("=" * 40)
 
-print(f"\nClassification Report - Gradient Boosting:")
-print(classification_report(y_test, gb_y_pred, target_names=class_names))
+candidate_models = {
+    'Gradient Boosting': gb_model,
+    'Logistic Regression': lr_model,
+    'Random Forest': rf_model
+}
 
-print(f"\nConfusion Matrix - Gradient Boosting:")
-gb_cm = confusion_matrix(y_test, gb_y_pred)
-print(gb_cm)
+# Hasil training di-cache berdasarkan hash data, konfigurasi dan hyperparameter;
+# rerun tanpa perubahan langsung memuat model dari cache
+training_config = {'use_binary': use_binary, 'scaler': scaler.get_params(), 'test_size': 0.2, 'random_state': 42}
 
-# Visualisasi Confusion Matrix
-plt.figure(figsize=(8, 6))
-sns.heatmap(gb_cm, annot=True, fmt='d', cmap='Blues',
-            xticklabels=class_names, yticklabels=class_names)
-plt.title('Confusion Matrix - Gradient Boosting')
-plt.ylabel('Actual')
-plt.xlabel('Predicted')
-plt.show()
+shared_folds = make_folds(y_train, n_splits=5)
+trained_models, training_timing = train_models(candidate_models, X_train, y_train, folds=shared_folds,
+                                               cache_dir="cache/training", config=training_config)
 
-# ====================================
-#  EVALUASI LOGISTIC REGRESSION
-# ====================================
+gb_model = trained_models['Gradient Boosting']['model']
+lr_model = trained_models['Logistic Regression']['model']
+rf_model = trained_models['Random Forest']['model']
 
-print(f"\n📊 EVALUASI LOGISTIC REGRESSION")
-print("=" * 40)
+gb_cv_scores = trained_models['Gradient Boosting']['cv_scores']
+lr_cv_scores = trained_models['Logistic Regression']['cv_scores']
+rf_cv_scores = trained_models['Random Forest']['cv_scores']
 
-# Evaluasi Logistic Regression
-lr_accuracy = accuracy_score(y_test, lr_y_pred)
-lr_auc = None
+# Prediksi
+gb_y_pred = gb_model.predict(X_test)
+gb_y_pred_proba = gb_model.predict_proba(X_test)
+lr_y_pred = lr_model.predict(X_test)
+lr_y_pred_proba = lr_model.predict_proba(X_test)
+rf_y_pred = rf_model.predict(X_test)
+rf_y_pred_proba = rf_model.predict_proba(X_test)
 
 if use_binary:
-    lr_auc = roc_auc_score(y_test, lr_y_pred_proba)
-
-print(f"Test Accuracy: {lr_accuracy:.4f}")
-if lr_auc:
-    print(f"AUC Score: {lr_auc:.4f}")
+    gb_y_pred_proba = gb_y_pred_proba[:, 1]  # Probability of positive class
+    lr_y_pred_proba = lr_y_pred_proba[:, 1]
+    rf_y_pred_proba = rf_y_pred_proba[:, 1]
 
-print(f"\nClassification Report - Logistic Regression:")
-print(classification_report(y_test, lr_y_pred, target_names=class_names))
+for model_name, trained in trained_models.items():
+    print(f"   ✅ {model_name} CV Accuracy: {trained['cv_scores'].mean():.4f} (±{trained['cv_scores'].std():.4f})")
 
-print(f"\nConfusion Matrix - Logistic Regression:")
-lr_cm = confusion_matrix(y_test, lr_y_pred)
-print(lr_cm)
+print(f"\n⏱️ Waktu training per model dan fold:")
+print(training_timing.pivot(index='fold', columns='model', values='wall_s').round(3))
+if training_timing['cached'].any():
+    print(f"♻️ Dari cache: {sorted(training_timing.loc[training_timing['cached'], 'model'].unique())}")
+print(timing_report(training_timing).round(3))
+print(f"Total wall time: {training_timing.attrs['total_wall_s']:.2f} s")
 
-# Visualisasi Confusion Matrix
-plt.figure(figsize=(8, 6))
-sns.heatmap(lr_cm, annot=True, fmt='d', cmap='Blues',
-            xticklabels=class_names, yticklabels=class_names)
-plt.title('Confusion Matrix - Logistic Regression')
-plt.ylabel('Actual')
-plt.xlabel('Predicted')
-plt.show()
+"""## Evaluation"""
 
 # ====================================
-#  EVALUASI RANDOM FOREST
+#  EVALUASI SEMUA MODEL (BOOTSTRAP)
 # ====================================
 
-print(f"\n📊 EVALUASI RANDOM FOREST")
-print("=" * 40)
+from evaluation import evaluate_models, metric_table
 
-# Evaluasi Random Forest
-rf_accuracy = accuracy_score(y_test, rf_y_pred)
-rf_auc = None
+# Semua model dievaluasi pada 10.000 resample bootstrap yang sama (berpasangan)
+model_predictions = {
+    'Gradient Boosting': gb_y_pred,
+    'Logistic Regression': lr_y_pred,
+    'Random Forest': rf_y_pred
+}
+model_probabilities = {
+    'Gradient Boosting': gb_y_pred_proba,
+    'Logistic Regression': lr_y_pred_proba,
+    'Random Forest': rf_y_pred_proba
+}
 
-if use_binary:
-    rf_auc = roc_auc_score(y_test, rf_y_pred_proba)
+evaluation = evaluate_models(y_test, model_probabilities, predictions=model_predictions, n_bootstrap=10_000)
+accuracy_table = metric_table(evaluation, 'accuracy')
+auc_table = metric_table(evaluation, 'auc') if use_binary else None
 
-print(f"Test Accuracy: {rf_accuracy:.4f}")
-if rf_auc:
-    print(f"AUC Score: {rf_auc:.4f}")
+for model_name, y_pred_model in model_predictions.items():
+    print(f"\n📊 EVALUASI {model_name.upper()}")
+    print("=" * 40)
 
-print(f"\nClassification Report - Random Forest:")
-print(classification_report(y_test, rf_y_pred, target_names=class_names))
+    accuracy_row = accuracy_table.loc[model_name]
+    print(f"Test Accuracy: {accuracy_row['estimate']:.4f} "
+          f"(95% CI {accuracy_row['ci_low']:.4f} - {accuracy_row['ci_high']:.4f})")
+    if use_binary:
+        auc_row = auc_table.loc[model_name]
+        print(f"AUC Score: {auc_row['estimate']:.4f} (95% CI {auc_row['ci_low']:.4f} - {auc_row['ci_high']:.4f})")
 
-print(f"\nConfusion Matrix - Random Forest:")
-rf_cm = confusion_matrix(y_test, rf_y_pred)
-print(rf_cm)
+    print(f"\nClassification Report - {model_name}:")
+    print(classification_report(y_test, y_pred_model, target_names=class_names))
 
-# Visualisasi Confusion Matrix
-plt.figure(figsize=(8, 6))
-sns.heatmap(rf_cm, annot=True, fmt='d', cmap='Blues',
-            xticklabels=class_names, yticklabels=class_names)
-plt.title('Confusion Matrix - Random Forest')
-plt.ylabel('Actual')
-plt.xlabel('Predicted')
-plt.show()
+    print(f"\nConfusion Matrix - {model_name}:")
+    print(evaluation['confusion'][model_name])
+
+    # Visualisasi Confusion Matrix
+    figures.add(f"confusion_matrix_{model_name.lower().replace(' ', '_')}", 'confusion_matrix',
+                cm=evaluation['confusion'][model_name], class_names=class_names,
+                title=f'Confusion Matrix - {model_name}')
+
+gb_accuracy = accuracy_table.loc['Gradient Boosting', 'estimate']
+lr_accuracy = accuracy_table.loc['Logistic Regression', 'estimate']
+rf_accuracy = accuracy_table.loc['Random Forest', 'estimate']
+gb_auc = auc_table.loc['Gradient Boosting', 'estimate'] if use_binary else None
+lr_auc = auc_table.loc['Logistic Regression', 'estimate'] if use_binary else None
+rf_auc = auc_table.loc['Random Forest', 'estimate'] if use_binary else None
 
 # ====================================
 # CELL 7: PERBANDINGAN SEMUA MODEL
@@ -576,8 +533,19 @@ results_df = pd.DataFrame({
     'AUC': [models_results[model]['auc'] if models_results[model]['auc'] else 0 for model in models_results.keys()]
 })
 
+results_df['Test_Accuracy_CI'] = results_df['Model'].map(
+    lambda model: f"{accuracy_table.loc[model, 'ci_low']:.4f} - {accuracy_table.loc[model, 'ci_high']:.4f}")
+if use_binary:
+    results_df['AUC_CI'] = results_df['Model'].map(
+        lambda model: f"{auc_table.loc[model, 'ci_low']:.4f} - {auc_table.loc[model, 'ci_high']:.4f}")
+
 results_df = results_df.sort_values('Test_Accuracy', ascending=False)
-print(results_df.round(4))
+print(results_df.round(4).to_string())
+
+# Selisih berpasangan antar model: interval selisih dan peluang model A lebih baik dari B
+print(f"\n🔁 Selisih antar model ({evaluation['n_bootstrap']:,} resample bootstrap, {evaluation['wall_s']:.2f} s):")
+pairwise = evaluation['pairwise']
+print(pairwise[pairwise['metric'].isin(['accuracy', 'auc'])].round(4).to_string(index=False))
 
 # Pilih model terbaik
 best_model_name = results_df.iloc[0]['Model']
@@ -591,25 +559,64 @@ if best_auc:
 
 # ROC Curve Comparison untuk binary classification
 if use_binary:
-    plt.figure(figsize=(10, 8))
-
     # Plot ROC curve untuk setiap model
     fpr_rf, tpr_rf, _ = roc_curve(y_test, rf_y_pred_proba)
-    plt.plot(fpr_rf, tpr_rf, label=f'Random Forest (AUC = {rf_auc:.3f})')
-
     fpr_gb, tpr_gb, _ = roc_curve(y_test, gb_y_pred_proba)
-    plt.plot(fpr_gb, tpr_gb, label=f'Gradient Boosting (AUC = {gb_auc:.3f})')
-
     fpr_lr, tpr_lr, _ = roc_curve(y_test, lr_y_pred_proba)
-    plt.plot(fpr_lr, tpr_lr, label=f'Logistic Regression (AUC = {lr_auc:.3f})')
 
-    plt.plot([0, 1], [0, 1], 'k--', label='Random')
-    plt.xlabel('False Positive Rate')
-    plt.ylabel('True Positive Rate')
-    plt.title('ROC Curves Comparison')
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+    figures.add('roc_curves', 'roc_curves', figsize=(10, 8), curves={
+        'Random Forest': (fpr_rf, tpr_rf, rf_auc),
+        'Gradient Boosting': (fpr_gb, tpr_gb, gb_auc),
+        'Logistic Regression': (fpr_lr, tpr_lr, lr_auc)
+    })
+
+"""## Operating Point Intervensi
+
+Keputusan default model memakai cutoff 0.5, padahal tim konseling hanya bisa menangani sebagian mahasiswa per semester. Threshold dipilih dari probabilitas out-of-fold data latih (bukan test set) dengan biaya salah klasifikasi terendah dalam batas kapasitas, lalu disimpan bersama model sehingga prediksi tunggal maupun batch memakai threshold yang sama.
+"""
+
+# ====================================
+#  THRESHOLD BERBASIS KAPASITAS
+# ====================================
+
+operating_point = None
+if use_binary:
+    from sklearn.model_selection import cross_val_predict
+    from thresholds import apply_threshold, capacity_table, choose_operating_point, threshold_curve
+
+    # Proporsi mahasiswa yang bisa ditangani tim konseling per semester
+    intervention_capacity_rate = 0.25
+
+    # Probabilitas out-of-fold model yang disimpan (Logistic Regression) pada fold yang sama dengan training
+    lr_oof_proba = cross_val_predict(lr_model, X_train, y_train, cv=shared_folds, method='predict_proba')[:, 1]
+    curve = threshold_curve(y_train, lr_oof_proba)
+    print(f"\n🎯 PRECISION / RECALL PER KAPASITAS ({len(curve):,} cutoff)")
+    print("=" * 40)
+    print(capacity_table(curve).round(4).to_string(index=False))
+
+    operating_point = choose_operating_point(curve, capacity_rate=intervention_capacity_rate, criterion='cost')
+    print(f"\n✅ Operating point (kapasitas {intervention_capacity_rate:.0%}): threshold {operating_point['threshold']:.4f}")
+
+    # Bandingkan dengan cutoff default 0.5 di test set
+    threshold_comparison = pd.DataFrame([
+        dict(apply_threshold(y_test, lr_y_pred_proba, 0.5), cutoff='default 0.5'),
+        dict(apply_threshold(y_test, lr_y_pred_proba, operating_point['threshold']), cutoff='operating point')
+    ]).set_index('cutoff')
+    print(threshold_comparison.round(4).to_string())
+
+    figures.add('threshold_curves', 'threshold_curves', figsize=(10, 6),
+                flagged_rate=curve['flagged_rate'].to_numpy(), precision=curve['precision'].to_numpy(),
+                recall=curve['recall'].to_numpy(), operating_rate=operating_point['flagged_rate'])
+
+# ====================================
+#  RENDER FIGURE
+# ====================================
+
+# Figure yang independen dirender paralel; figure dengan data yang sama tidak dirender ulang
+figure_report = figures.render_all()
+print(f"\n🖼️ {len(figure_report['figures'])} figure di folder figures/ "
+      f"({figure_report['rendered']} dirender, {figure_report['cached']} dari cache)")
+print(f"⏱️ Waktu plotting: {figure_report['wall_s']:.2f} s")
 
 """Berdasarkan hasil perbandingan model yang ditampilkan, telah dilakukan evaluasi terhadap tiga model machine learning yaitu Logistic Regression, Random Forest, dan Gradient Boosting. Dari ketiga model tersebut, Logistic Regression menunjukkan performa terbaik dengan CV_Accuracy sebesar 0.8759, CV_Std 0.0101, Test_Accuracy 0.8870, dan AUC 0.9267. Model Random Forest berada di posisi kedua dengan CV_Accuracy 0.8692, CV_Std 0.0136, Test_Accuracy 0.8859, dan AUC 0.9294. Sementara Gradient Boosting menempati posisi ketiga dengan CV_Accuracy 0.8748, CV_Std 0.0096, Test_Accuracy 0.8780, dan AUC 0.9307.
 
@@ -633,8 +640,31 @@ joblib.dump(lr_model, "saved_models/best_model.pkl")
 joblib.dump(scaler, "saved_models/scaler.pkl")
 joblib.dump(class_names, "saved_models/class_names.pkl")
 
+# Model ensemble juga disimpan agar bisa dipakai di batch prediction (scoring paralel)
+joblib.dump(rf_model, "saved_models/random_forest.pkl")
+joblib.dump(gb_model, "saved_models/gradient_boosting.pkl")
+
 print("✅ Model tersimpan!")
 
+# Bundle berversi (array mentah memmap + manifest JSON) untuk cold start cepat di aplikasi
+import sys
+sys.path.append("streamlit")
+from artifacts import load_bundle, write_bundle
+
+bundle_manifest = write_bundle(lr_model, scaler, class_names, model_dir="saved_models",
+                               operating_point=operating_point)
+print(f"✅ Bundle model tersimpan! Versi: {bundle_manifest['version']}")
+if operating_point is not None:
+    print(f"   🎯 Threshold intervensi: {operating_point['threshold']:.4f}")
+
+# Publish ke registry model: aplikasi yang sedang berjalan memakai versi ini tanpa restart
+from registry import publish
+
+registry_manifest = publish(lr_model, scaler, class_names, model_dir="saved_models",
+                            operating_point=operating_point,
+                            extra_artifacts={'random_forest.pkl': rf_model, 'gradient_boosting.pkl': gb_model})
+print(f"✅ Model dipublish ke registry! Versi aktif: {registry_manifest['version']}")
+
 """# Pull data ke supabase"""
 
 from sqlalchemy import create_engine
@@ -651,13 +681,41 @@ engine = create_engine(
     }
 )
 
-# Upload data ke PostgreSQL (buat table baru)
-df_processed.to_sql('education', engine, if_exists='replace', index=False)
-print("✅ Table 'education' berhasil dibuat")
+# Upload data ke PostgreSQL: COPY ke tabel staging, lalu upsert baris yang berubah dalam satu transaksi
+# (tabel tidak di-drop, sehingga dashboard Metabase tetap bisa membaca selama proses upload)
+from db_loader import load_table
+
+load_report = load_table(df_processed, engine, 'education')
+print(f"✅ Table 'education' diperbarui ({load_report['mode']}): {load_report['changed']:,} baris ditulis, "
+      f"{load_report['deleted']:,} dihapus, {load_report['rows_per_s']:,.0f} baris/detik")
+
+# Rollup untuk kartu dashboard Metabase, diperbarui hanya dari baris yang berubah
+from rollup import read_rollup, refresh_rollups
+
+rollup_report = refresh_rollups(engine, 'education')
+print(f"✅ {len(rollup_report['rollups'])} tabel rollup diperbarui "
+      f"(-{rollup_report['removed']:,} / +{rollup_report['added']:,} baris, {rollup_report['wall_s']:.2f} s)")
+print(read_rollup(engine, 'status')[['Status', 'n', 'avg_admission_grade', 'avg_age_at_enrollment']].round(2))
 
 # Cek apakah table sudah ada
 tables = pd.read_sql("SELECT tablename FROM pg_tables WHERE schemaname = 'public'", engine)
 print("Tables yang ada:", tables['tablename'].tolist())
 
-df_processed = pd.read_sql('education', engine)
-df_processed.info()
\ No newline at end of file
+# Verifikasi tabel hasil upload dengan jalur baca yang sama (proyeksi kolom, per chunk, dtype ringkas)
+from db_reader import iter_education, read_frame
+from eda import eda_report_stream
+from batch import stream_batch_predictions
+
+db_columns = ['student_id'] + feature_cols + ['Status', target_col]
+df_processed = read_frame(engine, columns=db_columns)
+df_processed.info()
+
+# EDA dan batch scoring mengonsumsi chunk tabel langsung tanpa membentuk satu DataFrame
+eda_db = eda_report_stream(iter_education(engine, columns=db_columns), target_col, feature_cols, cache_dir=None)
+print(f"📊 EDA dari database: {eda_db['rows']:,} baris")
+print(eda_db['ranking'].head(5).round(4))
+
+db_spool, db_scoring = stream_batch_predictions(iter_education(engine, columns=['student_id'] + feature_cols),
+                                                load_bundle("saved_models"), id_columns=['student_id'])
+db_spool.close()  # hanya ringkasan yang dipakai; file hasil (bisa sudah di disk) langsung dibuang
+print(f"🔮 Prediksi dari database: {db_scoring['rows']:,} baris, {db_scoring['class_counts']}")
\ No newline at end of file
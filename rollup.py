@@ -0,0 +1,229 @@
+"""Tabel ringkasan (rollup) untuk kartu dashboard Metabase.
+
+Setiap kartu dashboard (status per status pernikahan, hutang, kelompok umur,
+mahasiswa internasional, dll.) sebelumnya melakukan GROUP BY ke tabel mentah
+``education`` setiap kali dibuka. Modul ini menyimpan hasil agregasi di tabel
+``rollup_<nama>`` (jumlah mahasiswa + jumlah nilai aditif per kombinasi
+dimensi), sehingga kartu cukup membaca beberapa baris saja.
+
+Rollup diperbarui secara inkremental. Tabel ``education_rollup_state``
+menyimpan versi baris (``student_id``, ``row_hash`` dan kolom yang dipakai
+rollup) yang sudah teragregasi. Saat refresh, hanya baris yang hash-nya
+berbeda dari state yang diproses: versi lama dikurangkan (sign -1), versi
+baru ditambahkan (sign +1), semuanya dalam satu transaksi.
+
+Contoh benchmark (SQLite lokal)::
+
+    python rollup.py --rows 4424 500000
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, inspect, text
+
+from db_loader import HASH_COLUMN, KEY_COLUMN, load_table, quote
+
+# Naikkan jika definisi rollup berubah agar semua rollup dibangun ulang
+ROLLUP_VERSION = 1
+STATE_TABLE = f'education_rollup_state_v{ROLLUP_VERSION}'
+DELTA_TABLE = 'education_rollup_delta'
+
+AGE_GROUP = (f"CASE WHEN {quote('Age_at_enrollment')} < 20 THEN '<20' "
+             f"WHEN {quote('Age_at_enrollment')} <= 25 THEN '20-25' "
+             f"WHEN {quote('Age_at_enrollment')} <= 35 THEN '26-35' ELSE '>35' END")
+
+# Kolom tabel mentah yang dibutuhkan rollup (disalin ke tabel state)
+SOURCE_COLUMNS = {
+    'Status': 'TEXT',
+    'Marital_status': 'SMALLINT',
+    'Debtor': 'SMALLINT',
+    'International': 'SMALLINT',
+    'Gender': 'SMALLINT',
+    'Scholarship_holder': 'SMALLINT',
+    'Course': 'INTEGER',
+    'Age_at_enrollment': 'SMALLINT',
+    'Admission_grade': 'DOUBLE PRECISION'
+}
+
+# Nilai aditif per grup: rata-rata = sum / n
+MEASURES = {
+    'n': '1',
+    'sum_admission_grade': quote('Admission_grade'),
+    'sum_age_at_enrollment': quote('Age_at_enrollment'),
+    'n_scholarship_holder': quote('Scholarship_holder')
+}
+
+
+def _dim(column):
+    return (quote(column), column, SOURCE_COLUMNS[column])
+
+
+# Nama rollup -> dimensi (ekspresi SQL, nama kolom, tipe)
+ROLLUPS = {
+    'status': [_dim('Status')],
+    'gender': [_dim('Gender'), _dim('Status')],
+    'marital_status': [_dim('Marital_status'), _dim('Status')],
+    'debtor': [_dim('Debtor'), _dim('Scholarship_holder'), _dim('Status')],
+    'international': [_dim('International'), _dim('Status')],
+    'age_group': [(AGE_GROUP, 'age_group', 'TEXT'), _dim('Status')],
+    'course': [_dim('Course'), _dim('Status')]
+}
+
+
+def rollup_table(name):
+    return f'rollup_{name}'
+
+
+def _create_tables(conn):
+    columns = ', '.join(f"{quote(col)} {kind}" for col, kind in SOURCE_COLUMNS.items())
+    conn.execute(text(f"CREATE TABLE {quote(STATE_TABLE)} ({quote(KEY_COLUMN)} BIGINT PRIMARY KEY, "
+                      f"{quote(HASH_COLUMN)} BIGINT, {columns})"))
+    for name, dims in ROLLUPS.items():
+        dim_columns = ', '.join(f"{quote(col)} {kind}" for _, col, kind in dims)
+        measures = ', '.join(f"{quote(measure)} DOUBLE PRECISION" for measure in MEASURES)
+        keys = ', '.join(quote(col) for _, col, _ in dims)
+        conn.execute(text(f"CREATE TABLE {quote(rollup_table(name))} ({dim_columns}, {measures}, "
+                          f"PRIMARY KEY ({keys}))"))
+
+
+def _reset_tables(conn, existing):
+    """Hapus state + rollup (termasuk versi lama) lalu buat ulang kosong"""
+    stale = [t for t in existing if t.startswith('education_rollup_state_v')]
+    stale += [rollup_table(name) for name in ROLLUPS if rollup_table(name) in existing]
+    for table in stale:
+        conn.execute(text(f"DROP TABLE {quote(table)}"))
+    _create_tables(conn)
+
+
+def refresh_rollups(engine, table='education'):
+    """Perbarui semua rollup dari baris yang berubah sejak refresh terakhir"""
+    wall_start = time.perf_counter()
+    existing = set(inspect(engine).get_table_names())
+    rebuild = STATE_TABLE not in existing or any(rollup_table(name) not in existing for name in ROLLUPS)
+
+    source = ', '.join(quote(col) for col in SOURCE_COLUMNS)
+    key, row_hash = quote(KEY_COLUMN), quote(HASH_COLUMN)
+    with engine.begin() as conn:
+        if rebuild:
+            _reset_tables(conn, existing)
+
+        # Delta: versi lama dari state yang sudah tidak cocok (-1) + versi baru dari tabel mentah (+1)
+        conn.execute(text(f"DROP TABLE IF EXISTS {quote(DELTA_TABLE)}"))
+        conn.execute(text(
+            f"CREATE TEMPORARY TABLE {quote(DELTA_TABLE)} AS "
+            f"SELECT {key}, {row_hash}, {source}, -1 AS sign FROM {quote(STATE_TABLE)} s "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {quote(table)} t WHERE t.{key} = s.{key} AND t.{row_hash} = s.{row_hash}) "
+            f"UNION ALL "
+            f"SELECT {key}, {row_hash}, {source}, 1 AS sign FROM {quote(table)} t "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {quote(STATE_TABLE)} s WHERE s.{key} = t.{key} AND s.{row_hash} = t.{row_hash})"
+        ))
+        removed, added = conn.execute(text(
+            f"SELECT COALESCE(SUM(CASE WHEN sign < 0 THEN 1 ELSE 0 END), 0), "
+            f"COALESCE(SUM(CASE WHEN sign > 0 THEN 1 ELSE 0 END), 0) FROM {quote(DELTA_TABLE)}"
+        )).one()
+
+        for name, dims in ROLLUPS.items():
+            target = quote(rollup_table(name))
+            dim_exprs = ', '.join(expr for expr, _, _ in dims)
+            dim_columns = ', '.join(quote(col) for _, col, _ in dims)
+            measures = ', '.join(quote(m) for m in MEASURES)
+            sums = ', '.join(f"SUM(sign * {expr})" for expr in MEASURES.values())
+            updates = ', '.join(f"{quote(m)} = {target}.{quote(m)} + excluded.{quote(m)}" for m in MEASURES)
+            # WHERE true wajib di SQLite agar ON CONFLICT tidak terbaca sebagai bagian dari SELECT
+            conn.execute(text(
+                f"INSERT INTO {target} ({dim_columns}, {measures}) "
+                f"SELECT {dim_exprs}, {sums} FROM {quote(DELTA_TABLE)} WHERE true GROUP BY {dim_exprs} "
+                f"ON CONFLICT ({dim_columns}) DO UPDATE SET {updates}"
+            ))
+            conn.execute(text(f"DELETE FROM {target} WHERE {quote('n')} = 0"))
+
+        conn.execute(text(f"DELETE FROM {quote(STATE_TABLE)} WHERE {key} IN "
+                          f"(SELECT {key} FROM {quote(DELTA_TABLE)} WHERE sign < 0)"))
+        conn.execute(text(f"INSERT INTO {quote(STATE_TABLE)} ({key}, {row_hash}, {source}) "
+                          f"SELECT {key}, {row_hash}, {source} FROM {quote(DELTA_TABLE)} WHERE sign > 0"))
+        conn.execute(text(f"DROP TABLE {quote(DELTA_TABLE)}"))
+
+    return {
+        'rebuild': rebuild,
+        'removed': int(removed),
+        'added': int(added),
+        'rollups': [rollup_table(name) for name in ROLLUPS],
+        'wall_s': time.perf_counter() - wall_start
+    }
+
+
+def read_rollup(engine, name):
+    """Isi satu rollup beserta rata-rata dan proporsi status per grup"""
+    df = pd.read_sql(text(f"SELECT * FROM {quote(rollup_table(name))}"), engine)
+    df['avg_admission_grade'] = df['sum_admission_grade'] / df['n']
+    df['avg_age_at_enrollment'] = df['sum_age_at_enrollment'] / df['n']
+    dims = [col for _, col, _ in ROLLUPS[name] if col != 'Status']
+    if dims and 'Status' in df.columns:
+        df['share_in_group'] = df['n'] / df.groupby(dims)['n'].transform('sum')
+    return df.sort_values([col for _, col, _ in ROLLUPS[name]]).reset_index(drop=True)
+
+
+def raw_query(name, table='education'):
+    """Query GROUP BY langsung ke tabel mentah (yang sebelumnya dijalankan setiap kartu)"""
+    dims = ROLLUPS[name]
+    dim_exprs = ', '.join(f"{expr} AS {quote(col)}" for expr, col, _ in dims)
+    group = ', '.join(expr for expr, _, _ in dims)
+    sums = ', '.join(f"SUM({expr}) AS {quote(m)}" for m, expr in MEASURES.items())
+    return f"SELECT {dim_exprs}, {sums} FROM {quote(table)} GROUP BY {group}"
+
+
+def benchmark(df, url, changed_fraction=0.01, random_state=42):
+    """Waktu query dashboard (mentah vs rollup) dan waktu refresh (penuh vs 1% berubah)"""
+    engine = create_engine(url)
+    load_table(df, engine)
+    full = refresh_rollups(engine)
+
+    changed = df.copy()
+    rng = np.random.default_rng(random_state)
+    idx = rng.choice(len(df), size=max(1, int(len(df) * changed_fraction)), replace=False)
+    column = changed.columns.get_loc('Debtor')
+    changed.iloc[idx, column] = 1 - changed.iloc[idx, column]
+    load_table(changed, engine)
+    incremental = refresh_rollups(engine)
+
+    timings = {}
+    with engine.connect() as conn:
+        for label, queries in (('raw', [raw_query(name) for name in ROLLUPS]),
+                               ('rollup', [f"SELECT * FROM {quote(rollup_table(name))}" for name in ROLLUPS])):
+            start = time.perf_counter()
+            for query in queries:
+                conn.execute(text(query)).fetchall()
+            timings[label] = time.perf_counter() - start
+    engine.dispose()
+
+    return {
+        'rows': len(df),
+        'dashboard_raw_ms': timings['raw'] * 1000,
+        'dashboard_rollup_ms': timings['rollup'] * 1000,
+        'refresh_full_s': full['wall_s'],
+        'refresh_incremental_s': incremental['wall_s'],
+        'delta_rows': incremental['removed'] + incremental['added']
+    }
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    from data_loader import load_students
+
+    parser = argparse.ArgumentParser(description="Benchmark rollup dashboard")
+    parser.add_argument('--source', default=os.path.join('data', 'data.csv'))
+    parser.add_argument('--rows', type=int, nargs='+', default=[4424, 500_000])
+    args = parser.parse_args()
+
+    base = load_students(args.source, use_snapshot=False)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.rows:
+            df = base.iloc[np.arange(n) % len(base)].reset_index(drop=True)
+            rows.append(benchmark(df, f"sqlite:///{os.path.join(tmp, f'bench_{n}.db')}"))
+    print(pd.DataFrame(rows).set_index('rows').round(3).to_string())
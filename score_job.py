@@ -0,0 +1,263 @@
+"""Job scoring terjadwal (headless) untuk seluruh tabel mahasiswa.
+
+Hanya mahasiswa yang baru atau berubah yang di-scoring ulang:
+
+- Sumber database (tabel ``education`` dari ``db_loader``): baris yang
+  ``row_hash``-nya berbeda dari yang tercatat di tabel prediksi, atau yang
+  di-scoring dengan versi model/threshold lain, dipilih langsung di database
+  (LEFT JOIN), dialirkan per chunk, di-scoring, lalu di-upsert ke tabel
+  ``student_predictions`` dalam satu transaksi.
+- Sumber CSV (mis. ``data/data.csv``): hash isi fitur per baris dibandingkan
+  dengan hash yang tersimpan di file Parquet hasil sebelumnya.
+
+Mahasiswa yang tidak ada lagi di sumber dihapus dari hasil. Contoh (cron
+malam hari)::
+
+    python score_job.py --db-url "$DATABASE_URL"
+    python score_job.py --csv data/data.csv --output predictions.parquet
+    python score_job.py --benchmark --rows 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, inspect, text
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streamlit'))
+
+from batch import score_features  # noqa: E402
+from db_loader import BULK_WRITERS, HASH_COLUMN, KEY_COLUMN, content_keys, quote, row_hashes, table_ddl  # noqa: E402
+from db_reader import compact  # noqa: E402
+
+PREDICTIONS_TABLE = 'student_predictions'
+DEFAULT_OUTPUT = 'predictions.parquet'
+SOURCE_HASH = 'source_hash'
+CHUNK_ROWS = 50_000
+
+
+def load_scorer(model_dir='saved_models'):
+    """Scorer dari bundle (fallback file pickle), lengkap dengan threshold operating point"""
+    from artifacts import bundle_exists, load_bundle, read_operating_point
+    from registry import active_dir
+
+    model_dir = active_dir(model_dir)
+    if bundle_exists(model_dir):
+        return load_bundle(model_dir)
+
+    import hashlib
+
+    import joblib
+    from scorer import compile_scorer
+
+    digest = hashlib.sha256()
+    loaded = []
+    for name in ('best_model.pkl', 'scaler.pkl', 'class_names.pkl'):
+        with open(os.path.join(model_dir, name), 'rb') as f:
+            digest.update(f.read())
+        loaded.append(joblib.load(os.path.join(model_dir, name)))
+    scorer = compile_scorer(*loaded)
+    scorer.version = 'pickle-' + digest.hexdigest()[:12]
+    scorer.threshold = (read_operating_point(model_dir) or {}).get('threshold')
+    return scorer
+
+
+def prediction_frame(keys, source_hash, X, scorer, scored_at):
+    """Satu baris hasil per mahasiswa: key, hash sumber, versi model dan hasil scoring"""
+    results = score_features(X, scorer, pd.RangeIndex(len(keys)))
+    frame = pd.DataFrame({
+        KEY_COLUMN: np.asarray(keys, dtype=np.int64),
+        SOURCE_HASH: np.asarray(source_hash, dtype=np.int64),
+        'model_version': str(scorer.version),
+        'threshold': np.nan if scorer.threshold is None else float(scorer.threshold),
+        'scored_at': scored_at
+    })
+    return pd.concat([frame, results.reset_index(drop=True)], axis=1)
+
+
+def _report(rows, scored, start, score_s, stages):
+    wall_s = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'scored': scored,
+        'score_s': score_s,
+        'wall_s': wall_s,
+        'rows_scored_per_s': scored / score_s if score_s > 0 else 0.0,
+        **stages
+    }
+
+
+def score_table(engine, scorer, table='education', predictions_table=PREDICTIONS_TABLE, chunksize=CHUNK_ROWS):
+    """Scoring inkremental tabel database ke ``predictions_table``"""
+    start = time.perf_counter()
+    dialect = engine.dialect.name
+    scored_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    empty = prediction_frame([], [], np.empty((0, len(scorer.feature_names))), scorer, scored_at)
+    if not inspect(engine).has_table(predictions_table):
+        with engine.begin() as conn:
+            conn.execute(text(table_ddl(predictions_table, empty)))
+
+    key, row_hash = quote(KEY_COLUMN), quote(HASH_COLUMN)
+    features = ', '.join(f"e.{quote(name)}" for name in scorer.feature_names)
+    changed_query = text(
+        f"SELECT e.{key}, e.{row_hash}, {features} FROM {quote(table)} e "
+        f"LEFT JOIN {quote(predictions_table)} p ON p.{key} = e.{key} "
+        f"WHERE p.{key} IS NULL OR p.{quote(SOURCE_HASH)} <> e.{row_hash} "
+        f"OR p.{quote('model_version')} <> :version OR COALESCE(p.{quote('threshold')}, -1) <> :threshold"
+    )
+    params = {'version': str(scorer.version), 'threshold': -1 if scorer.threshold is None else scorer.threshold}
+
+    staging = f"{predictions_table}_staging"
+    raw = engine.raw_connection()
+    scored = 0
+    score_s = 0.0
+    try:
+        cursor = raw.cursor()
+        if dialect == 'sqlite':
+            cursor.execute("BEGIN")
+        cursor.execute(f"DROP TABLE IF EXISTS {quote(staging)}")
+        cursor.execute(table_ddl(staging, empty, temporary=True))
+
+        # Hanya baris berubah yang keluar dari database, dialirkan lewat server-side cursor
+        with engine.connect() as conn:
+            conn = conn.execution_options(stream_results=True, max_row_buffer=chunksize)
+            for chunk in pd.read_sql(changed_query, conn, params=params, chunksize=chunksize):
+                chunk = compact(chunk)
+                score_start = time.perf_counter()
+                X = chunk[scorer.feature_names].to_numpy(dtype=np.float64)
+                predictions = prediction_frame(chunk[KEY_COLUMN], chunk[HASH_COLUMN], X, scorer, scored_at)
+                score_s += time.perf_counter() - score_start
+                BULK_WRITERS[dialect](cursor, staging, predictions, chunksize)
+                scored += len(chunk)
+
+        columns = ', '.join(quote(c) for c in empty.columns)
+        updates = ', '.join(f"{quote(c)} = excluded.{quote(c)}" for c in empty.columns if c != KEY_COLUMN)
+        cursor.execute(f"INSERT INTO {quote(predictions_table)} ({columns}) SELECT {columns} FROM {quote(staging)} "
+                       f"WHERE true ON CONFLICT ({key}) DO UPDATE SET {updates}")
+        cursor.execute(f"DELETE FROM {quote(predictions_table)} WHERE NOT EXISTS "
+                       f"(SELECT 1 FROM {quote(table)} e WHERE e.{key} = {quote(predictions_table)}.{key})")
+        deleted = cursor.rowcount
+        cursor.execute(f"DROP TABLE {quote(staging)}")
+        cursor.execute(f"SELECT COUNT(*) FROM {quote(predictions_table)}")
+        rows = cursor.fetchone()[0]
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+    return _report(rows, scored, start, score_s, {'deleted': deleted})
+
+
+def score_frame(df, scorer, output=DEFAULT_OUTPUT, keys=None):
+    """Scoring inkremental DataFrame sumber ke file Parquet ``output``.
+
+    ``keys`` default diturunkan dari isi baris (sama dengan ``db_loader.with_student_key``).
+    """
+    start = time.perf_counter()
+    keys = content_keys(row_hashes(df, list(df.columns))) if keys is None else np.asarray(keys, dtype=np.int64)
+    feature_hash = row_hashes(df, list(scorer.feature_names))
+    hash_s = time.perf_counter() - start
+
+    previous = pd.read_parquet(output) if os.path.exists(output) else None
+    changed = np.ones(len(df), dtype=bool)
+    if previous is not None:
+        # Samakan urutan hasil lama dengan key sumber (key yang hilang -> NaN -> berubah)
+        stored = previous.set_index(KEY_COLUMN).reindex(keys)
+        same_model = (stored['model_version'] == str(scorer.version)).to_numpy()
+        same_threshold = (stored['threshold'].fillna(-1) ==
+                          (-1 if scorer.threshold is None else scorer.threshold)).to_numpy()
+        changed = ~((stored[SOURCE_HASH].to_numpy() == feature_hash) & same_model & same_threshold)
+
+    score_start = time.perf_counter()
+    idx = np.flatnonzero(changed)
+    X = df[list(scorer.feature_names)].iloc[idx].to_numpy(dtype=np.float64)
+    scored_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    predictions = prediction_frame(keys[idx], feature_hash[idx], X, scorer, scored_at)
+    score_s = time.perf_counter() - score_start
+
+    write_start = time.perf_counter()
+    if previous is not None and len(idx) < len(df):
+        unchanged = previous[previous[KEY_COLUMN].isin(keys[~changed])]
+        predictions = pd.concat([unchanged, predictions], ignore_index=True).sort_values(KEY_COLUMN, kind='stable')
+    if previous is None or len(idx) or len(previous) != len(predictions):
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        predictions.to_parquet(output + '.tmp', index=False)
+        os.replace(output + '.tmp', output)
+    write_s = time.perf_counter() - write_start
+
+    return _report(len(df), len(idx), start, score_s, {'hash_s': hash_s, 'write_s': write_s})
+
+
+def benchmark(rows, source, changed_fraction=0.01, random_state=42):
+    """Scoring penuh vs run malam hari dengan ``changed_fraction`` mahasiswa berubah"""
+    import tempfile
+
+    from data_loader import load_students
+    from db_loader import load_table
+
+    scorer = load_scorer()
+    base = load_students(source, use_snapshot=False)
+    df = base.iloc[np.arange(rows) % len(base)].reset_index(drop=True)
+    changed = df.copy()
+    rng = np.random.default_rng(random_state)
+    idx = rng.choice(len(df), size=max(1, int(len(df) * changed_fraction)), replace=False)
+    column = changed.columns.get_loc('Curricular_units_2nd_sem_approved')
+    changed.iloc[idx, column] = (changed.iloc[idx, column] + 1).clip(upper=20)
+
+    report = []
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, 'predictions.parquet')
+        report.append(dict(score_frame(df, scorer, output), job='file: penuh'))
+        report.append(dict(score_frame(changed, scorer, output), job=f'file: {changed_fraction:.0%} berubah'))
+
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        load_table(df, engine)
+        report.append(dict(score_table(engine, scorer), job='db: penuh'))
+        load_table(changed, engine)
+        report.append(dict(score_table(engine, scorer), job=f'db: {changed_fraction:.0%} berubah'))
+        report.append(dict(score_table(engine, scorer), job='db: tanpa perubahan'))
+        engine.dispose()
+    return pd.DataFrame(report).set_index('job')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scoring inkremental seluruh tabel mahasiswa")
+    parser.add_argument('--db-url', help="URL database berisi tabel education")
+    parser.add_argument('--table', default='education')
+    parser.add_argument('--predictions-table', default=PREDICTIONS_TABLE)
+    parser.add_argument('--csv', help="Sumber CSV (mis. data/data.csv) jika tanpa database")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="File Parquet hasil untuk sumber CSV")
+    parser.add_argument('--model-dir', default='saved_models')
+    parser.add_argument('--benchmark', action='store_true')
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Jumlah baris sintetis untuk benchmark")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(benchmark(args.rows, args.csv or os.path.join('data', 'data.csv')).round(3).to_string())
+        return
+
+    scorer = load_scorer(args.model_dir)
+    if args.db_url:
+        engine = create_engine(args.db_url)
+        report = score_table(engine, scorer, args.table, args.predictions_table)
+        target = args.predictions_table
+    elif args.csv:
+        from data_loader import load_students
+
+        report = score_frame(load_students(args.csv), scorer, args.output)
+        target = args.output
+    else:
+        parser.error("Isi --db-url atau --csv")
+
+    print(f"✅ {report['scored']:,} dari {report['rows']:,} mahasiswa di-scoring ulang ke {target} "
+          f"({report['rows_scored_per_s']:,.0f} baris/detik scoring, total {report['wall_s']:.2f} s)")
+
+
+if __name__ == '__main__':
+    main()
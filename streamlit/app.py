@@ -1,13 +1,17 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
+import hashlib
+import os
 import pickle
 import warnings
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from scorer import compile_scorer
+from artifacts import bundle_exists, load_bundle, read_operating_point
+from cache import PredictionCache, cached_score
+from registry import HotModel, ensemble_scaler_path, list_versions
+from profiling import lazy_import, rerun_timer, render_report
 warnings.filterwarnings('ignore')
 
+# Modul berat (pandas, plotly, joblib, sklearn) hanya di-import di jalur yang membutuhkannya
+
 # Konfigurasi halaman
 st.set_page_config(
     page_title="Student Dropout Prediction",
@@ -46,12 +50,18 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_resource
-def load_model_safe():
+MODEL_DIR = 'saved_models'
+# Model ensemble dari notebook, di-scoring paralel di tab batch
+ENSEMBLE_MODELS = {
+    'Random Forest': 'random_forest.pkl',
+    'Gradient Boosting': 'gradient_boosting.pkl'
+}
+
+def load_model_safe(model_dir=MODEL_DIR):
     """Load model dengan berbagai metode untuk mengatasi pickle error"""
-    model_path = 'saved_models/best_model.pkl'
-    scaler_path = 'saved_models/scaler.pkl'
-    class_names_path = 'saved_models/class_names.pkl'
+    model_path = os.path.join(model_dir, 'best_model.pkl')
+    scaler_path = os.path.join(model_dir, 'scaler.pkl')
+    class_names_path = os.path.join(model_dir, 'class_names.pkl')
     
     try:
         # Method 1: Normal pickle load
@@ -79,7 +89,7 @@ def load_model_safe():
         except Exception as e2:
             try:
                 # Method 3: Load dengan joblib
-                import joblib
+                joblib = lazy_import('joblib')
                 model = joblib.load(model_path)
                 scaler = joblib.load(scaler_path)
                 class_names = joblib.load(class_names_path)
@@ -90,34 +100,66 @@ def load_model_safe():
                 st.error(f"❌ Failed to load model: {e3}")
                 return None, None, None
 
-def predict_student(data_dict, model, scaler, class_names):
+def load_predictor(model_dir):
+    """Muat scorer dari bundle memmap, fallback ke file pickle"""
+    if bundle_exists(model_dir):
+        try:
+            scorer = load_bundle(model_dir)
+            st.success(f"✅ Model loaded from bundle (versi {scorer.version})")
+            return scorer
+        except Exception as e:
+            st.warning(f"⚠️ Bundle tidak bisa dimuat, mencoba file pickle: {e}")
+    
+    model, scaler, class_names = load_model_safe(model_dir)
+    if model is None:
+        return None
+    scorer = compile_scorer(model, scaler, class_names)
+    scorer.version = pickle_version(model_dir)
+    scorer.threshold = (read_operating_point(model_dir) or {}).get('threshold')
+    return scorer
+
+@st.cache_resource
+def get_hot_model():
+    """Model aktif dari registry; versi baru dideteksi dengan stat pointer dan dimuat tanpa restart"""
+    return HotModel(MODEL_DIR, load_predictor)
+
+def pickle_version(model_dir):
+    """Versi model pickle = hash isi file artefak"""
+    digest = hashlib.sha256()
+    for name in ('best_model.pkl', 'scaler.pkl', 'class_names.pkl'):
+        with open(os.path.join(model_dir, name), 'rb') as f:
+            digest.update(f.read())
+    return 'pickle-' + digest.hexdigest()[:12]
+
+@st.cache_resource
+def get_parallel_scorers():
+    """Process pool per model ensemble, dibagi semua sesi; diganti saat versi registry aktif berubah"""
+    return lazy_import('parallel').ParallelScorers()
+
+def load_parallel_scorer(model_dir, model_file, class_names, n_workers):
+    """Scorer paralel untuk model ensemble dari direktori versi aktif (model dimuat sekali per worker)"""
+    return get_parallel_scorers().get(model_file, os.path.join(model_dir, model_file),
+                                      ensemble_scaler_path(model_dir), list(class_names), n_workers)
+
+@st.cache_resource
+def get_prediction_cache():
+    """Cache prediksi yang dibagi oleh semua sesi dalam proses"""
+    return PredictionCache()
+
+@st.cache_resource
+def get_prediction_writer():
+    """Write-back prediksi ke database di background, dibagi oleh semua sesi dalam proses"""
+    writeback = lazy_import('writeback')
+    return writeback.PredictionWriter()
+
+def predict_student(data_dict, scorer, cache, writer=None):
     """Prediksi dropout status mahasiswa"""
     try:
-        # Buat DataFrame dari input
-        df_input = pd.DataFrame([data_dict])
-        
-        # Scaling features
-        df_scaled = scaler.transform(df_input)
-        
-        # Prediksi
-        prediction = model.predict(df_scaled)[0]
-        probabilities = model.predict_proba(df_scaled)[0]
-        
-        # Hasil
-        predicted_label = class_names[prediction]
-        confidence = probabilities[prediction]
-        
-        # Buat dictionary hasil
-        result = {
-            'prediction': predicted_label,
-            'confidence': confidence,
-            'probabilities': {}
-        }
-        
-        # Tambahkan probabilitas semua kelas
-        for i, class_name in enumerate(class_names):
-            result['probabilities'][class_name] = probabilities[i]
-        
+        # Input yang sama dengan model yang sama langsung diambil dari cache
+        result = cached_score(cache, scorer, data_dict)
+        if writer is not None:
+            # Hanya masuk antrean; penulisan ke database dilakukan worker thread
+            writer.submit([[data_dict[name] for name in scorer.feature_names]], result, scorer, 'single')
         return result
         
     except Exception as e:
@@ -126,6 +168,7 @@ def predict_student(data_dict, model, scaler, class_names):
 
 def create_probability_chart(probabilities):
     """Buat chart probabilitas"""
+    go = lazy_import('plotly.graph_objects')
     classes = list(probabilities.keys())
     probs = list(probabilities.values())
     
@@ -151,6 +194,7 @@ def create_probability_chart(probabilities):
 
 def create_gauge_chart(confidence, prediction):
     """Buat gauge chart untuk confidence"""
+    go = lazy_import('plotly.graph_objects')
     color = '#ff6b6b' if 'Dropout' in prediction else '#4ecdc4'
     
     fig = go.Figure(go.Indicator(
@@ -178,6 +222,45 @@ def create_gauge_chart(confidence, prediction):
     fig.update_layout(height=300)
     return fig
 
+def render_whatif(whatif, scorer, student_data):
+    """Grid sensitivitas probabilitas dropout untuk satu atau dua fitur"""
+    go = lazy_import('plotly.graph_objects')
+    features = list(whatif.WHATIF_FEATURES)
+    label = lambda name: whatif.WHATIF_FEATURES[name][0]
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        x_feature = st.selectbox("Fitur sumbu X", options=features, format_func=label)
+        _, x_min, x_max, _ = whatif.WHATIF_FEATURES[x_feature]
+        x_range = st.slider("Rentang X", min_value=float(x_min), max_value=float(x_max),
+                            value=(float(x_min), float(x_max)))
+    with col2:
+        # Fitur X tidak bisa dipakai lagi di sumbu Y (nilai Y akan menimpa grid X)
+        y_feature = st.selectbox("Fitur sumbu Y (opsional)", options=[None] + [f for f in features if f != x_feature],
+                                 format_func=lambda name: "-" if name is None else label(name))
+        if y_feature is not None:
+            _, y_min, y_max, _ = whatif.WHATIF_FEATURES[y_feature]
+            y_range = st.slider("Rentang Y", min_value=float(y_min), max_value=float(y_max),
+                                value=(float(y_min), float(y_max)))
+    steps = st.slider("Jumlah titik per sumbu", min_value=5, max_value=200, value=100)
+    
+    x_values = whatif.feature_values(x_feature, *x_range, steps)
+    if y_feature is None:
+        probs = whatif.sensitivity_grid(scorer, student_data, x_feature, x_values)
+        fig = go.Figure(go.Scatter(x=x_values, y=probs, mode='lines+markers', line=dict(color='#ff6b6b')))
+        fig.update_layout(title=f"Probabilitas Dropout vs {label(x_feature)}",
+                          xaxis_title=label(x_feature), yaxis_title="Probabilitas Dropout",
+                          yaxis=dict(tickformat='.0%', range=[0, 1]), height=400)
+    else:
+        y_values = whatif.feature_values(y_feature, *y_range, steps)
+        probs = whatif.sensitivity_grid(scorer, student_data, x_feature, x_values, y_feature, y_values)
+        fig = go.Figure(go.Heatmap(x=x_values, y=y_values, z=probs, zmin=0, zmax=1,
+                                   colorscale='RdYlGn_r', colorbar=dict(title="P(Dropout)", tickformat='.0%')))
+        fig.update_layout(title=f"Probabilitas Dropout: {label(x_feature)} x {label(y_feature)}",
+                          xaxis_title=label(x_feature), yaxis_title=label(y_feature), height=500)
+    
+    st.plotly_chart(fig, use_container_width=True)
+
 def main():
     """Main Streamlit app"""
     
@@ -186,13 +269,17 @@ def main():
     st.markdown("---")
     
     # Load model
+    # Scorer diambil sekali per rerun: rerun yang sedang berjalan tetap memakai versi yang sama
+    hot_model = get_hot_model()
     with st.spinner("Loading prediction model..."):
-        model, scaler, class_names = load_model_safe()
+        scorer = hot_model.current()
     
-    if model is None:
+    if scorer is None:
         st.error("❌ Gagal memuat model. Pastikan file model ada di folder 'saved_models/'")
         st.stop()
     
+    class_names = scorer.class_names
+    
     # Sidebar untuk input
     st.sidebar.header("📊 Input Data Mahasiswa")
     
@@ -249,51 +336,51 @@ def main():
             inflation_rate = st.number_input("Tingkat Inflasi (%)", min_value=-10.0, max_value=20.0, value=1.4)
             gdp = st.number_input("GDP", min_value=-5.0, max_value=10.0, value=1.74)
         
+        # Buat dictionary data dari input sidebar
+        student_data = {
+            'Marital_status': marital_status,
+            'Application_mode': 1,
+            'Application_order': 1,
+            'Course': course,
+            'Daytime_evening_attendance': daytime_attendance,
+            'Previous_qualification': 1,
+            'Previous_qualification_grade': prev_qualification_grade,
+            'Nacionality': nationality,
+            'Mothers_qualification': 19,
+            'Fathers_qualification': 13,
+            'Mothers_occupation': 4,
+            'Fathers_occupation': 10,
+            'Admission_grade': admission_grade,
+            'Displaced': displaced,
+            'Educational_special_needs': 0,
+            'Debtor': debtor,
+            'Tuition_fees_up_to_date': tuition_up_to_date,
+            'Gender': gender,
+            'Scholarship_holder': scholarship,
+            'Age_at_enrollment': age,
+            'International': international,
+            'Curricular_units_1st_sem_credited': 0,
+            'Curricular_units_1st_sem_enrolled': sem1_enrolled,
+            'Curricular_units_1st_sem_evaluations': sem1_enrolled,
+            'Curricular_units_1st_sem_approved': sem1_approved,
+            'Curricular_units_1st_sem_grade': sem1_grade,
+            'Curricular_units_1st_sem_without_evaluations': 0,
+            'Curricular_units_2nd_sem_credited': 0,
+            'Curricular_units_2nd_sem_enrolled': sem2_enrolled,
+            'Curricular_units_2nd_sem_evaluations': sem2_enrolled,
+            'Curricular_units_2nd_sem_approved': sem2_approved,
+            'Curricular_units_2nd_sem_grade': sem2_grade,
+            'Curricular_units_2nd_sem_without_evaluations': 0,
+            'Unemployment_rate': unemployment_rate,
+            'Inflation_rate': inflation_rate,
+            'GDP': gdp
+        }
+        
         # Tombol prediksi
         if st.sidebar.button("🔮 Prediksi Sekarang!", type="primary"):
-            # Buat dictionary data
-            student_data = {
-                'Marital_status': marital_status,
-                'Application_mode': 1,
-                'Application_order': 1,
-                'Course': course,
-                'Daytime_evening_attendance': daytime_attendance,
-                'Previous_qualification': 1,
-                'Previous_qualification_grade': prev_qualification_grade,
-                'Nacionality': nationality,
-                'Mothers_qualification': 19,
-                'Fathers_qualification': 13,
-                'Mothers_occupation': 4,
-                'Fathers_occupation': 10,
-                'Admission_grade': admission_grade,
-                'Displaced': displaced,
-                'Educational_special_needs': 0,
-                'Debtor': debtor,
-                'Tuition_fees_up_to_date': tuition_up_to_date,
-                'Gender': gender,
-                'Scholarship_holder': scholarship,
-                'Age_at_enrollment': age,
-                'International': international,
-                'Curricular_units_1st_sem_credited': 0,
-                'Curricular_units_1st_sem_enrolled': sem1_enrolled,
-                'Curricular_units_1st_sem_evaluations': sem1_enrolled,
-                'Curricular_units_1st_sem_approved': sem1_approved,
-                'Curricular_units_1st_sem_grade': sem1_grade,
-                'Curricular_units_1st_sem_without_evaluations': 0,
-                'Curricular_units_2nd_sem_credited': 0,
-                'Curricular_units_2nd_sem_enrolled': sem2_enrolled,
-                'Curricular_units_2nd_sem_evaluations': sem2_enrolled,
-                'Curricular_units_2nd_sem_approved': sem2_approved,
-                'Curricular_units_2nd_sem_grade': sem2_grade,
-                'Curricular_units_2nd_sem_without_evaluations': 0,
-                'Unemployment_rate': unemployment_rate,
-                'Inflation_rate': inflation_rate,
-                'GDP': gdp
-            }
-            
             # Prediksi
             with st.spinner("Sedang melakukan prediksi..."):
-                result = predict_student(student_data, model, scaler, class_names)
+                result = predict_student(student_data, scorer, get_prediction_cache(), get_prediction_writer())
             
             if result:
                 # Hasil prediksi
@@ -353,6 +440,12 @@ def main():
                     - 🤝 Peer mentoring sebagai tutor
                     - 📈 Challenge akademik yang lebih tinggi
                     """)
+        
+        # Analisis what-if: seluruh grid diprediksi dalam satu panggilan model
+        st.markdown("---")
+        if st.checkbox("🧪 Tampilkan analisis what-if"):
+            whatif = lazy_import('whatif')
+            render_whatif(whatif, scorer, student_data)
     
     with tab2:
         st.subheader("📁 Batch Prediction dari CSV")
@@ -361,53 +454,115 @@ def main():
         
         if uploaded_file is not None:
             try:
-                df = pd.read_csv(uploaded_file)
-                st.write("Preview data:", df.head())
+                pd = lazy_import('pandas')
+                batch = lazy_import('batch')
+                validation = lazy_import('validation')
+                
+                # Delimiter ditebak dari awal file (data.csv memakai ';')
+                read_csv_kwargs = {'sep': validation.sniff_delimiter(uploaded_file), 'encoding': 'utf-8-sig'}
+                
+                # Preview cukup beberapa baris, file lengkap dibaca per chunk
+                df_preview = pd.read_csv(uploaded_file, nrows=batch.PREVIEW_ROWS, **read_csv_kwargs)
+                uploaded_file.seek(0)
+                st.write("Preview data:", df_preview.head())
+                
+                # Kolom fitur yang hilang langsung dilaporkan sebelum file dibaca penuh
+                validation.check_columns(df_preview.columns)
+                
+                chunk_size = st.number_input("Ukuran chunk (baris)", min_value=1_000, max_value=1_000_000,
+                                             value=batch.DEFAULT_CHUNK_SIZE, step=10_000)
+                
+                available_models = ['Logistic Regression'] + [
+                    name for name, model_file in ENSEMBLE_MODELS.items()
+                    if os.path.exists(os.path.join(hot_model.active_dir, model_file))
+                ]
+                model_choice = st.selectbox("Model", options=available_models)
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    output_format = st.selectbox("Format output", options=list(batch.WRITERS),
+                                                 format_func=lambda x: {'csv': 'CSV', 'parquet': 'Parquet', 'arrow': 'Arrow IPC'}[x])
+                with col2:
+                    # Kolom non-fitur (mis. NIM) bisa disertakan di hasil
+                    id_columns = st.multiselect("Kolom ID yang disertakan",
+                                                options=[c for c in df_preview.columns if c not in scorer.feature_names])
+                
+                batch_scorer = scorer
+                if model_choice in ENSEMBLE_MODELS:
+                    max_workers = os.cpu_count() or 1
+                    n_workers = 1
+                    if max_workers > 1:
+                        n_workers = st.slider("Jumlah worker", min_value=1, max_value=max_workers, value=max_workers)
+                    else:
+                        st.caption("ℹ️ Hanya 1 core CPU: scoring dijalankan in-process tanpa process pool")
+                    # Artefak dari versi yang sama dengan model aktif; slider hanya mengubah ukuran pool
+                    batch_scorer = load_parallel_scorer(hot_model.active_dir, ENSEMBLE_MODELS[model_choice],
+                                                        class_names, n_workers)
                 
                 if st.button("🚀 Jalankan Batch Prediction"):
-                    with st.spinner("Processing batch prediction..."):
-                        # Scaling
-                        df_scaled = scaler.transform(df)
-                        
-                        # Prediksi
-                        predictions = model.predict(df_scaled)
-                        probabilities = model.predict_proba(df_scaled)
-                        
-                        # Buat hasil DataFrame
-                        results = pd.DataFrame({
-                            'prediction': [class_names[pred] for pred in predictions],
-                            'confidence': [max(prob) for prob in probabilities]
-                        })
-                        
-                        # Tambahkan probabilitas untuk setiap kelas
-                        for i, class_name in enumerate(class_names):
-                            results[f'prob_{class_name}'] = probabilities[:, i]
-                        
-                        st.write("Hasil Prediksi:", results)
-                        
-                        # Download hasil
-                        csv = results.to_csv(index=False)
-                        st.download_button(
-                            label="📥 Download Hasil CSV",
-                            data=csv,
-                            file_name='prediction_results.csv',
-                            mime='text/csv'
+                    progress_bar = st.progress(0.0)
+                    status_text = st.empty()
+                    
+                    def update_progress(rows_done, fraction):
+                        if fraction is not None:
+                            progress_bar.progress(fraction)
+                        status_text.text(f"⏳ {rows_done:,} baris diproses...")
+                    
+                    # Prediksi streaming per chunk, hasil ditulis ke file spooled
+                    # dan diantrekan untuk write-back ke database
+                    prediction_writer = get_prediction_writer()
+                    uploaded_file.seek(0)
+                    spool, summary = batch.stream_batch_predictions(
+                        uploaded_file, batch_scorer,
+                        chunk_size=int(chunk_size),
+                        total_bytes=uploaded_file.size,
+                        on_progress=update_progress,
+                        read_csv_kwargs=read_csv_kwargs,
+                        output_format=output_format,
+                        id_columns=id_columns,
+                        on_results=lambda X, results: prediction_writer.submit(X, results, batch_scorer, 'batch')
+                    )
+                    progress_bar.progress(1.0)
+                    status_text.text(f"✅ {summary['rows']:,} baris selesai diproses")
+                    
+                    st.write(f"Hasil Prediksi ({min(batch.PREVIEW_ROWS, summary['rows'])} baris pertama):", summary['preview'])
+                    
+                    validation_report = summary['validation']
+                    if validation_report['invalid_rows']:
+                        st.warning(f"⚠️ {validation_report['invalid_rows']:,} dari {validation_report['rows']:,} baris "
+                                   "tidak lolos validasi dan tidak diprediksi")
+                        with st.expander("Detail error validasi"):
+                            st.write("Jumlah error per kolom:", validation_report['error_counts'])
+                            st.dataframe(pd.DataFrame(validation_report['errors']).astype({'value': str}))
+                    
+                    st.caption(f"Validasi {summary['validate_seconds']:.2f} s, prediksi {summary['score_seconds']:.2f} s, "
+                               f"encode {output_format} {summary['encode_seconds']:.2f} s, "
+                               f"ukuran {summary['output_bytes'] / 1024:,.0f} KB")
+                    
+                    # Download hasil
+                    writer = batch.WRITERS[output_format]
+                    st.download_button(
+                        label=f"📥 Download Hasil {writer.extension.upper()}",
+                        data=spool,
+                        file_name=f'prediction_results.{writer.extension}',
+                        mime=writer.mime
+                    )
+                    
+                    # Visualisasi hasil batch
+                    go = lazy_import('plotly.graph_objects')
+                    dropout_count = summary['class_counts'].get('Dropout', 0)
+                    total_count = summary['rows']
+                    
+                    fig = go.Figure(data=[
+                        go.Pie(
+                            labels=['Non-Dropout', 'Dropout'],
+                            values=[total_count - dropout_count, dropout_count],
+                            hole=0.4,
+                            marker_colors=['#4ecdc4', '#ff6b6b']
                         )
-                        
-                        # Visualisasi hasil batch
-                        dropout_count = (results['prediction'] == 'Dropout').sum()
-                        total_count = len(results)
-                        
-                        fig = go.Figure(data=[
-                            go.Pie(
-                                labels=['Non-Dropout', 'Dropout'],
-                                values=[total_count - dropout_count, dropout_count],
-                                hole=0.4,
-                                marker_colors=['#4ecdc4', '#ff6b6b']
-                            )
-                        ])
-                        fig.update_layout(title="Distribusi Prediksi Batch")
-                        st.plotly_chart(fig)
+                    ])
+                    fig.update_layout(title="Distribusi Prediksi Batch")
+                    st.plotly_chart(fig)
                         
             except Exception as e:
                 st.error(f"Error processing file: {str(e)}")
@@ -415,6 +570,17 @@ def main():
     with tab3:
         st.subheader("🔍 Informasi Model")
         
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Versi Model Aktif", scorer.version)
+        col2.metric("Dimuat Pada", hot_model.loaded_at or "-")
+        col3.metric("Reload", f"{hot_model.reloads:,}")
+        if hot_model.last_error:
+            st.warning(f"⚠️ Versi baru gagal dimuat, masih memakai versi aktif: {hot_model.last_error}")
+        versions = list_versions(MODEL_DIR)
+        if versions:
+            with st.expander(f"🗂️ Registry Model ({len(versions)} versi)"):
+                st.dataframe(versions)
+        
         if class_names is not None:
             st.write("**Target Classes:**", class_names)
         
@@ -432,8 +598,39 @@ def main():
                 for feature in features:
                     st.write(f"• {feature}")
         
+        operating_point = read_operating_point(hot_model.active_dir)
+        if operating_point is not None:
+            st.write("**Operating Point Intervensi:**")
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Threshold Dropout", f"{operating_point['threshold']:.3f}")
+            col2.metric("Mahasiswa Ditandai", f"{operating_point['flagged_rate']:.1%}")
+            col3.metric("Precision", f"{operating_point['precision']:.1%}")
+            col4.metric("Recall", f"{operating_point['recall']:.1%}")
+        
+        st.write("**Cache Prediksi:**")
+        cache_stats = get_prediction_cache().stats()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Entries", f"{cache_stats['entries']:,} / {cache_stats['max_entries']:,}")
+        col2.metric("Hit Rate", f"{cache_stats['hit_rate']:.1%}")
+        col3.metric("Hits / Misses", f"{cache_stats['hits']:,} / {cache_stats['misses']:,}")
+        col4.metric("Evictions", f"{cache_stats['evictions']:,}")
+        
+        st.write("**Write-back Prediksi:**")
+        writer_stats = get_prediction_writer().stats()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Tersimpan", f"{writer_stats['written']:,}")
+        col2.metric("Antrean (baris)", f"{writer_stats['pending']:,}")
+        col3.metric("Batch", f"{writer_stats['batches']:,}")
+        col4.metric("Spool (gagal tulis)", f"{writer_stats['spooled'] + writer_stats['overflowed']:,}")
+        if writer_stats['replayed']:
+            st.caption(f"🔁 {writer_stats['replayed']:,} record dari spool berhasil dikirim ulang")
+        if writer_stats['last_error']:
+            st.caption(f"⚠️ Error terakhir: {writer_stats['last_error']}")
+        
         st.markdown("---")
         st.markdown("**Developed with ❤️ using Streamlit**")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with rerun_timer():
+        main()
+    render_report(st)
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""Format artefak model yang ringkas, berversi dan bisa di-memory-map.
+
+Satu bundle terdiri dari dua file di ``saved_models/``:
+
+- ``model_bundle.bin``  : array float64 mentah (coef, intercept, mean, scale,
+  serta weights/bias yang sudah dilipat) yang ditulis berurutan.
+- ``model_bundle.json`` : manifest kecil berisi versi format, versi model,
+  urutan fitur, class names, offset/shape tiap array dan hash SHA-256 isi bin,
+  serta operating point (threshold intervensi) jika dipilih di notebook.
+
+Loader membuka bin dengan ``np.memmap`` mode read-only, sehingga beberapa
+proses worker aplikasi berbagi page yang sama dari page cache OS dan cold
+start tidak perlu mengimpor sklearn maupun unpickle.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from scorer import CompiledLinearScorer
+
+FORMAT_VERSION = 1
+BUNDLE_BIN = 'model_bundle.bin'
+BUNDLE_MANIFEST = 'model_bundle.json'
+DTYPE = '<f8'
+# Offset array disejajarkan agar akses memmap tetap rapi per cache line
+ALIGNMENT = 64
+
+
+def bundle_exists(model_dir='saved_models'):
+    return (os.path.exists(os.path.join(model_dir, BUNDLE_MANIFEST))
+            and os.path.exists(os.path.join(model_dir, BUNDLE_BIN)))
+
+
+def write_bundle(model, scaler, class_names, model_dir='saved_models', version=None, operating_point=None):
+    """Tulis bundle dari LogisticRegression + StandardScaler yang sudah di-fit.
+
+    ``operating_point`` (dict dari ``thresholds.choose_operating_point``)
+    disimpan di manifest; scorer hasil ``load_bundle`` memakai threshold-nya.
+    """
+    if not hasattr(model, 'coef_'):
+        raise ValueError(f"Bundle hanya mendukung model linear, bukan {type(model).__name__}")
+
+    feature_names = getattr(scaler, 'feature_names_in_', None)
+    if feature_names is None:
+        feature_names = [f'x{i}' for i in range(model.coef_.shape[1])]
+
+    weights, bias = CompiledLinearScorer.fold(model.coef_, model.intercept_, scaler.mean_, scaler.scale_)
+    n_features = model.coef_.shape[1]
+    arrays = {
+        'coef': model.coef_,
+        'intercept': model.intercept_,
+        'mean': np.zeros(n_features) if scaler.mean_ is None else scaler.mean_,
+        'scale': np.ones(n_features) if scaler.scale_ is None else scaler.scale_,
+        'weights': weights,
+        'bias': bias
+    }
+
+    layout = {}
+    payload = bytearray()
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array, dtype=DTYPE)
+        payload.extend(b'\0' * (-len(payload) % ALIGNMENT))
+        layout[name] = {'offset': len(payload), 'shape': list(array.shape)}
+        payload.extend(array.tobytes())
+
+    content_hash = hashlib.sha256(payload).hexdigest()
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'version': version or time.strftime('%Y%m%d%H%M%S') + '-' + content_hash[:8],
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'model_type': type(model).__name__,
+        'dtype': DTYPE,
+        'feature_names': [str(name) for name in feature_names],
+        'class_names': list(class_names),
+        'classes': [int(c) for c in model.classes_],
+        'arrays': layout,
+        'sha256': content_hash
+    }
+    if operating_point is not None:
+        manifest['operating_point'] = operating_point
+
+    os.makedirs(model_dir, exist_ok=True)
+    # Tulis ke file sementara lalu rename agar pembaca tidak melihat bundle setengah jadi
+    bin_path = os.path.join(model_dir, BUNDLE_BIN)
+    manifest_path = os.path.join(model_dir, BUNDLE_MANIFEST)
+    with open(bin_path + '.tmp', 'wb') as f:
+        f.write(payload)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(bin_path + '.tmp', bin_path)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+
+def read_manifest(model_dir='saved_models'):
+    with open(os.path.join(model_dir, BUNDLE_MANIFEST)) as f:
+        return json.load(f)
+
+
+def read_operating_point(model_dir='saved_models'):
+    """Operating point tersimpan di manifest, atau None (keputusan argmax)"""
+    if not os.path.exists(os.path.join(model_dir, BUNDLE_MANIFEST)):
+        return None
+    return read_manifest(model_dir).get('operating_point')
+
+
+def load_arrays(model_dir='saved_models', manifest=None, verify=True):
+    """Memory-map semua array di bundle (read-only, tanpa copy)"""
+    manifest = manifest or read_manifest(model_dir)
+    if manifest['format_version'] != FORMAT_VERSION:
+        raise ValueError(f"Format bundle tidak didukung: {manifest['format_version']}")
+
+    mapped = np.memmap(os.path.join(model_dir, BUNDLE_BIN), dtype=np.uint8, mode='r')
+    if verify and hashlib.sha256(mapped).hexdigest() != manifest['sha256']:
+        raise ValueError("Hash bundle tidak cocok dengan manifest")
+
+    arrays = {}
+    for name, spec in manifest['arrays'].items():
+        count = int(np.prod(spec['shape']))
+        arrays[name] = np.frombuffer(mapped, dtype=manifest['dtype'], count=count,
+                                     offset=spec['offset']).reshape(spec['shape'])
+    return arrays
+
+
+def load_bundle(model_dir='saved_models', verify=True):
+    """Muat scorer langsung dari bundle tanpa sklearn"""
+    manifest = read_manifest(model_dir)
+    arrays = load_arrays(model_dir, manifest, verify=verify)
+    scorer = CompiledLinearScorer(arrays['weights'], arrays['bias'],
+                                  manifest['feature_names'], manifest['class_names'],
+                                  classes=manifest['classes'])
+    scorer.version = manifest['version']
+    scorer.threshold = (manifest.get('operating_point') or {}).get('threshold')
+    return scorer
+
+
+def measure_cold_start(model_dir='saved_models', runs=5):
+    """Ukur waktu cold start (interpreter baru) untuk joblib vs bundle"""
+    import subprocess
+    import sys
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    snippets = {
+        # File .pkl ditulis oleh joblib, jalur yang berhasil di app adalah fallback joblib
+        'joblib': (
+            "import joblib\n"
+            f"for name in ('best_model', 'scaler', 'class_names'):\n"
+            f"    joblib.load({model_dir!r} + '/' + name + '.pkl')\n"
+        ),
+        'bundle': f"import artifacts\nartifacts.load_bundle({model_dir!r})\n"
+    }
+
+    timings = {}
+    for name, code in snippets.items():
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', f"import sys; sys.path.insert(0, {here!r})\n" + code],
+                           check=True)
+            samples.append(time.perf_counter() - start)
+        timings[name] = min(samples) * 1000
+    return timings
+
+
+if __name__ == '__main__':
+    timings = measure_cold_start()
+    print(f"Cold start joblib : {timings['joblib']:.0f} ms")
+    print(f"Cold start bundle : {timings['bundle']:.0f} ms")
@@ -0,0 +1,261 @@
+"""Engine batch prediction berbasis chunk.
+
+File CSV dibaca per potongan berukuran tetap, setiap potongan diprediksi
+secara vektor, lalu hasilnya langsung ditulis ke file spooled. Dengan begitu
+pemakaian memori dibatasi oleh ukuran chunk, bukan ukuran file upload.
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import validation
+from scorer import decision_indices
+
+DEFAULT_CHUNK_SIZE = 50_000
+# Di atas batas ini SpooledTemporaryFile otomatis pindah ke disk
+SPOOL_MAX_BYTES = 32 * 1024 * 1024
+PREVIEW_ROWS = 100
+
+
+def score_chunk(df_chunk, scorer):
+    """Prediksi satu chunk dan kembalikan DataFrame hasil"""
+    # Kolom diproyeksikan ke urutan fitur model sebelum masuk ke scorer
+    X = df_chunk[scorer.feature_names].to_numpy(dtype=np.float64)
+    return score_features(X, scorer, df_chunk.index)
+
+
+def score_features(X, scorer, index):
+    """Prediksi matriks fitur (urutan kolom = scorer.feature_names)"""
+    probabilities = scorer.predict_proba(X)
+
+    # Satu kali predict_proba, label dari argmax (sama dengan model.predict) atau threshold operating point
+    best_idx = decision_indices(probabilities, scorer.threshold)
+    labels = np.asarray(scorer.class_names, dtype=object)[scorer.classes[best_idx]]
+
+    results = pd.DataFrame({
+        'prediction': labels,
+        'confidence': probabilities[np.arange(len(best_idx)), best_idx]
+    }, index=index)
+
+    for i, class_name in enumerate(scorer.class_names):
+        results[f'prob_{class_name}'] = probabilities[:, i]
+
+    return results
+
+
+def validated_features(df_chunk, scorer, row_offset):
+    """Validasi chunk, kembalikan fitur baris valid (urutan scorer) beserta laporannya"""
+    X, valid_mask, report = validation.validate_chunk(df_chunk, row_offset)
+    if list(scorer.feature_names) != validation.FEATURE_NAMES:
+        X = X[:, [validation.FEATURE_NAMES.index(name) for name in scorer.feature_names]]
+    if report['invalid_rows']:
+        X = X[valid_mask]
+    return X, valid_mask, report
+
+
+class CsvChunkWriter:
+    """Tulis hasil per chunk ke CSV tanpa membentuk satu string besar"""
+
+    extension = 'csv'
+    mime = 'text/csv'
+
+    def __init__(self, spool):
+        self.spool = _TextAdapter(spool)
+        self._header_written = False
+
+    def write(self, results):
+        results.to_csv(self.spool, index=False, header=not self._header_written)
+        self._header_written = True
+
+    def close(self):
+        self.spool.flush()
+
+
+class ParquetChunkWriter:
+    """Tulis setiap chunk sebagai row group Parquet"""
+
+    extension = 'parquet'
+    mime = 'application/vnd.apache.parquet'
+
+    def __init__(self, spool):
+        self.spool = spool
+        self.pa = lazy_pyarrow()
+        self._writer = None
+        self._schema = None
+
+    def _open(self, schema):
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(self.spool, schema, compression='snappy')
+
+    def write(self, results):
+        table = self.pa.Table.from_pandas(results, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = self._open(self._schema)
+        # Skema dikunci oleh chunk pertama; kolom ID dari CSV dibaca sebagai string
+        # (lihat stream_batch_predictions) sehingga tipenya sama di setiap chunk
+        self._writer.write_table(table.cast(self._schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class ArrowChunkWriter(ParquetChunkWriter):
+    """Tulis setiap chunk sebagai record batch Arrow IPC (format file)"""
+
+    extension = 'arrow'
+    mime = 'application/vnd.apache.arrow.file'
+
+    def _open(self, schema):
+        return self.pa.ipc.new_file(self.spool, schema)
+
+
+WRITERS = {
+    'csv': CsvChunkWriter,
+    'parquet': ParquetChunkWriter,
+    'arrow': ArrowChunkWriter
+}
+
+
+def lazy_pyarrow():
+    import pyarrow
+    import pyarrow.ipc  # noqa: F401 (memastikan submodul ipc termuat)
+    return pyarrow
+
+
+def stream_batch_predictions(source, scorer,
+                             chunk_size=DEFAULT_CHUNK_SIZE, total_bytes=None,
+                             on_progress=None, read_csv_kwargs=None,
+                             output_format='csv', id_columns=None, validate=True, on_results=None):
+    """Jalankan batch prediction secara streaming.
+
+    ``source`` berupa path/file CSV atau iterator DataFrame per chunk
+    (mis. ``db_reader.iter_education``). Mengembalikan tuple ``(spool, summary)``. ``spool`` adalah file spooled
+    (sudah di-seek ke awal) berisi hasil dalam ``output_format`` (csv,
+    parquet atau arrow), ``summary`` berisi jumlah baris, jumlah per kelas,
+    preview beberapa baris pertama, waktu encode dan ukuran output.
+    Kolom di ``id_columns`` disalin dari input ke depan kolom hasil.
+    Dengan ``validate=True`` setiap chunk divalidasi terhadap skema fitur;
+    baris yang gagal tidak diprediksi dan dicatat di ``summary['validation']``.
+    ``on_results`` (opsional) dipanggil dengan ``(X, results)`` untuk setiap
+    chunk, mis. untuk write-back prediksi ke database.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode='w+b')
+    writer = WRITERS[output_format](spool)
+    id_columns = list(id_columns or [])
+
+    summary = {
+        'rows': 0,
+        'class_counts': {class_name: 0 for class_name in scorer.class_names},
+        'preview': None,
+        'encode_seconds': 0.0,
+        'validate_seconds': 0.0,
+        'score_seconds': 0.0,
+        'output_bytes': 0,
+        'validation': validation.empty_report()
+    }
+    rows_read = 0
+
+    if isinstance(source, (str, os.PathLike)) or hasattr(source, 'read'):
+        read_csv_kwargs = dict(read_csv_kwargs or {})
+        # Tipe kolom ID ditetapkan sebelum chunk pertama: hasil inferensi per chunk bisa berbeda
+        # (mis. int lalu 'X3999' atau 1.5), sedangkan skema Parquet/Arrow dikunci oleh chunk pertama
+        read_csv_kwargs['dtype'] = {**(read_csv_kwargs.get('dtype') or {}),
+                                    **{col: 'string' for col in id_columns}}
+        reader = pd.read_csv(source, chunksize=chunk_size, **read_csv_kwargs)
+    else:
+        reader = source
+    for df_chunk in reader:
+        if validate:
+            # Baris tidak valid dilewati dan dicatat di laporan validasi
+            start = time.perf_counter()
+            X, valid_mask, report = validated_features(df_chunk, scorer, rows_read)
+            validation.merge_reports(summary['validation'], report)
+            summary['validate_seconds'] += time.perf_counter() - start
+            df_valid = df_chunk[valid_mask] if report['invalid_rows'] else df_chunk
+        else:
+            df_valid = df_chunk
+            X = df_chunk[scorer.feature_names].to_numpy(dtype=np.float64)
+        rows_read += len(df_chunk)
+
+        start = time.perf_counter()
+        results = score_features(X, scorer, df_valid.index)
+        summary['score_seconds'] += time.perf_counter() - start
+        if on_results is not None:
+            on_results(X, results)
+        if id_columns:
+            results = pd.concat([df_valid[id_columns], results], axis=1)
+
+        start = time.perf_counter()
+        writer.write(results)
+        summary['encode_seconds'] += time.perf_counter() - start
+
+        summary['rows'] += len(results)
+        counts = results['prediction'].value_counts()
+        for class_name, count in counts.items():
+            summary['class_counts'][class_name] += int(count)
+
+        if summary['preview'] is None:
+            summary['preview'] = results.head(PREVIEW_ROWS)
+
+        if on_progress is not None:
+            fraction = None
+            if total_bytes and hasattr(source, 'tell'):
+                fraction = min(source.tell() / total_bytes, 1.0)
+            on_progress(summary['rows'], fraction)
+
+    start = time.perf_counter()
+    writer.close()
+    summary['encode_seconds'] += time.perf_counter() - start
+    spool.flush()
+    summary['output_bytes'] = spool.tell()
+    spool.seek(0)
+    return spool, summary
+
+
+class _TextAdapter:
+    """Adapter minimal agar DataFrame.to_csv bisa menulis ke spool biner"""
+
+    def __init__(self, binary):
+        self.binary = binary
+
+    def write(self, text):
+        self.binary.write(text.encode('utf-8'))
+        return len(text)
+
+    def flush(self):
+        self.binary.flush()
+
+
+def compare_formats(source_path, scorer, read_csv_kwargs=None, id_columns=None):
+    """Bandingkan waktu encode dan ukuran output tiap format"""
+    report = {}
+    for output_format in WRITERS:
+        spool, summary = stream_batch_predictions(source_path, scorer, read_csv_kwargs=read_csv_kwargs,
+                                                  output_format=output_format, id_columns=id_columns)
+        spool.close()
+        report[output_format] = {
+            'rows': summary['rows'],
+            'encode_seconds': summary['encode_seconds'],
+            'output_bytes': summary['output_bytes']
+        }
+    return report
+
+
+if __name__ == '__main__':
+    import sys
+    from artifacts import load_bundle
+
+    # Contoh: python streamlit/batch.py data/data.csv ";"
+    source_path = sys.argv[1] if len(sys.argv) > 1 else 'data/data.csv'
+    sep = sys.argv[2] if len(sys.argv) > 2 else ';'
+
+    report = compare_formats(source_path, load_bundle(), read_csv_kwargs={'sep': sep, 'encoding': 'utf-8-sig'})
+    for output_format, row in report.items():
+        print(f"{output_format:<8} {row['rows']:>10,} baris | encode {row['encode_seconds']:.3f} s"
+              f" | {row['output_bytes'] / 1024:,.0f} KB")
@@ -0,0 +1,103 @@
+"""Cache memoization hasil prediksi, dibagi oleh semua sesi dalam satu proses.
+
+Key cache adalah hash kanonik dari 36 nilai fitur (float64, urutan fitur
+model) ditambah versi artefak model, sehingga hasil lama otomatis tidak
+terpakai lagi begitu model berganti.
+"""
+
+import collections
+import hashlib
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL_SECONDS = 60 * 60
+
+
+class PredictionCache:
+    """Cache LRU dengan TTL dan penghitung hit/miss/eviction"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = collections.OrderedDict()
+        # Sesi Streamlit berjalan di thread berbeda
+        self._lock = threading.Lock()
+        self._model_version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(data_dict, scorer):
+        """Hash kanonik vektor fitur + versi model dan threshold keputusan"""
+        vector = np.array([data_dict[name] for name in scorer.feature_names], dtype=np.float64)
+        # + 0.0 menyamakan -0.0 dengan 0.0
+        digest = hashlib.blake2b((vector + 0.0).tobytes(), digest_size=16)
+        digest.update(f"{scorer.version}|{scorer.threshold}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def ensure_version(self, model_version):
+        """Kosongkan cache jika versi model berubah"""
+        with self._lock:
+            if self._model_version != model_version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._model_version = model_version
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, value = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'model_version': self._model_version
+            }
+
+
+def cached_score(cache, scorer, data_dict):
+    """Ambil hasil dari cache, atau hitung lalu simpan"""
+    cache.ensure_version(scorer.version)
+    key = cache.make_key(data_dict, scorer)
+    result = cache.get(key)
+    if result is None:
+        result = scorer.score(data_dict)
+        cache.put(key, result)
+    return result
@@ -0,0 +1,199 @@
+"""Scoring paralel berbasis process pool untuk model ensemble yang berat.
+
+``predict_proba`` RandomForest/GradientBoosting berjalan single-thread di tab
+batch. Di sini satu batch dipecah menjadi beberapa shard dan dikerjakan oleh
+process pool. Model dan scaler dimuat sekali per worker lewat initializer
+(dari path file, bukan di-pickle ulang per task), sehingga yang dikirim per
+task hanya shard array NumPy. Urutan baris dijaga oleh ``executor.map``.
+
+Pool dibuat saat pertama kali dibutuhkan dengan start method ``forkserver``
+(``spawn`` jika tidak tersedia), bukan fork dari server Streamlit yang
+multithread. Jumlah worker diubah lewat ``resize``: pool lama dimatikan
+sebelum pool baru dibuat, sehingga proses worker tidak menumpuk.
+
+Pool hanya dipakai jika ada lebih dari satu core dan setiap shard minimal
+``MIN_ROWS_PER_SHARD`` baris; di bawah itu scoring dikerjakan in-process.
+Di satu core pool selalu lebih lambat (lihat benchmark di README).
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Diisi di setiap proses worker oleh _init_worker
+_WORKER_SCORER = None
+
+# Crossover dari overhead pool yang diukur di benchmark README (~10 ms per batch + ~1-2 us
+# per baris untuk kirim shard dan hasil): di bawah ~10 ribu baris per shard, 2 worker tidak
+# mengalahkan scoring in-process. Ukur ulang dengan `python streamlit/parallel.py`.
+MIN_ROWS_PER_SHARD = 10_000
+
+
+def _init_worker(model_path, scaler_path, class_names):
+    global _WORKER_SCORER
+    import joblib
+    from scorer import compile_scorer
+
+    _WORKER_SCORER = compile_scorer(joblib.load(model_path), joblib.load(scaler_path), class_names)
+
+
+def _score_shard(X_shard):
+    return _WORKER_SCORER.predict_proba(X_shard)
+
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class ParallelScorer:
+    """Scorer dengan antarmuka sama seperti scorer biasa, dikerjakan oleh process pool"""
+
+    def __init__(self, model_path, scaler_path, class_names, n_workers=None):
+        import joblib
+        from scorer import compile_scorer
+
+        self.n_workers = n_workers or os.cpu_count() or 1
+        # Salinan lokal untuk metadata dan jalur satu baris (tanpa lewat pool)
+        self.local = compile_scorer(joblib.load(model_path), joblib.load(scaler_path), class_names)
+        self.feature_names = self.local.feature_names
+        self.class_names = self.local.class_names
+        self.classes = self.local.classes
+        # Operating point hanya dipilih untuk model utama; ensemble memakai argmax
+        self.threshold = None
+        self.version = f"{os.path.basename(model_path)}-{int(os.path.getmtime(model_path))}"
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self._initargs = (model_path, scaler_path, list(class_names))
+        self._lock = threading.Lock()
+        self.executor = None
+
+    def _executor(self):
+        with self._lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.n_workers,
+                    mp_context=_pool_context(),
+                    initializer=_init_worker,
+                    initargs=self._initargs
+                )
+            return self.executor
+
+    def resize(self, n_workers):
+        """Ubah jumlah worker; pool lama dimatikan (task yang sedang berjalan tetap selesai)"""
+        n_workers = n_workers or os.cpu_count() or 1
+        with self._lock:
+            if n_workers == self.n_workers:
+                return self
+            executor, self.executor = self.executor, None
+            self.n_workers = n_workers
+        if executor is not None:
+            executor.shutdown(wait=True)
+        return self
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        # Worker melebihi jumlah core hanya menambah overhead
+        n_workers = min(self.n_workers, os.cpu_count() or 1)
+        n_shards = min(n_workers, max(1, len(X) // MIN_ROWS_PER_SHARD))
+        if n_shards == 1:
+            return self.local.predict_proba(X)
+
+        shards = np.array_split(X, n_shards)
+        return np.concatenate(list(self._executor().map(_score_shard, shards)))
+
+    def score(self, data_dict):
+        return self.local.score(data_dict)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+class ParallelScorers:
+    """Satu ParallelScorer per model; diganti saat path artefak (versi registry aktif) berubah"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scorers = {}
+
+    def get(self, name, model_path, scaler_path, class_names, n_workers=None):
+        with self._lock:
+            scorer = self._scorers.get(name)
+            stale = None
+            if scorer is None or (scorer.model_path, scorer.scaler_path) != (model_path, scaler_path):
+                stale = scorer
+                scorer = self._scorers[name] = ParallelScorer(model_path, scaler_path, class_names, n_workers)
+        if stale is not None:
+            # Task yang sedang berjalan di pool versi lama tetap selesai sebelum pool dimatikan
+            stale.shutdown()
+        return scorer.resize(n_workers)
+
+
+def benchmark(model_paths, scaler_path, class_names, source_df, sizes=(100_000, 1_000_000), n_workers=None):
+    """Bandingkan throughput serial vs process pool untuk setiap model"""
+    import time
+    import joblib
+    from scorer import compile_scorer
+
+    scaler = joblib.load(scaler_path)
+    base = source_df[list(scaler.feature_names_in_)].to_numpy(dtype=np.float64)
+    rng = np.random.default_rng(42)
+
+    rows = []
+    for name, model_path in model_paths.items():
+        serial = compile_scorer(joblib.load(model_path), scaler, class_names)
+        parallel = ParallelScorer(model_path, scaler_path, class_names, n_workers)
+        parallel.predict_proba(base)  # pemanasan pool
+
+        for size in sizes:
+            X = base[rng.integers(0, len(base), size)]
+            start = time.perf_counter()
+            expected = serial.predict_proba(X)
+            serial_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = parallel.predict_proba(X)
+            parallel_s = time.perf_counter() - start
+
+            assert np.allclose(expected, result)
+            rows.append({
+                'model': name,
+                'rows': size,
+                'serial_rows_per_s': size / serial_s,
+                'parallel_rows_per_s': size / parallel_s,
+                'speedup': serial_s / parallel_s
+            })
+        parallel.shutdown()
+    return rows
+
+
+if __name__ == '__main__':
+    import pandas as pd
+
+    model_dir = 'saved_models'
+    candidates = {
+        'Logistic Regression': 'best_model.pkl',
+        'Random Forest': 'random_forest.pkl',
+        'Gradient Boosting': 'gradient_boosting.pkl'
+    }
+    model_paths = {
+        name: os.path.join(model_dir, filename)
+        for name, filename in candidates.items()
+        if os.path.exists(os.path.join(model_dir, filename))
+    }
+
+    import joblib
+    df = pd.read_csv('data/data.csv', sep=';', encoding='utf-8-sig')
+    results = benchmark(model_paths, os.path.join(model_dir, 'scaler.pkl'),
+                        joblib.load(os.path.join(model_dir, 'class_names.pkl')), df)
+
+    print(f"Workers: {os.cpu_count()}")
+    for row in results:
+        print(f"{row['model']:<20} {row['rows']:>9,} baris | serial {row['serial_rows_per_s']:>12,.0f} baris/s"
+              f" | paralel {row['parallel_rows_per_s']:>12,.0f} baris/s | {row['speedup']:.1f}x")
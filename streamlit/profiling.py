@@ -0,0 +1,91 @@
+"""Instrumentasi waktu startup dan rerun aplikasi Streamlit.
+
+Aktifkan dengan environment variable ``APP_PROFILE=1``:
+
+    APP_PROFILE=1 streamlit run streamlit/app.py
+
+Aplikasi lalu menampilkan biaya import pertama setiap modul yang dimuat lewat
+``lazy_import`` dan waktu eksekusi script per rerun di sidebar.
+
+Untuk biaya import per modul (termasuk dependensi bertingkat) dari
+interpreter baru, jalankan:
+
+    python streamlit/profiling.py
+"""
+
+import collections
+import contextlib
+import importlib
+import os
+import sys
+import time
+
+PROFILE_ENABLED = os.environ.get('APP_PROFILE') == '1'
+
+# Dibagi oleh semua sesi dalam satu proses: modul hanya di-import sekali per proses
+IMPORT_TIMES = {}
+RERUN_TIMES = collections.deque(maxlen=100)
+
+
+def lazy_import(name):
+    """Import modul saat pertama dibutuhkan dan catat biayanya"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    IMPORT_TIMES[name] = (time.perf_counter() - start) * 1000
+    return module
+
+
+@contextlib.contextmanager
+def rerun_timer():
+    """Catat durasi satu eksekusi script (satu rerun Streamlit)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        RERUN_TIMES.append((time.perf_counter() - start) * 1000)
+
+
+def render_report(st):
+    """Tampilkan laporan profiling di sidebar"""
+    if not PROFILE_ENABLED:
+        return
+
+    with st.sidebar.expander("⏱️ Profiling", expanded=False):
+        if RERUN_TIMES:
+            times = list(RERUN_TIMES)
+            st.write(f"**Rerun terakhir:** {times[-1]:.1f} ms")
+            st.write(f"**Rata-rata {len(times)} rerun:** {sum(times) / len(times):.1f} ms")
+        if IMPORT_TIMES:
+            st.write("**Lazy import (biaya pertama):**")
+            for name, ms in sorted(IMPORT_TIMES.items(), key=lambda item: -item[1]):
+                st.write(f"• `{name}`: {ms:.1f} ms")
+
+
+def importtime_report(modules, top=15):
+    """Jalankan ``python -X importtime`` dan kembalikan modul dengan biaya kumulatif terbesar"""
+    import subprocess
+
+    code = '; '.join(f'import {module}' for module in modules)
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                               capture_output=True, text=True)
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.replace('import time:', '').split('|')
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+
+    return sorted(rows, key=lambda row: -row[2])[:top]
+
+
+if __name__ == '__main__':
+    heavy = ['streamlit', 'numpy', 'pandas', 'plotly.graph_objects', 'joblib', 'sklearn.linear_model']
+    for module in heavy:
+        rows = importtime_report([module], top=1)
+        if rows:
+            print(f"{module:<25} {rows[0][2]:8.1f} ms")
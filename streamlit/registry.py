@@ -0,0 +1,224 @@
+"""Registry model berversi dengan pointer versi aktif dan hot reload.
+
+Struktur di dalam ``saved_models/``::
+
+    registry/
+        versions/<versi>/   model_bundle.bin + model_bundle.json + file .pkl
+        CURRENT             nama versi aktif
+
+Versi baru ditulis lengkap ke direktori sementara lalu di-rename, baru
+setelah itu ``CURRENT`` diganti dengan ``os.replace``; pembaca tidak pernah
+melihat versi setengah jadi. ``HotModel`` hanya melakukan ``os.stat`` pada
+pointer (atau pada file artefak jika registry belum ada) setiap kali
+dipanggil, dan memuat ulang scorer hanya jika pointer berubah.
+"""
+
+import itertools
+import json
+import os
+import shutil
+import threading
+import time
+
+REGISTRY_DIR = 'registry'
+VERSIONS_DIR = 'versions'
+POINTER = 'CURRENT'
+PICKLE_FILES = ('best_model.pkl', 'scaler.pkl', 'class_names.pkl')
+# Jumlah versi yang disimpan setelah publish (versi aktif selalu disimpan)
+KEEP_VERSIONS = 5
+# Model ensemble (scoring batch paralel) ikut disimpan di setiap versi
+ENSEMBLE_FILES = ('random_forest.pkl', 'gradient_boosting.pkl')
+# Scaler saat ensemble di-fit; hanya ditulis jika berbeda dari scaler.pkl (mis. setelah update inkremental)
+ENSEMBLE_SCALER = 'ensemble_scaler.pkl'
+# Artefak layout lama (tanpa registry) yang dipantau untuk hot reload
+FLAT_FILES = ('model_bundle.json',) + PICKLE_FILES
+
+
+def registry_path(model_dir='saved_models'):
+    return os.path.join(model_dir, REGISTRY_DIR)
+
+
+def current_version(model_dir='saved_models'):
+    """Nama versi aktif, atau None jika registry belum ada"""
+    try:
+        with open(os.path.join(registry_path(model_dir), POINTER)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def version_dir(model_dir, version):
+    return os.path.join(registry_path(model_dir), VERSIONS_DIR, version)
+
+
+def active_dir(model_dir='saved_models'):
+    """Direktori artefak versi aktif (layout lama: ``model_dir`` itu sendiri)"""
+    version = current_version(model_dir)
+    return model_dir if version is None else version_dir(model_dir, version)
+
+
+def ensemble_scaler_path(artifact_dir):
+    """Scaler yang dipakai model ensemble di satu direktori artefak"""
+    path = os.path.join(artifact_dir, ENSEMBLE_SCALER)
+    return path if os.path.exists(path) else os.path.join(artifact_dir, 'scaler.pkl')
+
+
+def ensemble_artifacts(artifact_dir):
+    """Model ensemble + scaler training-nya dari satu versi, untuk dibawa ke versi baru"""
+    import joblib
+
+    artifacts = {
+        name: joblib.load(os.path.join(artifact_dir, name))
+        for name in ENSEMBLE_FILES if os.path.exists(os.path.join(artifact_dir, name))
+    }
+    if artifacts:
+        artifacts[ENSEMBLE_SCALER] = joblib.load(ensemble_scaler_path(artifact_dir))
+    return artifacts
+
+
+def set_current(model_dir, version):
+    """Ganti versi aktif secara atomik"""
+    if not os.path.isdir(version_dir(model_dir, version)):
+        raise ValueError(f"Versi {version!r} tidak ada di registry")
+    pointer = os.path.join(registry_path(model_dir), POINTER)
+    with open(pointer + '.tmp', 'w') as f:
+        f.write(version + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(pointer + '.tmp', pointer)
+
+
+def publish(model, scaler, class_names, model_dir='saved_models', operating_point=None, make_current=True,
+            keep=KEEP_VERSIONS, extra_artifacts=None):
+    """Simpan model sebagai versi baru di registry (dan jadikan aktif), lalu hapus versi lama di luar ``keep``.
+
+    ``extra_artifacts`` (nama file -> objek) ikut disimpan di direktori versi,
+    mis. model ensemble dari ``ENSEMBLE_FILES``.
+    """
+    import joblib
+    from artifacts import write_bundle
+
+    versions = os.path.join(registry_path(model_dir), VERSIONS_DIR)
+    staging = os.path.join(versions, f'.tmp-{os.getpid()}-{time.time_ns()}')
+    os.makedirs(staging)
+    try:
+        manifest = write_bundle(model, scaler, class_names, model_dir=staging, operating_point=operating_point)
+        for name, obj in zip(PICKLE_FILES, (model, scaler, class_names)):
+            joblib.dump(obj, os.path.join(staging, name))
+        for name, obj in (extra_artifacts or {}).items():
+            joblib.dump(obj, os.path.join(staging, name))
+        base = manifest['version']
+        for n in itertools.count(2):
+            # Isi sama di detik yang sama menghasilkan id yang sama: beri sufiks -2, -3, ... agar
+            # setiap publish tetap tercatat sebagai versi sendiri
+            if not os.path.exists(version_dir(model_dir, manifest['version'])):
+                break
+            manifest['version'] = f'{base}-{n}'
+        if manifest['version'] != base:
+            with open(os.path.join(staging, 'model_bundle.json'), 'w') as f:
+                json.dump(manifest, f, indent=2)
+        os.rename(staging, version_dir(model_dir, manifest['version']))
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    if make_current:
+        set_current(model_dir, manifest['version'])
+    if keep is not None:
+        prune(model_dir, keep)
+    return manifest
+
+
+def list_versions(model_dir='saved_models'):
+    """Semua versi di registry (terbaru dulu) beserta penanda versi aktif"""
+    versions = os.path.join(registry_path(model_dir), VERSIONS_DIR)
+    if not os.path.isdir(versions):
+        return []
+    current = current_version(model_dir)
+    rows = []
+    for name in os.listdir(versions):
+        if name.startswith('.'):
+            continue
+        with open(os.path.join(versions, name, 'model_bundle.json')) as f:
+            manifest = json.load(f)
+        rows.append({
+            'version': name,
+            'created_at': manifest['created_at'],
+            'model_type': manifest['model_type'],
+            'threshold': (manifest.get('operating_point') or {}).get('threshold'),
+            'current': name == current
+        })
+    # created_at beresolusi detik; mtime direktori memisahkan versi yang dipublish di detik yang sama
+    published = {row['version']: os.stat(os.path.join(versions, row['version'])).st_mtime_ns for row in rows}
+    return sorted(rows, key=lambda row: (row['created_at'], published[row['version']]), reverse=True)
+
+
+def prune(model_dir='saved_models', keep=KEEP_VERSIONS):
+    """Hapus versi lama selain ``keep`` terbaru dan versi aktif"""
+    removed = []
+    for row in list_versions(model_dir)[keep:]:
+        if not row['current']:
+            shutil.rmtree(version_dir(model_dir, row['version']))
+            removed.append(row['version'])
+    return removed
+
+
+class HotModel:
+    """Scorer aktif yang otomatis diganti saat versi di registry berubah.
+
+    ``loader(path)`` memuat scorer dari satu direktori artefak. Scorer lama
+    tidak diubah saat pergantian, sehingga request yang sedang berjalan
+    selesai dengan versi lama dan request baru memakai versi baru.
+    """
+
+    def __init__(self, model_dir, loader):
+        self.model_dir = model_dir
+        self.loader = loader
+        self._lock = threading.Lock()
+        self._scorer = None
+        self._fingerprint = None
+        self.active_dir = None
+        self.loaded_at = None
+        self.reloads = 0
+        self.last_error = None
+
+    def fingerprint(self):
+        """Penanda murah (stat saja) untuk mendeteksi versi baru"""
+        try:
+            stat = os.stat(os.path.join(registry_path(self.model_dir), POINTER))
+            return ('registry', stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            stats = []
+            for name in FLAT_FILES:
+                try:
+                    stat = os.stat(os.path.join(self.model_dir, name))
+                    stats.append((stat.st_mtime_ns, stat.st_size))
+                except FileNotFoundError:
+                    stats.append(None)
+            return ('flat', tuple(stats))
+
+    def current(self):
+        """Scorer versi aktif; dimuat ulang hanya jika pointer/artefak berubah"""
+        fingerprint = self.fingerprint()
+        if fingerprint == self._fingerprint:
+            return self._scorer
+
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                path = active_dir(self.model_dir)
+                try:
+                    scorer = self.loader(path)
+                    if scorer is None:
+                        self.last_error = f"Artefak di {path} tidak bisa dimuat"
+                except Exception as e:
+                    scorer = None
+                    self.last_error = f"{type(e).__name__}: {e}"
+                # Gagal memuat versi baru: tetap pakai scorer lama, coba lagi di panggilan berikutnya
+                if scorer is not None:
+                    self._scorer = scorer
+                    self._fingerprint = fingerprint
+                    self.active_dir = path
+                    self.loaded_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+                    self.reloads += 1
+                    self.last_error = None
+        return self._scorer
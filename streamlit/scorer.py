@@ -0,0 +1,175 @@
+"""Scorer terkompilasi untuk jalur prediksi satu mahasiswa.
+
+Untuk model linear (LogisticRegression) parameter ``StandardScaler`` dilipat
+langsung ke koefisien:
+
+    z = (x - mean) / scale
+    logit = W @ z + b = (W / scale) @ x + (b - W @ (mean / scale))
+
+sehingga satu prediksi cukup satu dot product kecil pada vektor NumPy, tanpa
+DataFrame dan tanpa dispatch sklearn.
+
+Scorer dipakai bersama oleh banyak thread (session Streamlit, service HTTP),
+jadi ``score`` tidak boleh menulis ke buffer milik instance: vektor fitur
+dibuat baru di setiap panggilan.
+"""
+
+import numpy as np
+
+
+def decision_indices(probabilities, threshold=None):
+    """Indeks kolom kelas terpilih.
+
+    Tanpa threshold sama dengan ``model.predict`` (argmax). Untuk model binary
+    dengan operating point, kelas positif dipilih jika probabilitasnya
+    >= threshold.
+    """
+    if threshold is None or probabilities.shape[-1] != 2:
+        return probabilities.argmax(axis=-1)
+    return (probabilities[..., 1] >= threshold).astype(np.intp)
+
+
+class CompiledLinearScorer:
+    """Scorer logistic regression dengan scaler yang sudah dilipat"""
+
+    # Diisi oleh loader (versi bundle atau hash file pickle)
+    version = None
+    # Threshold operating point dari manifest; None berarti argmax
+    threshold = None
+
+    def __init__(self, weights, bias, feature_names, class_names, classes=None):
+        self.weights = weights
+        self.bias = bias
+        self.feature_names = list(feature_names)
+        self.class_names = list(class_names)
+        self.classes = np.arange(len(self.class_names)) if classes is None else np.asarray(classes)
+        self.binary = self.weights.shape[0] == 1
+
+    @staticmethod
+    def fold(coef, intercept, mean, scale):
+        """Lipat mean/scale StandardScaler ke koefisien dan intercept"""
+        coef = np.asarray(coef, dtype=np.float64)
+        intercept = np.asarray(intercept, dtype=np.float64)
+        mean = np.zeros(coef.shape[1]) if mean is None else np.asarray(mean, dtype=np.float64)
+        scale = np.ones(coef.shape[1]) if scale is None else np.asarray(scale, dtype=np.float64)
+
+        weights = np.ascontiguousarray(coef / scale)
+        bias = intercept - weights @ mean
+        return weights, bias
+
+    @classmethod
+    def from_sklearn(cls, model, scaler, class_names):
+        """Bangun scorer dari LogisticRegression + StandardScaler yang sudah di-fit"""
+        feature_names = getattr(scaler, 'feature_names_in_', None)
+        if feature_names is None:
+            feature_names = getattr(model, 'feature_names_in_', range(model.coef_.shape[1]))
+        weights, bias = cls.fold(model.coef_, model.intercept_, scaler.mean_, scaler.scale_)
+        return cls(weights, bias, feature_names, class_names, classes=model.classes_)
+
+    def predict_proba(self, X):
+        """Probabilitas semua kelas untuk matriks fitur mentah (belum di-scale)"""
+        logits = np.asarray(X, dtype=np.float64) @ self.weights.T + self.bias
+        return self._proba_from_logits(logits)
+
+    def _proba_from_logits(self, logits):
+        if self.binary:
+            p1 = 1.0 / (1.0 + np.exp(-logits[..., 0]))
+            return np.stack([1.0 - p1, p1], axis=-1)
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+    def score(self, data_dict):
+        """Prediksi satu mahasiswa: label, confidence dan probabilitas sekaligus"""
+        x = np.fromiter((data_dict[name] for name in self.feature_names), np.float64, len(self.feature_names))
+        probabilities = self._proba_from_logits(self.weights @ x + self.bias)
+        best = int(decision_indices(probabilities, self.threshold))
+        return {
+            'prediction': self.class_names[self.classes[best]],
+            'confidence': float(probabilities[best]),
+            'probabilities': {
+                class_name: float(probabilities[i])
+                for i, class_name in enumerate(self.class_names)
+            }
+        }
+
+
+class SklearnScorer:
+    """Fallback untuk model non-linear dengan antarmuka yang sama"""
+
+    version = None
+    threshold = None
+
+    def __init__(self, model, scaler, class_names):
+        self.model = model
+        self.scaler = scaler
+        self.class_names = list(class_names)
+        self.classes = model.classes_
+        self.feature_names = list(getattr(scaler, 'feature_names_in_', []))
+        self._mean = 0.0 if scaler.mean_ is None else scaler.mean_
+        self._scale = 1.0 if scaler.scale_ is None else scaler.scale_
+
+    def predict_proba(self, X):
+        # Scaling manual agar tidak perlu membungkus ke DataFrame
+        X_scaled = (np.asarray(X, dtype=np.float64) - self._mean) / self._scale
+        return self.model.predict_proba(X_scaled)
+
+    def score(self, data_dict):
+        x = np.fromiter((data_dict[name] for name in self.feature_names), np.float64, len(self.feature_names))
+        probabilities = self.predict_proba(x[np.newaxis])[0]
+        best = int(decision_indices(probabilities, self.threshold))
+        return {
+            'prediction': self.class_names[self.classes[best]],
+            'confidence': float(probabilities[best]),
+            'probabilities': {
+                class_name: float(probabilities[i])
+                for i, class_name in enumerate(self.class_names)
+            }
+        }
+
+
+def compile_scorer(model, scaler, class_names):
+    """Pilih scorer tercepat yang didukung oleh model"""
+    if hasattr(model, 'coef_') and hasattr(model, 'intercept_'):
+        return CompiledLinearScorer.from_sklearn(model, scaler, class_names)
+    return SklearnScorer(model, scaler, class_names)
+
+
+def benchmark(model, scaler, class_names, data_dict, repeat=2000):
+    """Bandingkan latensi jalur lama (DataFrame + sklearn) dengan scorer terkompilasi"""
+    import time
+    import pandas as pd
+
+    def legacy():
+        df_scaled = scaler.transform(pd.DataFrame([data_dict]))
+        model.predict(df_scaled)
+        model.predict_proba(df_scaled)
+
+    scorer = compile_scorer(model, scaler, class_names)
+    timings = {}
+    for name, fn in [('legacy', legacy), ('compiled', lambda: scorer.score(data_dict))]:
+        fn()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        timings[name] = (time.perf_counter() - start) / repeat * 1e6
+
+    timings['speedup'] = timings['legacy'] / timings['compiled']
+    return timings
+
+
+if __name__ == '__main__':
+    import joblib
+    import pandas as pd
+
+    model = joblib.load('saved_models/best_model.pkl')
+    scaler = joblib.load('saved_models/scaler.pkl')
+    class_names = joblib.load('saved_models/class_names.pkl')
+
+    df = pd.read_csv('data/data.csv', sep=';', encoding='utf-8-sig')
+    sample = df[list(scaler.feature_names_in_)].iloc[0].to_dict()
+
+    result = benchmark(model, scaler, class_names, sample)
+    print(f"Legacy path  : {result['legacy']:.1f} µs/prediksi")
+    print(f"Compiled path: {result['compiled']:.1f} µs/prediksi")
+    print(f"Speedup      : {result['speedup']:.0f}x")
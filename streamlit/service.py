@@ -0,0 +1,249 @@
+"""Service HTTP lokal untuk prediksi dropout dengan micro-batching.
+
+Artefak di ``saved_models/`` dimuat sekali saat start. Request tunggal yang
+datang bersamaan dikumpulkan menjadi micro-batch (dibatasi ``max_batch_size``
+dan ``max_wait_ms``) sehingga satu panggilan ``predict_proba`` yang tervektor
+melayani banyak pemanggil sekaligus.
+
+Menjalankan service:
+
+    python streamlit/service.py --port 8000 --max-batch-size 64 --max-wait-ms 2
+
+Endpoint:
+    POST /predict        satu mahasiswa (JSON 36 fitur seperti ``student_data``)
+    POST /predict/batch  {"instances": [ {...}, {...} ]}
+    GET  /stats          throughput dan latensi p50/p99
+    GET  /health
+"""
+
+import argparse
+import asyncio
+import collections
+import os
+import time
+
+import joblib
+import numpy as np
+from aiohttp import web
+
+from artifacts import read_operating_point
+from registry import active_dir
+from scorer import compile_scorer, decision_indices
+from validation import check_vector
+
+LATENCY_WINDOW = 10_000
+
+
+class MicroBatcher:
+    """Kumpulkan request tunggal menjadi satu panggilan predict_proba"""
+
+    def __init__(self, scorer, max_batch_size=64, max_wait_ms=2.0):
+        self.scorer = scorer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.batched_rows = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, vector):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((vector, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(items) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            X = np.vstack([vector for vector, _ in items])
+            try:
+                probabilities = self.scorer.predict_proba(X)
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.batched_rows += len(items)
+            for (_, future), row in zip(items, probabilities):
+                if not future.done():
+                    future.set_result(row)
+
+
+class ServiceStats:
+    """Hitung throughput dan persentil latensi dari jendela request terakhir"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+        self.latencies_ms = collections.deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, rows, latency_ms):
+        self.requests += 1
+        self.rows += rows
+        self.latencies_ms.append(latency_ms)
+
+    def snapshot(self):
+        elapsed = time.perf_counter() - self.started
+        latencies = np.fromiter(self.latencies_ms, dtype=np.float64)
+        p50, p99 = (np.percentile(latencies, [50, 99]) if len(latencies) else (0.0, 0.0))
+        return {
+            'requests': self.requests,
+            'rows': self.rows,
+            'uptime_s': round(elapsed, 3),
+            'throughput_rows_per_s': round(self.rows / elapsed, 1) if elapsed > 0 else 0.0,
+            'latency_p50_ms': round(float(p50), 3),
+            'latency_p99_ms': round(float(p99), 3)
+        }
+
+
+def load_artifacts(model_dir='saved_models'):
+    """Muat model, scaler dan class names sekali saat service start"""
+    model_dir = active_dir(model_dir)
+    model = joblib.load(os.path.join(model_dir, 'best_model.pkl'))
+    scaler = joblib.load(os.path.join(model_dir, 'scaler.pkl'))
+    class_names = joblib.load(os.path.join(model_dir, 'class_names.pkl'))
+    scorer = compile_scorer(model, scaler, class_names)
+    scorer.threshold = (read_operating_point(model_dir) or {}).get('threshold')
+    return scorer
+
+
+def to_vector(instance, feature_names):
+    """Ubah satu instance JSON ke vektor fitur sesuai urutan saat scaler di-fit.
+
+    Nilai dicek dengan skema yang sama seperti batch upload (berhingga,
+    bilangan bulat, rentang), sehingga "nan"/"inf" atau nilai di luar
+    rentang ditolak dengan 400.
+    """
+    missing = [name for name in feature_names if name not in instance]
+    if missing:
+        raise ValueError(f"Fitur tidak lengkap: {missing}")
+    vector = np.array([float(instance[name]) for name in feature_names], dtype=np.float64)
+    errors = check_vector(vector, feature_names)
+    if errors:
+        raise ValueError(f"Nilai fitur tidak valid: {errors}")
+    return vector
+
+
+def format_result(probabilities, scorer):
+    best = int(decision_indices(probabilities, scorer.threshold))
+    return {
+        'prediction': scorer.class_names[scorer.classes[best]],
+        'confidence': float(probabilities[best]),
+        'probabilities': {
+            class_name: float(probabilities[i])
+            for i, class_name in enumerate(scorer.class_names)
+        }
+    }
+
+
+async def handle_predict(request):
+    start = time.perf_counter()
+    app = request.app
+    try:
+        vector = to_vector(await request.json(), app['scorer'].feature_names)
+    except (ValueError, KeyError, TypeError) as e:
+        return web.json_response({'error': str(e)}, status=400)
+
+    probabilities = await app['batcher'].submit(vector)
+    app['stats'].record(1, (time.perf_counter() - start) * 1000)
+    return web.json_response(format_result(probabilities, app['scorer']))
+
+
+async def handle_predict_batch(request):
+    start = time.perf_counter()
+    app = request.app
+    scorer = app['scorer']
+    try:
+        payload = await request.json()
+        instances = payload['instances']
+        X = np.vstack([to_vector(instance, scorer.feature_names) for instance in instances])
+    except (ValueError, KeyError, TypeError) as e:
+        return web.json_response({'error': str(e)}, status=400)
+
+    # Request batch sudah tervektor, tidak antre di batcher; dihitung di thread pool
+    # agar micro-batch request lain tidak tertahan selama scoring
+    probabilities = await asyncio.get_running_loop().run_in_executor(None, scorer.predict_proba, X)
+    app['stats'].record(len(instances), (time.perf_counter() - start) * 1000)
+    return web.json_response({
+        'predictions': [format_result(row, scorer) for row in probabilities]
+    })
+
+
+async def handle_stats(request):
+    app = request.app
+    stats = app['stats'].snapshot()
+    batcher = app['batcher']
+    stats['micro_batches'] = batcher.batches
+    stats['avg_micro_batch_size'] = round(batcher.batched_rows / batcher.batches, 2) if batcher.batches else 0.0
+    return web.json_response(stats)
+
+
+async def handle_health(request):
+    return web.json_response({'status': 'ok'})
+
+
+def create_app(scorer, max_batch_size=64, max_wait_ms=2.0):
+    """Bangun aplikasi aiohttp dengan batcher dan statistik"""
+    app = web.Application()
+    app['scorer'] = scorer
+    app['stats'] = ServiceStats()
+    app['batcher'] = MicroBatcher(scorer, max_batch_size, max_wait_ms)
+
+    async def on_startup(app):
+        app['batcher'].start()
+
+    async def on_cleanup(app):
+        await app['batcher'].stop()
+        print(f"📊 Statistik service: {app['stats'].snapshot()}")
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.router.add_post('/predict', handle_predict)
+    app.router.add_post('/predict/batch', handle_predict_batch)
+    app.router.add_get('/stats', handle_stats)
+    app.router.add_get('/health', handle_health)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service prediksi dropout lokal")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--model-dir', default='saved_models')
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    scorer = load_artifacts(args.model_dir)
+    print(f"✅ Model dimuat dari {args.model_dir}/")
+    app = create_app(scorer, args.max_batch_size, args.max_wait_ms)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""Validasi dan koersi skema untuk file batch yang di-upload.
+
+Skema 36 fitur mengikuti kolom yang dipakai saat ``StandardScaler`` di-fit
+(lihat ``data/data.csv``). Validasi dilakukan per chunk secara tervektor:
+kolom diproyeksikan dan diurutkan, dikonversi ke float64, lalu pengecekan
+(nilai kosong/bukan angka, bilangan bulat, rentang nilai) dihitung sebagai
+mask NumPy per kolom, tanpa loop per baris.
+"""
+
+import csv
+import functools
+
+import numpy as np
+import pandas as pd
+
+INT = 'int'
+FLOAT = 'float'
+
+# (nama kolom, tipe, minimum, maksimum) dengan urutan sama seperti saat scaler di-fit
+FEATURE_SCHEMA = [
+    ('Marital_status', INT, 1, 6),
+    ('Application_mode', INT, 1, 57),
+    ('Application_order', INT, 0, 9),
+    ('Course', INT, 1, 9999),
+    ('Daytime_evening_attendance', INT, 0, 1),
+    ('Previous_qualification', INT, 1, 43),
+    ('Previous_qualification_grade', FLOAT, 0, 200),
+    ('Nacionality', INT, 1, 109),
+    ('Mothers_qualification', INT, 1, 44),
+    ('Fathers_qualification', INT, 1, 44),
+    ('Mothers_occupation', INT, 0, 195),
+    ('Fathers_occupation', INT, 0, 195),
+    ('Admission_grade', FLOAT, 0, 200),
+    ('Displaced', INT, 0, 1),
+    ('Educational_special_needs', INT, 0, 1),
+    ('Debtor', INT, 0, 1),
+    ('Tuition_fees_up_to_date', INT, 0, 1),
+    # Di data.csv Gender dikodekan 0/1
+    ('Gender', INT, 0, 1),
+    ('Scholarship_holder', INT, 0, 1),
+    ('Age_at_enrollment', INT, 14, 100),
+    ('International', INT, 0, 1),
+    ('Curricular_units_1st_sem_credited', INT, 0, 60),
+    ('Curricular_units_1st_sem_enrolled', INT, 0, 60),
+    ('Curricular_units_1st_sem_evaluations', INT, 0, 100),
+    ('Curricular_units_1st_sem_approved', INT, 0, 60),
+    ('Curricular_units_1st_sem_grade', FLOAT, 0, 20),
+    ('Curricular_units_1st_sem_without_evaluations', INT, 0, 60),
+    ('Curricular_units_2nd_sem_credited', INT, 0, 60),
+    ('Curricular_units_2nd_sem_enrolled', INT, 0, 60),
+    ('Curricular_units_2nd_sem_evaluations', INT, 0, 100),
+    ('Curricular_units_2nd_sem_approved', INT, 0, 60),
+    ('Curricular_units_2nd_sem_grade', FLOAT, 0, 20),
+    ('Curricular_units_2nd_sem_without_evaluations', INT, 0, 60),
+    ('Unemployment_rate', FLOAT, 0, 100),
+    ('Inflation_rate', FLOAT, -50, 100),
+    ('GDP', FLOAT, -50, 50),
+]
+
+FEATURE_NAMES = [name for name, _, _, _ in FEATURE_SCHEMA]
+
+MAX_REPORTED_ERRORS = 1_000
+SNIFF_BYTES = 64 * 1024
+
+
+class SchemaError(ValueError):
+    """Kesalahan struktur file (mis. kolom fitur tidak ada) yang tidak bisa diperbaiki per baris"""
+
+
+def sniff_delimiter(source, default=','):
+    """Tebak delimiter dari awal file lalu kembalikan posisi file ke awal"""
+    sample = source.read(SNIFF_BYTES)
+    source.seek(0)
+    if isinstance(sample, bytes):
+        sample = sample.decode('utf-8-sig', errors='ignore')
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=',;\t|').delimiter
+    except csv.Error:
+        return default
+
+
+def check_columns(columns):
+    """Pastikan semua fitur ada, kembalikan peta nama fitur -> nama kolom asli"""
+    column_map = {str(c).strip(): c for c in columns}
+    missing = [name for name in FEATURE_NAMES if name not in column_map]
+    if missing:
+        raise SchemaError(f"Kolom fitur tidak ditemukan: {missing}")
+    return column_map
+
+
+def validate_chunk(df_chunk, row_offset=0):
+    """Proyeksi, koersi dan validasi satu chunk.
+
+    Mengembalikan ``(X, valid_mask, report)``: ``X`` matriks float64 semua
+    baris dengan urutan kolom sesuai skema, ``valid_mask`` baris yang lolos
+    semua pengecekan, dan ``report`` berisi jumlah error per kolom serta
+    contoh error per baris (nomor baris global, kolom, nilai, alasan).
+    """
+    column_map = check_columns(df_chunk.columns)
+    n_rows = len(df_chunk)
+
+    # Diisi per kolom (36 operasi tervektor), layout Fortran agar tiap kolom contiguous
+    X = np.empty((n_rows, len(FEATURE_SCHEMA)), dtype=np.float64, order='F')
+    errors = np.zeros((n_rows, len(FEATURE_SCHEMA)), dtype=bool, order='F')
+
+    for j, (name, kind, lower, upper) in enumerate(FEATURE_SCHEMA):
+        column = df_chunk[column_map[name]]
+        if column.dtype.kind in 'iub':
+            # Kolom integer hasil parsing: tidak mungkin kosong atau pecahan
+            values = column.to_numpy()
+            X[:, j] = values
+            errors[:, j] = (values < lower) | (values > upper)
+            continue
+
+        if column.dtype.kind != 'f':
+            column = pd.to_numeric(column, errors='coerce')
+        values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+        X[:, j] = values
+
+        with np.errstate(invalid='ignore'):
+            bad = ~((values >= lower) & (values <= upper))  # NaN ikut tertangkap di sini
+            if kind == INT:
+                bad |= values != np.floor(values)
+        errors[:, j] = bad
+
+    error_counts = errors.sum(axis=0)
+    valid_mask = ~errors.any(axis=1)
+
+    report = {
+        'rows': n_rows,
+        'invalid_rows': int(n_rows - valid_mask.sum()),
+        'error_counts': {
+            FEATURE_NAMES[j]: int(count)
+            for j, count in enumerate(error_counts) if count
+        },
+        'errors': []
+    }
+
+    if report['invalid_rows']:
+        rows, cols = np.nonzero(errors)
+        # Hanya contoh error yang dilaporkan (maks. MAX_REPORTED_ERRORS) yang dicari alasannya
+        report['errors'] = [
+            {'row': int(row_offset + r), 'column': FEATURE_NAMES[c],
+             'value': df_chunk[column_map[FEATURE_NAMES[c]]].iat[r],
+             'reason': _error_reason(X[r, c], FEATURE_SCHEMA[c][1])}
+            for r, c in zip(rows[:MAX_REPORTED_ERRORS], cols[:MAX_REPORTED_ERRORS])
+        ]
+
+    return X, valid_mask, report
+
+
+@functools.lru_cache(maxsize=8)
+def _bounds(feature_names):
+    schema = {name: (kind, lower, upper) for name, kind, lower, upper in FEATURE_SCHEMA}
+    # Fitur di luar skema tidak dibatasi (hanya harus berhingga)
+    rows = [schema.get(name, (FLOAT, -np.inf, np.inf)) for name in feature_names]
+    return (np.array([lower for _, lower, _ in rows], dtype=np.float64),
+            np.array([upper for _, _, upper in rows], dtype=np.float64),
+            np.array([kind == INT for kind, _, _ in rows]))
+
+
+def check_vector(x, feature_names):
+    """Pengecekan yang sama dengan ``validate_chunk`` untuk satu vektor fitur.
+
+    Mengembalikan daftar error ``{'column', 'reason'}``; kosong jika valid.
+    """
+    lower, upper, is_int = _bounds(tuple(feature_names))
+    with np.errstate(invalid='ignore'):
+        bad = ~((x >= lower) & (x <= upper)) | (is_int & (x != np.floor(x)))
+    return [
+        {'column': feature_names[j], 'reason': _error_reason(x[j], INT if is_int[j] else FLOAT)}
+        for j in np.flatnonzero(bad)
+    ]
+
+
+def _error_reason(value, kind):
+    if np.isnan(value):
+        return 'kosong/bukan angka'
+    if kind == INT and value != np.floor(value):
+        return 'harus bilangan bulat'
+    return 'di luar rentang'
+
+
+def merge_reports(total, report):
+    """Gabungkan laporan per chunk ke laporan keseluruhan"""
+    total['rows'] += report['rows']
+    total['invalid_rows'] += report['invalid_rows']
+    for column, count in report['error_counts'].items():
+        total['error_counts'][column] = total['error_counts'].get(column, 0) + count
+    room = MAX_REPORTED_ERRORS - len(total['errors'])
+    if room > 0:
+        total['errors'].extend(report['errors'][:room])
+    return total
+
+
+def empty_report():
+    return {'rows': 0, 'invalid_rows': 0, 'error_counts': {}, 'errors': []}
@@ -0,0 +1,84 @@
+"""Grid sensitivitas what-if untuk tampilan prediksi tunggal.
+
+Satu atau dua fitur divariasikan di sekitar data mahasiswa saat ini. Seluruh
+grid vektor fitur dibangun sekaligus dengan NumPy lalu diprediksi dalam satu
+panggilan ``predict_proba``, sehingga grid 100x100 cukup satu operasi matriks.
+"""
+
+import numpy as np
+
+# Fitur yang bisa divariasikan: (label, minimum, maksimum, integer)
+WHATIF_FEATURES = {
+    'Curricular_units_1st_sem_grade': ("Nilai Rata-rata Semester 1", 0.0, 20.0, False),
+    'Curricular_units_2nd_sem_grade': ("Nilai Rata-rata Semester 2", 0.0, 20.0, False),
+    'Curricular_units_1st_sem_approved': ("Unit Semester 1 Lulus", 0, 30, True),
+    'Curricular_units_2nd_sem_approved': ("Unit Semester 2 Lulus", 0, 30, True),
+    'Curricular_units_1st_sem_enrolled': ("Unit Semester 1 Terdaftar", 0, 30, True),
+    'Curricular_units_2nd_sem_enrolled': ("Unit Semester 2 Terdaftar", 0, 30, True),
+    'Admission_grade': ("Nilai Masuk", 0.0, 200.0, False),
+    'Previous_qualification_grade': ("Nilai Kualifikasi Sebelumnya", 0.0, 200.0, False),
+    'Age_at_enrollment': ("Umur saat mendaftar", 16, 50, True),
+    'Tuition_fees_up_to_date': ("SPP Up to Date", 0, 1, True),
+    'Debtor': ("Status Debitur", 0, 1, True),
+    'Scholarship_holder': ("Penerima Beasiswa", 0, 1, True),
+    'Unemployment_rate': ("Tingkat Pengangguran (%)", 0.0, 50.0, False),
+    'Inflation_rate': ("Tingkat Inflasi (%)", -10.0, 20.0, False),
+    'GDP': ("GDP", -5.0, 10.0, False),
+}
+
+# Sama seperti form sidebar: jumlah evaluasi mengikuti unit yang terdaftar
+LINKED_FEATURES = {
+    'Curricular_units_1st_sem_enrolled': ['Curricular_units_1st_sem_evaluations'],
+    'Curricular_units_2nd_sem_enrolled': ['Curricular_units_2nd_sem_evaluations'],
+}
+
+
+def feature_values(feature, start, stop, steps):
+    """Nilai-nilai grid untuk satu fitur (dibulatkan untuk fitur integer)"""
+    _, _, _, is_integer = WHATIF_FEATURES[feature]
+    values = np.linspace(start, stop, steps)
+    if is_integer:
+        values = np.unique(np.round(values))
+    return values
+
+
+def build_grid(base_dict, feature_names, x_feature, x_values, y_feature=None, y_values=None):
+    """Bangun matriks (len(y) * len(x), n_fitur) dari data dasar yang diperturbasi"""
+    if y_feature is not None and y_feature == x_feature:
+        raise ValueError(f"Fitur sumbu X dan Y harus berbeda: {x_feature}")
+    base = np.array([base_dict[name] for name in feature_names], dtype=np.float64)
+    index = {name: i for i, name in enumerate(feature_names)}
+
+    if y_feature is None:
+        y_values = np.zeros(1)
+    grid = np.tile(base, (len(y_values) * len(x_values), 1))
+
+    # Baris diurutkan y-major agar hasil bisa di-reshape menjadi (len(y), len(x))
+    xs = np.tile(x_values, len(y_values))
+    for name in [x_feature] + LINKED_FEATURES.get(x_feature, []):
+        grid[:, index[name]] = xs
+
+    if y_feature is not None:
+        ys = np.repeat(y_values, len(x_values))
+        for name in [y_feature] + LINKED_FEATURES.get(y_feature, []):
+            grid[:, index[name]] = ys
+
+    return grid
+
+
+def positive_class_index(class_names):
+    """Indeks kolom probabilitas untuk kelas Dropout"""
+    return list(class_names).index('Dropout') if 'Dropout' in class_names else len(class_names) - 1
+
+
+def sensitivity_grid(scorer, base_dict, x_feature, x_values, y_feature=None, y_values=None):
+    """Probabilitas dropout untuk seluruh grid dalam satu panggilan predict_proba.
+
+    Mengembalikan array berbentuk ``(len(y_values), len(x_values))``, atau
+    ``(len(x_values),)`` jika hanya satu fitur yang divariasikan.
+    """
+    grid = build_grid(base_dict, scorer.feature_names, x_feature, x_values, y_feature, y_values)
+    probabilities = scorer.predict_proba(grid)[:, positive_class_index(scorer.class_names)]
+    if y_feature is None:
+        return probabilities
+    return probabilities.reshape(len(y_values), len(x_values))
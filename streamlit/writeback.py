@@ -0,0 +1,353 @@
+"""Penyimpanan hasil prediksi ke database secara asinkron dan batch.
+
+Prediksi dari tab single maupun batch dimasukkan ke antrean di memori
+(``submit`` tidak pernah menunggu database dan tidak membentuk record di
+thread UI). Satu worker thread mengambil item dari antrean, membentuk record
+(hash fitur, versi model, probabilitas, timestamp) dan menulisnya per batch
+dengan satu ``executemany`` lewat connection pool SQLAlchemy.
+
+Antrean dibatasi ``max_pending_rows`` baris. Jika database lambat atau mati
+dan batas terlampaui, record langsung ditulis ke spool sehingga memori tidak
+tumbuh mengikuti ukuran upload batch.
+
+Record yang belum tertulis tidak hilang: jika database gagal atau proses
+berhenti, record ditulis ke file spool JSONL. Worker mengirim ulang spool
+per batch saat start dan setiap ``replay_seconds``. Batch tetap berada di
+buffer worker sampai write-nya commit, sehingga ``close`` yang kehabisan
+waktu saat database lambat ikut men-spool batch tersebut (at-least-once:
+jika write itu akhirnya commit, record bisa tercatat dua kali).
+
+Database diambil dari ``PREDICTION_DB_URL``; default SQLite lokal
+``predictions.db`` sebagai stand-in.
+"""
+
+import atexit
+import functools
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_URL = 'sqlite:///' + os.path.join(HERE, 'predictions.db')
+DEFAULT_SPOOL = os.path.join(HERE, 'prediction_spool.jsonl')
+DEFAULT_TABLE = 'predictions'
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_SECONDS = 1.0
+# Batas baris di antrean memori; kelebihannya langsung ke spool
+DEFAULT_MAX_PENDING_ROWS = 100_000
+DEFAULT_REPLAY_SECONDS = 60.0
+
+
+def feature_hashes(X):
+    """Hash isi vektor fitur per baris (hex), sama untuk jalur single dan batch"""
+    # + 0.0 menyamakan -0.0 dengan 0.0
+    X = np.ascontiguousarray(np.asarray(X, dtype=np.float64).reshape(len(X), -1) + 0.0)
+    return [hashlib.blake2b(row.tobytes(), digest_size=8).hexdigest() for row in X]
+
+
+def make_records(X, results, class_names, model_version, threshold, source, created_at):
+    """Record untuk setiap baris hasil ``batch.score_features`` (atau satu hasil ``score``)"""
+    if isinstance(results, dict):
+        rows = [(results['prediction'], results['confidence'], results['probabilities'])]
+    else:
+        probabilities = results[[f'prob_{name}' for name in class_names]].to_numpy()
+        rows = [
+            (prediction, confidence, dict(zip(class_names, map(float, probs))))
+            for prediction, confidence, probs in zip(results['prediction'], results['confidence'], probabilities)
+        ]
+
+    return [
+        {
+            'created_at': created_at,
+            'source': source,
+            'feature_hash': feature_hash,
+            'model_version': str(model_version),
+            'threshold': threshold,
+            'prediction': str(prediction),
+            'confidence': float(confidence),
+            'probabilities': json.dumps(probabilities)
+        }
+        for feature_hash, (prediction, confidence, probabilities) in zip(feature_hashes(X), rows)
+    ]
+
+
+class PredictionWriter:
+    """Antrean record prediksi + worker thread yang menulis per batch"""
+
+    def __init__(self, url=None, table=DEFAULT_TABLE, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_seconds=DEFAULT_FLUSH_SECONDS, spool_path=DEFAULT_SPOOL,
+                 max_pending_rows=DEFAULT_MAX_PENDING_ROWS, replay_seconds=DEFAULT_REPLAY_SECONDS):
+        self.url = url or os.environ.get('PREDICTION_DB_URL', DEFAULT_URL)
+        self.table_name = table
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.spool_path = spool_path
+        self.max_pending_rows = max_pending_rows
+        self.replay_seconds = replay_seconds
+        # Item: (jumlah baris, fungsi pembentuk record)
+        self._queue = queue.Queue()
+        self._pending_rows = 0
+        self._stop = threading.Event()
+        # Diset close() jika worker tidak selesai dalam timeout: sisa buffer langsung ke spool
+        self._abort = threading.Event()
+        self._lock = threading.Lock()
+        self._spool_lock = threading.Lock()
+        # Record milik worker yang belum commit (termasuk batch yang sedang ditulis)
+        self._buffer = []
+        # True jika close() sudah mengambil alih buffer dari worker yang macet
+        self._abandoned = False
+        self.submitted = 0
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.spooled = 0
+        self.overflowed = 0
+        self.replayed = 0
+        self.last_flush_ms = 0.0
+        self.last_error = None
+
+        self._thread = threading.Thread(target=self._run, name='prediction-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, X, results, scorer, source):
+        """Antrekan hasil prediksi ``X`` (tidak menunggu database)"""
+        created_at = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+        # Metadata scorer diambil sekarang (model bisa berganti)
+        build = functools.partial(make_records, X, results, list(scorer.class_names),
+                                  scorer.version, getattr(scorer, 'threshold', None), source, created_at)
+        with self._lock:
+            self.submitted += len(X)
+            overflow = self._pending_rows + len(X) > self.max_pending_rows
+            if not overflow:
+                self._pending_rows += len(X)
+        if overflow:
+            # Antrean penuh (database lambat/mati): langsung ke spool, dikirim ulang oleh worker
+            records = self._expand((0, build))
+            self._spool(records)
+            with self._lock:
+                self.overflowed += len(records)
+            return
+        self._queue.put((len(X), build))
+
+    def _spool(self, records):
+        """Simpan record yang belum tertulis ke file lokal (dikirim ulang oleh worker)"""
+        if not records or self.spool_path is None:
+            return
+        with self._spool_lock, open(self.spool_path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        with self._lock:
+            self.spooled += len(records)
+
+    def _connect(self):
+        from sqlalchemy import (Column, Float, Integer, MetaData, String, Table, Text, create_engine)
+
+        engine = create_engine(self.url, pool_pre_ping=True)
+        metadata = MetaData()
+        table = Table(
+            self.table_name, metadata,
+            Column('id', Integer, primary_key=True, autoincrement=True),
+            Column('created_at', String(32), nullable=False),
+            Column('source', String(16), nullable=False),
+            Column('feature_hash', String(16), nullable=False, index=True),
+            Column('model_version', String(64), nullable=False),
+            Column('threshold', Float),
+            Column('prediction', String(64), nullable=False),
+            Column('confidence', Float, nullable=False),
+            Column('probabilities', Text, nullable=False)
+        )
+        metadata.create_all(engine)
+        return engine, table
+
+    def _write(self, engine, table, batch):
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            conn.execute(table.insert(), batch)
+        with self._lock:
+            self.written += len(batch)
+            self.batches += 1
+            self.last_flush_ms = (time.perf_counter() - start) * 1000
+
+    def _try_write(self, engine, table, batch):
+        """Tulis satu batch; kembalikan ``(engine, table, berhasil)``"""
+        try:
+            if engine is None:
+                engine, table = self._connect()
+            self._write(engine, table, batch)
+            return engine, table, True
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+                self.last_error = str(e)
+            return engine, table, False
+
+    def _expand(self, item):
+        n_rows, build = item
+        with self._lock:
+            self._pending_rows -= n_rows
+        try:
+            return build()
+        except Exception as e:
+            # Item rusak tidak boleh menghentikan worker
+            with self._lock:
+                self.failures += 1
+                self.last_error = str(e)
+            return []
+
+    def _drain(self):
+        records = []
+        while True:
+            try:
+                records.extend(self._expand(self._queue.get_nowait()))
+            except queue.Empty:
+                return records
+
+    def _take(self, item):
+        records = self._expand(item)
+        with self._lock:
+            if not self._abandoned:
+                self._buffer.extend(records)
+                return
+        # Buffer sudah diambil alih close(): record yang terlanjur diambil dari antrean langsung ke spool
+        self._spool(records)
+
+    def _release_buffer(self):
+        with self._lock:
+            records, self._buffer = self._buffer, []
+        return records
+
+    def _flush_buffer(self, engine, table):
+        while True:
+            if self._abort.is_set():
+                self._spool(self._release_buffer())
+                return engine, table
+            with self._lock:
+                if self._abandoned or not self._buffer:
+                    return engine, table
+                # Batch tetap di buffer sampai write commit
+                batch = self._buffer[:self.batch_size]
+            engine, table, written = self._try_write(engine, table, batch)
+            with self._lock:
+                if self._abandoned:
+                    # close() sudah men-spool batch ini
+                    return engine, table
+                del self._buffer[:len(batch)]
+            if not written:
+                self._spool(batch)
+
+    def _replay_spool(self, engine, table):
+        """Kirim ulang spool per batch; sisa yang gagal dikembalikan ke spool"""
+        if self.spool_path is None:
+            return engine, table
+        replaying = self.spool_path + '.replaying'
+        # File .replaying sisa proses sebelumnya (berhenti di tengah replay) diproses dulu
+        if not os.path.exists(replaying):
+            with self._spool_lock:
+                if not os.path.exists(self.spool_path):
+                    return engine, table
+                # Rename dulu agar record yang di-spool selama replay masuk ke file baru
+                os.replace(self.spool_path, replaying)
+
+        with open(replaying, encoding='utf-8') as f:
+            batch = []
+            failed = False
+            for line in f:
+                if line.strip():
+                    batch.append(json.loads(line))
+                if len(batch) < self.batch_size:
+                    continue
+                engine, table, written = self._try_write(engine, table, batch)
+                if not written:
+                    failed = True
+                    break
+                with self._lock:
+                    self.replayed += len(batch)
+                batch = []
+                if self._stop.is_set():
+                    break
+            if batch and not failed and not self._stop.is_set():
+                engine, table, written = self._try_write(engine, table, batch)
+                if written:
+                    with self._lock:
+                        self.replayed += len(batch)
+                    batch = []
+            # Batch yang belum tertulis + baris yang belum dibaca dikembalikan ke spool (baris disalin apa adanya)
+            next_line = f.readline()
+            if batch or next_line:
+                with self._spool_lock, open(self.spool_path, 'a', encoding='utf-8') as out:
+                    for record in batch:
+                        out.write(json.dumps(record) + '\n')
+                    out.write(next_line)
+                    for line in f:
+                        out.write(line)
+                    out.flush()
+                    os.fsync(out.fileno())
+        os.remove(replaying)
+        return engine, table
+
+    def _run(self):
+        engine = table = None
+        last_replay = None
+        while not self._abandoned:
+            stopping = self._stop.is_set()
+            if not stopping and (last_replay is None or time.monotonic() - last_replay >= self.replay_seconds):
+                engine, table = self._replay_spool(engine, table)
+                last_replay = time.monotonic()
+            try:
+                self._take(self._queue.get(timeout=self.flush_seconds))
+                # Gabungkan item yang sudah menunggu menjadi satu batch
+                while len(self._buffer) < self.batch_size:
+                    self._take(self._queue.get_nowait())
+            except queue.Empty:
+                if not self._buffer and stopping:
+                    break
+
+            engine, table = self._flush_buffer(engine, table)
+            if self._abort.is_set():
+                self._spool(self._drain())
+                break
+        if engine is not None:
+            engine.dispose()
+
+    def close(self, timeout=10.0):
+        """Tulis sisa antrean; yang tidak sempat tertulis disimpan ke spool"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # Database lambat: worker men-spool sisa buffer setelah batch yang sedang ditulis selesai
+            self._abort.set()
+            self._thread.join(timeout)
+        if self._thread.is_alive():
+            # Write yang sedang berjalan tidak selesai: ambil alih buffer (termasuk batch tersebut)
+            with self._lock:
+                self._abandoned = True
+                records, self._buffer = self._buffer, []
+            self._spool(records)
+        # Worker sudah berhenti (atau diambil alih), sehingga antrean tidak diperebutkan lagi
+        self._spool(self._drain())
+
+    def stats(self):
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'written': self.written,
+                'pending': self._pending_rows,
+                'overflowed': self.overflowed,
+                'replayed': self.replayed,
+                'batches': self.batches,
+                'failures': self.failures,
+                'spooled': self.spooled,
+                'last_flush_ms': self.last_flush_ms,
+                'last_error': self.last_error
+            }
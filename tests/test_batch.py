@@ -0,0 +1,48 @@
+import io
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'streamlit'))
+
+from artifacts import load_bundle  # noqa: E402
+from batch import stream_batch_predictions  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def students():
+    return pd.read_csv(os.path.join(ROOT, 'data', 'data.csv'), sep=';', encoding='utf-8-sig').head(300)
+
+
+@pytest.fixture(scope='module')
+def scorer():
+    return load_bundle(os.path.join(ROOT, 'saved_models'))
+
+
+@pytest.mark.parametrize('output_format', ['parquet', 'arrow'])
+@pytest.mark.parametrize('late_id', ['X3999', 1.5])
+def test_id_column_type_change_across_chunks(students, scorer, output_format, late_id):
+    df = students.copy()
+    df.insert(0, 'nim', range(len(df)))
+    df['nim'] = df['nim'].astype(object)
+    df.loc[len(df) - 1, 'nim'] = late_id
+    source = io.BytesIO(df.to_csv(sep=';', index=False).encode('utf-8'))
+
+    spool, summary = stream_batch_predictions(source, scorer, chunk_size=100, read_csv_kwargs={'sep': ';'},
+                                              output_format=output_format, id_columns=['nim'])
+    with spool:
+        if output_format == 'parquet':
+            table = pq.read_table(spool)
+        else:
+            table = pa.ipc.open_file(spool).read_all()
+
+    assert summary['rows'] == len(df)
+    assert pa.types.is_string(table.schema.field('nim').type) or pa.types.is_large_string(table.schema.field('nim').type)
+    assert table.column('nim').to_pylist()[0] == '0'
+    assert table.column('nim').to_pylist()[-1] == str(late_id)
@@ -0,0 +1,131 @@
+"""Pemilihan threshold intervensi berdasarkan kapasitas tim konseling.
+
+Model memutuskan Dropout dengan argmax (setara cutoff 0.5), padahal tim
+konseling hanya bisa menangani sebagian mahasiswa per semester. Modul ini
+mengurutkan probabilitas dropout sekali (O(n log n)), lalu precision,
+recall, F1 dan biaya salah klasifikasi untuk semua cutoff dan semua
+kapasitas top-k dihitung sekaligus dengan jumlah kumulatif.
+
+Operating point yang dipilih disimpan di manifest bundle model
+(``write_bundle(..., operating_point=...)``) dan dipakai oleh prediksi
+tunggal, batch maupun service.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Biaya relatif: mahasiswa dropout yang tidak terjangkau vs sesi konseling yang tidak perlu
+COST_FALSE_NEGATIVE = 5.0
+COST_FALSE_POSITIVE = 1.0
+CAPACITY_RATES = [0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.40, 0.50]
+CRITERIA = ('cost', 'f1', 'capacity')
+
+
+def threshold_curve(y_true, proba, cost_fn=COST_FALSE_NEGATIVE, cost_fp=COST_FALSE_POSITIVE):
+    """Metrik untuk setiap cutoff yang berbeda, satu baris per jumlah mahasiswa yang ditandai (k).
+
+    Menandai top-k sama dengan keputusan ``proba >= threshold`` dengan
+    threshold = skor ke-k, sehingga cutoff hanya bisa jatuh di akhir kelompok
+    skor yang sama (ties ikut ditandai semua).
+    """
+    y_true = np.asarray(y_true).astype(np.int64)
+    proba = np.asarray(proba, dtype=np.float64)
+    n = len(proba)
+    if n == 0:
+        raise ValueError("Tidak ada data untuk menghitung kurva threshold")
+
+    order = np.argsort(-proba, kind='mergesort')
+    scores = proba[order]
+    tp = np.cumsum(y_true[order])
+    positives = tp[-1]
+    k = np.arange(1, n + 1)
+
+    last = np.r_[scores[1:] != scores[:-1], True]
+    scores, tp, k = scores[last], tp[last], k[last]
+    fp = k - tp
+    fn = positives - tp
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        recall = tp / positives if positives else np.full(len(k), np.nan)
+        f1 = 2 * tp / (k + positives)
+
+    curve = pd.DataFrame({
+        'k': k,
+        'flagged_rate': k / n,
+        'threshold': scores,
+        'tp': tp,
+        'fp': fp,
+        'fn': fn,
+        'precision': tp / k,
+        'recall': recall,
+        'f1': f1,
+        'cost': cost_fn * fn + cost_fp * fp
+    })
+    curve.attrs.update({'n_samples': n, 'positives': int(positives), 'cost_fn': cost_fn, 'cost_fp': cost_fp})
+    return curve
+
+
+def capacity_table(curve, capacity_rates=CAPACITY_RATES):
+    """Baris kurva untuk setiap kapasitas: cutoff terbesar yang tidak melebihi kapasitas"""
+    capacity_rates = np.asarray(capacity_rates, dtype=np.float64)
+    limits = np.floor(capacity_rates * curve.attrs['n_samples'])
+    idx = np.searchsorted(curve['k'].to_numpy(), limits, side='right') - 1
+    valid = idx >= 0
+
+    table = curve.iloc[idx[valid]].reset_index(drop=True)
+    table.insert(0, 'capacity_rate', capacity_rates[valid])
+    return table
+
+
+def choose_operating_point(curve, capacity_rate=None, criterion='cost'):
+    """Pilih cutoff dalam batas kapasitas, kembalikan dict yang bisa disimpan di manifest.
+
+    ``criterion``: ``'cost'`` (biaya salah klasifikasi terendah), ``'f1'``
+    (F1 tertinggi) atau ``'capacity'`` (tandai sebanyak kapasitas, top-k).
+    """
+    if criterion not in CRITERIA:
+        raise ValueError(f"criterion harus salah satu dari {CRITERIA}, bukan {criterion!r}")
+
+    feasible = curve if capacity_rate is None else curve[curve['flagged_rate'] <= capacity_rate]
+    if feasible.empty:
+        raise ValueError(f"Kapasitas {capacity_rate} terlalu kecil untuk menandai satu kelompok skor")
+
+    if criterion == 'cost':
+        row = feasible.loc[feasible['cost'].idxmin()]
+    elif criterion == 'f1':
+        row = feasible.loc[feasible['f1'].idxmax()]
+    else:
+        row = feasible.iloc[-1]
+
+    return {
+        'threshold': float(row['threshold']),
+        'criterion': criterion,
+        'capacity_rate': capacity_rate,
+        'flagged_rate': float(row['flagged_rate']),
+        'precision': float(row['precision']),
+        'recall': float(row['recall']),
+        'f1': float(row['f1']),
+        'cost': float(row['cost']),
+        'cost_fn': curve.attrs['cost_fn'],
+        'cost_fp': curve.attrs['cost_fp'],
+        'n_samples': curve.attrs['n_samples']
+    }
+
+
+def apply_threshold(y_true, proba, threshold, cost_fn=COST_FALSE_NEGATIVE, cost_fp=COST_FALSE_POSITIVE):
+    """Metrik keputusan ``proba >= threshold`` pada data lain (mis. test set)"""
+    y_true = np.asarray(y_true).astype(np.int64)
+    flagged = np.asarray(proba, dtype=np.float64) >= threshold
+    tp = int((flagged & (y_true == 1)).sum())
+    fp = int((flagged & (y_true == 0)).sum())
+    fn = int((~flagged & (y_true == 1)).sum())
+    precision = tp / (tp + fp) if tp + fp else np.nan
+    recall = tp / (tp + fn) if tp + fn else np.nan
+    return {
+        'threshold': float(threshold),
+        'flagged_rate': float(flagged.mean()),
+        'precision': precision,
+        'recall': recall,
+        'f1': 2 * tp / (2 * tp + fp + fn) if tp + fp + fn else np.nan,
+        'cost': cost_fn * fn + cost_fp * fp
+    }
@@ -0,0 +1,163 @@
+"""Orkestrator training paralel untuk semua kandidat model.
+
+Semua model dan semua fold cross-validation dijalankan bersamaan di worker
+pool joblib dengan satu set indeks fold stratified yang sama untuk setiap
+model. Fit final di seluruh data latih ikut dijadwalkan di pool yang sama.
+Setiap task mencatat waktu wall dan CPU-nya sendiri.
+
+Dengan ``cache_dir``, hasil setiap model (estimator per fold, skor CV dan
+model final) disimpan di disk dengan key hash dari data latih, konfigurasi
+preprocessing, hyperparameter model dan indeks fold. Rerun tanpa perubahan
+langsung memuat dari cache; hanya model yang key-nya berubah yang di-fit ulang.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import joblib
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedKFold
+
+FINAL_FOLD = 'final'
+
+
+def make_folds(y, n_splits=5):
+    """Indeks fold stratified yang dipakai bersama oleh semua model.
+
+    Tanpa shuffle, sama dengan yang dipakai ``cross_val_score(..., cv=5)``
+    untuk classifier, sehingga skor CV tetap bisa dibandingkan.
+    """
+    splitter = StratifiedKFold(n_splits=n_splits)
+    return list(splitter.split(np.zeros(len(y)), y))
+
+
+def data_fingerprint(X, y, config=None):
+    """Hash isi data latih + target + konfigurasi preprocessing"""
+    digest = hashlib.sha256()
+    for data in (X, y):
+        if hasattr(data, 'columns'):
+            digest.update(json.dumps([str(c) for c in data.columns]).encode('utf-8'))
+        if isinstance(data, (pd.DataFrame, pd.Series)):
+            digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+        else:
+            digest.update(np.ascontiguousarray(data).tobytes())
+    digest.update(json.dumps(config or {}, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def model_cache_key(name, estimator, data_key, folds):
+    """Key cache satu model: kelas + hyperparameter + data + indeks fold"""
+    digest = hashlib.sha256(data_key.encode('utf-8'))
+    digest.update(name.encode('utf-8'))
+    digest.update(type(estimator).__qualname__.encode('utf-8'))
+    digest.update(repr(sorted(estimator.get_params(deep=True).items())).encode('utf-8'))
+    for train_idx, test_idx in folds:
+        digest.update(np.asarray(train_idx).tobytes())
+        digest.update(np.asarray(test_idx).tobytes())
+    return digest.hexdigest()
+
+
+def _fit_task(name, fold, estimator, X, y, train_idx, test_idx):
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    estimator = clone(estimator)
+    estimator.fit(_rows(X, train_idx), _rows(y, train_idx))
+    score = None
+    if test_idx is not None:
+        score = accuracy_score(_rows(y, test_idx), estimator.predict(_rows(X, test_idx)))
+
+    return {
+        'model': name,
+        'fold': fold,
+        'score': score,
+        'wall_s': time.perf_counter() - wall_start,
+        'cpu_s': time.process_time() - cpu_start,
+        'estimator': estimator
+    }
+
+
+def _rows(data, idx):
+    if idx is None:
+        return data
+    return data.iloc[idx] if hasattr(data, 'iloc') else data[idx]
+
+
+def train_models(candidates, X_train, y_train, folds=None, n_jobs=-1, cache_dir=None, config=None):
+    """Latih semua kandidat (CV + fit final) secara paralel.
+
+    ``candidates`` adalah dict nama -> estimator (belum di-fit). Mengembalikan
+    ``(trained, timing_df)``: ``trained[nama]`` berisi ``model`` (fit final),
+    ``cv_scores`` dan ``fold_estimators``; ``timing_df`` berisi waktu wall/CPU
+    per model per fold (kolom ``cached`` menandai hasil yang diambil dari cache).
+    """
+    folds = folds if folds is not None else make_folds(y_train)
+
+    trained = {}
+    timing_rows = []
+    cache_paths = {}
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        data_key = data_fingerprint(X_train, y_train, config)
+        for name, estimator in candidates.items():
+            path = os.path.join(cache_dir, model_cache_key(name, estimator, data_key, folds) + '.joblib')
+            cache_paths[name] = path
+            if os.path.exists(path):
+                entry = joblib.load(path)
+                trained[name] = entry['trained']
+                timing_rows.extend(dict(row, cached=True) for row in entry['timing'])
+
+    tasks = []
+    for name, estimator in candidates.items():
+        if name in trained:
+            continue
+        for fold, (train_idx, test_idx) in enumerate(folds):
+            tasks.append(delayed(_fit_task)(name, fold, estimator, X_train, y_train, train_idx, test_idx))
+        tasks.append(delayed(_fit_task)(name, FINAL_FOLD, estimator, X_train, y_train, None, None))
+
+    wall_start = time.perf_counter()
+    results = Parallel(n_jobs=n_jobs)(tasks) if tasks else []
+    total_wall = time.perf_counter() - wall_start
+
+    for name in candidates:
+        if name in trained:
+            continue
+        fold_results = [r for r in results if r['model'] == name and r['fold'] != FINAL_FOLD]
+        final = next(r for r in results if r['model'] == name and r['fold'] == FINAL_FOLD)
+        trained[name] = {
+            'model': final['estimator'],
+            'cv_scores': np.array([r['score'] for r in fold_results]),
+            'fold_estimators': [r['estimator'] for r in fold_results]
+        }
+        model_timing = [
+            {key: r[key] for key in ('model', 'fold', 'score', 'wall_s', 'cpu_s')}
+            for r in results if r['model'] == name
+        ]
+        timing_rows.extend(dict(row, cached=False) for row in model_timing)
+
+        if name in cache_paths:
+            # Tulis ke file sementara lalu rename agar cache tidak pernah setengah jadi
+            joblib.dump({'trained': trained[name], 'timing': model_timing}, cache_paths[name] + '.tmp')
+            os.replace(cache_paths[name] + '.tmp', cache_paths[name])
+
+    timing_df = pd.DataFrame(timing_rows)
+    timing_df.attrs['total_wall_s'] = total_wall
+    return {name: trained[name] for name in candidates}, timing_df
+
+
+def timing_report(timing_df):
+    """Ringkasan waktu per model: jumlah wall/CPU semua task dan wall end-to-end"""
+    summary = timing_df.groupby('model').agg(
+        cached=('cached', 'all'),
+        tasks=('fold', 'count'),
+        wall_s=('wall_s', 'sum'),
+        cpu_s=('cpu_s', 'sum')
+    )
+    summary.attrs['total_wall_s'] = timing_df.attrs.get('total_wall_s')
+    return summary
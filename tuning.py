@@ -0,0 +1,224 @@
+"""Pencarian hyperparameter dengan successive halving dan batas waktu.
+
+Semua kombinasi parameter dievaluasi dulu dengan cross-validation pada
+subset kecil data latih, lalu hanya 1/``factor`` terbaik yang naik ke rung
+berikutnya dengan data ``factor`` kali lebih banyak, sampai rung terakhir
+memakai seluruh data latih (fold-nya sama dengan ``training.make_folds``).
+Semua kandidat x fold dalam satu rung dijalankan paralel di worker pool
+joblib. Rung berikutnya tidak dimulai jika perkiraan waktunya melewati
+``budget_s``, dan di dalam rung deadline dicek sebelum setiap kelompok
+kandidat sehingga tidak ada fit baru yang dijadwalkan setelah budget habis.
+
+Setiap trial (parameter, ukuran data, skor per fold, waktu) ditambahkan ke
+file riwayat JSONL. Trial yang key-nya sudah ada di riwayat tidak dihitung
+ulang, sehingga pencarian yang terhenti bisa dilanjutkan.
+"""
+
+import hashlib
+import json
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import ParameterGrid
+
+from training import data_fingerprint, make_folds
+
+DEFAULT_FACTOR = 3
+DEFAULT_MIN_RESOURCES = 100
+
+
+def _score_task(estimator, params, X, y, train_idx, test_idx):
+    wall_start = time.perf_counter()
+    estimator = clone(estimator).set_params(**params)
+    estimator.fit(X[train_idx], y[train_idx])
+    score = accuracy_score(y[test_idx], estimator.predict(X[test_idx]))
+    return score, time.perf_counter() - wall_start
+
+
+def trial_key(data_key, name, params, resource, n_splits):
+    """Key trial: data + nama model + parameter + ukuran data + jumlah fold"""
+    payload = json.dumps([data_key, name, params, resource, n_splits], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_history(history_path):
+    """Baca riwayat trial (key -> record) dari file JSONL"""
+    history = {}
+    if history_path and os.path.exists(history_path):
+        with open(history_path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    history[record['trial_key']] = record
+    return history
+
+
+def _append_history(history_path, records):
+    if not history_path or not records:
+        return
+    os.makedirs(os.path.dirname(history_path) or '.', exist_ok=True)
+    with open(history_path, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, default=str) + '\n')
+
+
+def _record_batch(history, history_path, keys, candidates, batch, results, name, rung, resource, n_splits):
+    """Simpan hasil satu kelompok kandidat ke riwayat (langsung ditulis agar bisa dilanjutkan)"""
+    records = []
+    for position, i in enumerate(batch):
+        fold_results = results[position * n_splits:(position + 1) * n_splits]
+        scores = [score for score, _ in fold_results]
+        record = {
+            'trial_key': keys[i],
+            'model': name,
+            'params': candidates[i],
+            'rung': rung,
+            'resource': resource,
+            'n_splits': n_splits,
+            'fold_scores': scores,
+            'mean_score': float(np.mean(scores)),
+            'std_score': float(np.std(scores)),
+            'wall_s': float(sum(wall for _, wall in fold_results)),
+            'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        history[keys[i]] = record
+        records.append(record)
+    _append_history(history_path, records)
+
+
+def resource_schedule(n_samples, n_candidates, factor=DEFAULT_FACTOR, min_resources=DEFAULT_MIN_RESOURCES):
+    """Ukuran data per rung; rung terakhir selalu seluruh data latih"""
+    n_rungs = max(1, math.ceil(math.log(max(n_candidates, 1), factor)) + 1)
+    n_rungs = min(n_rungs, max(1, int(math.log(max(n_samples / min_resources, 1), factor)) + 1))
+    return [min(n_samples, n_samples // factor ** (n_rungs - 1 - rung)) for rung in range(n_rungs)]
+
+
+def successive_halving(name, estimator, param_grid, X, y, keep_baseline=True, factor=DEFAULT_FACTOR,
+                       min_resources=DEFAULT_MIN_RESOURCES, n_splits=5, budget_s=None, history_path=None,
+                       n_jobs=-1, random_state=42, data_key=None):
+    """Cari parameter terbaik untuk satu model.
+
+    Dengan ``keep_baseline``, parameter ``estimator`` saat ini (biasanya
+    default library) selalu ikut sampai rung terakhir, sehingga hasil akhir
+    tidak pernah lebih buruk dari baseline pada CV seluruh data. Mengembalikan dict berisi ``best_params``, ``best_score``,
+    ``completed`` (rung terakhir tercapai) dan ``trials`` (DataFrame). Jika budget habis di tengah rung,
+    parameter terbaik diambil dari rung terakhir yang selesai.
+    """
+    X = np.asarray(X)
+    y = np.asarray(y)
+    data_key = data_key or data_fingerprint(X, y)
+    history = load_history(history_path)
+
+    candidates = [dict(params) for params in ParameterGrid(param_grid)]
+    baseline_params = None
+    if keep_baseline:
+        current = estimator.get_params()
+        baseline_params = {key: current[key] for key in candidates[0]}
+    if baseline_params is not None and baseline_params not in candidates:
+        candidates.append(baseline_params)
+
+    resources = resource_schedule(len(y), len(candidates), factor, min_resources)
+    # Subset setiap rung adalah awalan dari satu permutasi tetap (rung terakhir = seluruh data, urutan asli)
+    order = np.random.default_rng(random_state).permutation(len(y))
+
+    search_start = time.perf_counter()
+    deadline = search_start + budget_s if budget_s is not None else None
+    # Kandidat per kelompok cukup untuk mengisi semua worker (kandidat x fold)
+    batch_size = max(1, math.ceil(effective_n_jobs(n_jobs) / n_splits))
+    trials = []
+    completed = False
+    scored_rung = None
+    rung_wall = None
+
+    for rung, resource in enumerate(resources):
+        if budget_s is not None and rung_wall is not None:
+            elapsed = time.perf_counter() - search_start
+            # Data x factor, kandidat / factor: waktu rung kira-kira sama dengan rung sebelumnya
+            if elapsed + rung_wall > budget_s:
+                break
+
+        subset = np.arange(len(y)) if resource == len(y) else np.sort(order[:resource])
+        X_rung, y_rung = X[subset], y[subset]
+        folds = make_folds(y_rung, n_splits=n_splits)
+
+        keys = [trial_key(data_key, name, params, resource, n_splits) for params in candidates]
+        pending = [i for i, key in enumerate(keys) if key not in history]
+
+        rung_start = time.perf_counter()
+        has_result = bool(trials) or len(pending) < len(keys)
+        interrupted = False
+        with Parallel(n_jobs=n_jobs) as parallel:
+            for start in range(0, len(pending), batch_size):
+                # Minimal satu kelompok selalu dijalankan agar ada hasil untuk dipilih
+                if deadline is not None and time.perf_counter() > deadline and has_result:
+                    interrupted = True
+                    break
+                batch = pending[start:start + batch_size]
+                results = parallel(
+                    delayed(_score_task)(estimator, candidates[i], X_rung, y_rung, train_idx, test_idx)
+                    for i in batch for train_idx, test_idx in folds
+                )
+                _record_batch(history, history_path, keys, candidates, batch, results, name, rung, resource, n_splits)
+                has_result = True
+        rung_wall = time.perf_counter() - rung_start
+
+        rung_records = [dict(history[key], rung=rung, resumed=(i not in pending))
+                        for i, key in enumerate(keys) if key in history]
+        trials.extend(rung_records)
+
+        if interrupted:
+            if scored_rung is None:
+                scored_rung = rung
+            break
+        scored_rung = rung
+
+        if rung == len(resources) - 1:
+            completed = True
+            break
+
+        ranked = sorted(range(len(candidates)), key=lambda i: rung_records[i]['mean_score'], reverse=True)
+        keep = ranked[:max(1, math.ceil(len(candidates) / factor))]
+        survivors = [candidates[i] for i in sorted(keep)]
+        if baseline_params is not None and baseline_params not in survivors:
+            survivors.append(baseline_params)
+        candidates = survivors
+
+    trials_df = pd.DataFrame(trials)
+    last_rung = trials_df[trials_df['rung'] == scored_rung]
+    # Jika skor sama, baseline didahulukan agar parameter tidak berubah tanpa perbaikan
+    is_baseline = last_rung['params'].apply(lambda params: params == baseline_params)
+    best = last_rung.assign(is_baseline=is_baseline).sort_values(
+        ['mean_score', 'is_baseline'], ascending=False, kind='stable').iloc[0]
+    return {
+        'model': name,
+        'best_params': best['params'],
+        'best_score': best['mean_score'],
+        'completed': completed,
+        'resources': resources,
+        'wall_s': time.perf_counter() - search_start,
+        'trials': trials_df
+    }
+
+
+def search_report(result, n_grid, n_samples, n_splits=5):
+    """Biaya pencarian dibanding grid search penuh (fit x jumlah data dan detik fit)"""
+    trials = result['trials']
+    full = trials[trials['resource'] == n_samples]
+    return {
+        'model': result['model'],
+        'trials': len(trials),
+        'resumed': int(trials['resumed'].sum()),
+        'sample_fits_fraction': (trials['resource'].sum() * n_splits) / (n_grid * n_samples * n_splits),
+        'fit_s': trials['wall_s'].sum(),
+        # Perkiraan grid penuh: semua kandidat dievaluasi di seluruh data
+        'grid_fit_s_est': full['wall_s'].mean() * n_grid if len(full) else np.nan,
+        'search_wall_s': result['wall_s'],
+        'best_score': result['best_score'],
+        'completed': result['completed']
+    }